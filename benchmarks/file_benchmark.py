@@ -0,0 +1,521 @@
+# -*- coding: utf-8 -*-
+
+"""
+Personal Python Toolkit
+Modularized all-in-one toolkit for Python
+----------------------------------------------------------------------------
+(C) Tobias "NotTheEvilOne" Wolf - All rights reserved
+https://github.com/NotTheEvilOne/ppt_file
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint: disable=import-error,invalid-name,protected-access
+
+from argparse import ArgumentParser
+from os import path
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, path.join(path.dirname(path.dirname(path.abspath(__file__))), "src"))
+
+from ppt_file import File  # noqa: E402
+from ppt_file import file as file_module  # noqa: E402
+
+LOCK_HOLD_SECONDS = 0.0001
+"""
+Seconds the exclusive lock is held per lock cycle of the contention benchmark
+"""
+
+LOCK_IDLE_SECONDS = 0.0003
+"""
+Seconds between releasing and requesting the lock again per lock cycle of the
+contention benchmark
+"""
+
+PAYLOAD_SIZES = (
+    1024,
+    16384,
+    262144,
+    4194304,
+    67108864,
+    1073741824,
+)
+"""
+Payload sizes measured for read and write throughput (1 KiB to 1 GiB)
+"""
+
+
+def _get_percentile(values, percentile):
+    """
+    Returns the given percentile of the values.
+
+    :param values: Sorted list of values
+    :param percentile: Percentile between 0 and 100
+
+    :return: (float) Percentile value
+    :since:  v1.1.0
+    """
+
+    index = int(round((percentile / 100.0) * (len(values) - 1)))
+    return values[index]
+
+
+def _get_result(durations, operations=1, bytes_transferred=0):
+    """
+    Returns the result dictionary for the given list of durations.
+
+    :param durations: List of durations in seconds of one repetition each
+    :param operations: Operations per repetition
+    :param bytes_transferred: Bytes transferred per repetition
+
+    :return: (dict) Result dictionary
+    :since:  v1.1.0
+    """
+
+    durations = sorted(durations)
+    best = durations[0]
+
+    _return = {
+        "repetitions": len(durations),
+        "seconds_best": best,
+        "seconds_p50": _get_percentile(durations, 50),
+        "seconds_p99": _get_percentile(durations, 99),
+        "ops_per_second": (operations / best if (best > 0) else 0.0),
+    }
+
+    if bytes_transferred > 0:
+        _return["bytes_per_second"] = bytes_transferred / best if (best > 0) else 0.0
+
+    return _return
+
+
+def _new_file(**kwargs):
+    """
+    Returns a new file instance used for benchmarking.
+
+    :return: (object) File instance
+    :since:  v1.1.0
+    """
+
+    kwargs.setdefault("default_chmod", 0o600)
+    return File(**kwargs)
+
+
+def benchmark_flush(directory_path, repetitions):
+    """
+    Measures "flush()" costs for each durability policy.
+
+    :param directory_path: Directory to create files in
+    :param repetitions: Number of flushes per policy
+
+    :return: (dict) Results by name
+    :since:  v1.1.0
+    """
+
+    _return = {}
+
+    for durability in ("none", "fdatasync", "fsync", "group_commit"):
+        file_path_name = path.join(directory_path, "flush.bin")
+        file_instance = _new_file(durability=durability)
+        file_instance.open(file_path_name, file_mode="w+b")
+
+        durations = []
+
+        for _ in range(repetitions):
+            file_instance.write(b"x" * 128)
+
+            started = time.perf_counter()
+            file_instance.flush()
+            durations.append(time.perf_counter() - started)
+
+        file_instance.close()
+        os.unlink(file_path_name)
+
+        _return["flush.{0}".format(durability)] = _get_result(durations)
+
+    return _return
+
+
+def _lock_contention_worker(
+    file_path_name, use_file_locking, iterations, barrier, queue
+):
+    """
+    Process entry point acquiring and releasing the exclusive lock repeatedly.
+
+    :param file_path_name: Path of the contended file
+    :param use_file_locking: True to use the ".lock" file backend
+    :param iterations: Number of lock cycles
+    :param barrier: Barrier all workers wait at before contending
+    :param queue: Queue to put the list of lock acquisition latencies in
+
+    :since: v1.1.0
+    """
+
+    file_module._USE_FILE_LOCKING = use_file_locking
+
+    file_instance = _new_file(timeout_retries=60)
+    file_instance.open(file_path_name)
+
+    durations = []
+    barrier.wait()
+
+    for _ in range(iterations):
+        started = time.perf_counter()
+        is_locked = file_instance.lock("w")
+        durations.append(time.perf_counter() - started)
+
+        if is_locked:
+            time.sleep(LOCK_HOLD_SECONDS)
+            file_instance.unlock()
+
+        time.sleep(LOCK_IDLE_SECONDS)
+
+    file_instance.close()
+    queue.put(durations)
+
+
+def benchmark_lock_contention(directory_path, processes, iterations):
+    """
+    Measures exclusive lock acquisition under multi-process contention for the
+    fcntl and ".lock" file backends.
+
+    :param directory_path: Directory to create files in
+    :param processes: Number of contending processes
+    :param iterations: Number of lock cycles per process
+
+    :return: (dict) Results by name
+    :since:  v1.1.0
+    """
+
+    _return = {}
+    context = multiprocessing.get_context("spawn")
+
+    backends = [("lockfile", True)]
+
+    if not file_module._USE_FILE_LOCKING:
+        backends.insert(0, ("fcntl", False))
+
+    for backend_name, use_file_locking in backends:
+        file_path_name = path.join(directory_path, "lock.bin")
+
+        with open(file_path_name, "wb") as file_object:
+            file_object.write(b"x")
+
+        barrier = context.Barrier(processes)
+        queue = context.Queue()
+
+        workers = [
+            context.Process(
+                target=_lock_contention_worker,
+                args=(file_path_name, use_file_locking, iterations, barrier, queue),
+            )
+            for _ in range(processes)
+        ]
+
+        started = time.perf_counter()
+
+        for worker in workers:
+            worker.start()
+
+        durations = []
+
+        for _ in workers:
+            durations.extend(queue.get())
+
+        for worker in workers:
+            worker.join()
+
+        total_duration = time.perf_counter() - started
+        os.unlink(file_path_name)
+
+        result = _get_result(durations)
+        result["ops_per_second"] = (processes * iterations) / total_duration
+        result["seconds_total"] = total_duration
+
+        _return["lock.contention.{0}.{1:d}p".format(backend_name, processes)] = result
+
+    return _return
+
+
+def benchmark_open_close(directory_path, repetitions):
+    """
+    Measures "open()" and "close()" churn of an existing file.
+
+    :param directory_path: Directory to create files in
+    :param repetitions: Number of open and close cycles
+
+    :return: (dict) Results by name
+    :since:  v1.1.0
+    """
+
+    file_path_name = path.join(directory_path, "churn.bin")
+
+    with open(file_path_name, "wb") as file_object:
+        file_object.write(b"x" * 1024)
+
+    durations = []
+
+    for _ in range(repetitions):
+        file_instance = _new_file()
+
+        started = time.perf_counter()
+        file_instance.open(file_path_name)
+        file_instance.close()
+        durations.append(time.perf_counter() - started)
+
+    os.unlink(file_path_name)
+
+    return {"open_close": _get_result(durations)}
+
+
+def benchmark_read_write(directory_path, max_size, repetitions):
+    """
+    Measures "read()" and "write()" throughput for each payload size.
+
+    :param directory_path: Directory to create files in
+    :param max_size: Largest payload size to measure
+    :param repetitions: Number of repetitions per payload size
+
+    :return: (dict) Results by name
+    :since:  v1.1.0
+    """
+
+    _return = {}
+
+    for size in PAYLOAD_SIZES:
+        if size > max_size:
+            break
+
+        file_path_name = path.join(directory_path, "payload.bin")
+        payload = os.urandom(min(size, 1048576)) * max(1, size // 1048576)
+
+        write_durations = []
+        read_durations = []
+
+        for _ in range(repetitions):
+            file_instance = _new_file(durability="none")
+            file_instance.open(file_path_name, file_mode="w+b")
+
+            started = time.perf_counter()
+            file_instance.write(payload, timeout=3600)
+            file_instance.flush()
+            write_durations.append(time.perf_counter() - started)
+
+            file_instance.seek(0)
+
+            started = time.perf_counter()
+            data = file_instance.read()
+            read_durations.append(time.perf_counter() - started)
+
+            file_instance.close()
+
+            if len(data) != size:
+                raise IOError("Benchmark read returned an unexpected size")
+
+            del data
+
+        os.unlink(file_path_name)
+
+        _return["write.{0:d}".format(size)] = _get_result(write_durations, 1, size)
+        _return["read.{0:d}".format(size)] = _get_result(read_durations, 1, size)
+
+    return _return
+
+
+def benchmark_small_writes(directory_path, record_count, record_size):
+    """
+    Measures a storm of small "write()" calls.
+
+    :param directory_path: Directory to create files in
+    :param record_count: Number of records written
+    :param record_size: Size of each record
+
+    :return: (dict) Results by name
+    :since:  v1.1.0
+    """
+
+    file_path_name = path.join(directory_path, "small.bin")
+    record = b"r" * record_size
+
+    file_instance = _new_file(durability="none")
+    file_instance.open(file_path_name, file_mode="w+b")
+
+    started = time.perf_counter()
+
+    for _ in range(record_count):
+        file_instance.write(record)
+
+    file_instance.flush()
+    duration = time.perf_counter() - started
+
+    file_instance.close()
+    os.unlink(file_path_name)
+
+    return {
+        "write.small.{0:d}".format(record_size): _get_result(
+            [duration], record_count, record_count * record_size
+        )
+    }
+
+
+def compare_results(results, baseline, tolerance):
+    """
+    Compares results with a baseline and returns regressions of the throughput.
+
+    :param results: Result dictionary of the current run
+    :param baseline: Result dictionary of the baseline run
+    :param tolerance: Accepted relative slowdown (0.1 means 10 %)
+
+    :return: (dict) Comparison by name with the ratio and a regression flag
+    :since:  v1.1.0
+    """
+
+    _return = {}
+
+    for name, result in results.items():
+        baseline_result = baseline.get(name)
+
+        if baseline_result is None or baseline_result.get("ops_per_second", 0) <= 0:
+            continue
+
+        ratio = result["ops_per_second"] / baseline_result["ops_per_second"]
+
+        _return[name] = {
+            "ratio": ratio,
+            "regression": ratio < (1 - tolerance),
+        }
+
+    return _return
+
+
+def _parse_size(value):
+    """
+    Parses a size with an optional "K", "M" or "G" suffix.
+
+    :param value: Size string
+
+    :return: (int) Size in bytes
+    :since:  v1.1.0
+    """
+
+    value = value.strip().upper()
+    factor = 1
+
+    for suffix, suffix_factor in (("K", 1024), ("M", 1048576), ("G", 1073741824)):
+        if value.endswith(suffix):
+            factor = suffix_factor
+            value = value[:-1]
+
+            break
+
+    return int(value) * factor
+
+
+def main(args=None):
+    """
+    Runs the benchmark suite.
+
+    :param args: Command line arguments (defaults to "sys.argv")
+
+    :return: (int) Exit code
+    :since:  v1.1.0
+    """
+
+    parser = ArgumentParser(description="ppt_file.File throughput and latency")
+
+    parser.add_argument("--output", help="Path to write the JSON results to")
+    parser.add_argument("--baseline", help="Path of JSON results to compare with")
+
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="Accepted relative slowdown compared to the baseline",
+    )
+
+    parser.add_argument(
+        "--max-size",
+        type=_parse_size,
+        default=_parse_size("64M"),
+        help="Largest payload size for read and write (up to 1G)",
+    )
+
+    parser.add_argument("--repetitions", type=int, default=5)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--lock-iterations", type=int, default=200)
+    parser.add_argument("--directory", help="Directory to create files in")
+
+    parsed_args = parser.parse_args(args)
+
+    directory_path = tempfile.mkdtemp(prefix="ppt_file-", dir=parsed_args.directory)
+
+    try:
+        results = {}
+
+        results.update(
+            benchmark_read_write(
+                directory_path, parsed_args.max_size, parsed_args.repetitions
+            )
+        )
+
+        results.update(benchmark_small_writes(directory_path, 100000, 128))
+        results.update(benchmark_flush(directory_path, 50 * parsed_args.repetitions))
+
+        results.update(
+            benchmark_lock_contention(
+                directory_path, parsed_args.processes, parsed_args.lock_iterations
+            )
+        )
+
+        results.update(
+            benchmark_open_close(directory_path, 1000 * parsed_args.repetitions)
+        )
+    finally:
+        shutil.rmtree(directory_path, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "created": time.time(),
+        },
+        "results": results,
+    }
+
+    _return = 0
+
+    if parsed_args.baseline is not None:
+        with open(parsed_args.baseline, "r", encoding="utf-8") as file_object:
+            baseline = json.load(file_object)
+
+        report["comparison"] = compare_results(
+            results, baseline.get("results", {}), parsed_args.tolerance
+        )
+
+        if any(entry["regression"] for entry in report["comparison"].values()):
+            _return = 1
+
+    report_json = json.dumps(report, indent=2, sort_keys=True)
+
+    if parsed_args.output is None:
+        print(report_json)
+    else:
+        with open(parsed_args.output, "w", encoding="utf-8") as file_object:
+            file_object.write(report_json)
+            file_object.write("\n")
+
+    return _return
+
+
+if __name__ == "__main__":
+    sys.exit(main())
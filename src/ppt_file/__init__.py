@@ -12,6 +12,32 @@ v. 2.0. If a copy of the MPL was not distributed with this file, You can
 obtain one at http://mozilla.org/MPL/2.0/.
 """
 
+from .async_file import AsyncFile
+from .atomic_file import AtomicFile
+from .compressed_file import CompressedFile
+from .crc32_digest import Crc32Digest
 from .file import File
+from .file_content_cache import FileContentCache
+from .file_metrics import FileMetrics
+from .file_pool import FilePool
+from .file_set import FileSet
+from .group_commit_syncer import GroupCommitSyncer
+from .lock_registry import LockRegistry
+from .lock_wait_strategy import LockWaitStrategy
+from .mapped_file import MappedFile
 
-__all__ = ("File",)
+__all__ = (
+    "AsyncFile",
+    "AtomicFile",
+    "CompressedFile",
+    "Crc32Digest",
+    "File",
+    "FileContentCache",
+    "FileMetrics",
+    "FilePool",
+    "FileSet",
+    "GroupCommitSyncer",
+    "LockRegistry",
+    "LockWaitStrategy",
+    "MappedFile",
+)
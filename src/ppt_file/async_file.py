@@ -0,0 +1,578 @@
+# -*- coding: utf-8 -*-
+
+"""
+Personal Python Toolkit
+Modularized all-in-one toolkit for Python
+----------------------------------------------------------------------------
+(C) Tobias "NotTheEvilOne" Wolf - All rights reserved
+https://github.com/NotTheEvilOne/ppt_file
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint: disable=import-error,invalid-name,protected-access
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import asyncio
+import threading
+
+from .file import File
+
+_DEFAULT_EXECUTOR_MAX_WORKERS = 4
+"""
+Number of worker threads of the executor shared by default
+"""
+
+_default_executor = None
+"""
+Executor shared by all instances not given an executor
+"""
+
+_default_executor_lock = threading.Lock()
+"""
+Lock used to create the default executor
+"""
+
+
+class AsyncFile(object):
+    """
+    asyncio front-end for file objects running blocking calls in a bounded
+    executor.
+
+    :author:     Tobias "NotTheEvilOne" Wolf et al.
+    :copyright:  Tobias "NotTheEvilOne" Wolf - All rights reserved
+    :package:    ppt
+    :subpackage: file
+    :since:      v1.1.0
+    :license:    http://mozilla.org/MPL/2.0/
+                 Mozilla Public License, v. 2.0
+    """
+
+    # pylint: disable=bad-option-value,slots-on-old-class
+    __slots__ = (
+        "_executor",
+        "_file",
+        "_operation_lock",
+        "_pending_lock_restore",
+        "_restore_lock",
+        "_thread_lock",
+    )
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    def __init__(self, file_instance=None, executor=None, **kwargs):
+        """
+        Constructor __init__(AsyncFile)
+
+        :param file_instance: File instance to use (a new one is created with
+                              the given keyword arguments if None)
+        :param executor: Executor to run blocking calls in (defaults to a shared
+                         one)
+
+        :since: v1.1.0
+        """
+
+        self._executor = executor
+        """
+Executor to run blocking calls in
+        """
+        self._file = File(**kwargs) if (file_instance is None) else file_instance
+        """
+File instance used
+        """
+        self._operation_lock = None
+        """
+asyncio lock serializing operations of coroutines
+        """
+        self._pending_lock_restore = None
+        """
+File locking mode to restore before the next blocking call after a cancelled
+lock change
+        """
+        self._restore_lock = threading.Lock()
+        """
+Lock protecting the state of lock changes being cancelled
+        """
+        self._thread_lock = threading.Lock()
+        """
+Lock serializing blocking calls even if a coroutine has been cancelled
+        """
+
+    async def __aenter__(self):
+        """
+        python.org: Semantically similar to __enter__(), the only difference
+        being that it must return an awaitable.
+
+        :since: v1.1.0
+        """
+
+        if not self._file.is_valid:
+            raise IOError("Failed to enter context for an uninitialized file instance")
+
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """
+        python.org: Semantically similar to __exit__(), the only difference
+        being that it must return an awaitable.
+
+        :return: (bool) True to suppress exceptions
+        :since:  v1.1.0
+        """
+
+        await self.close()
+
+    @property
+    def file(self):
+        """
+        Returns the file instance used.
+
+        :return: (object) File instance
+        :since:  v1.1.0
+        """
+
+        return self._file
+
+    @property
+    def is_valid(self):
+        """
+        Returns true if the file handle is available.
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        return self._file.is_valid
+
+    @property
+    def size(self):
+        """
+        Returns the size in bytes.
+
+        :return: (int) Size in bytes
+        :since:  v1.1.0
+        """
+
+        return self._file.size
+
+    async def close(self, delete_empty=False):
+        """
+        python.org: Flush and close this stream.
+
+        :param delete_empty: If the file handle is valid, the file is empty and
+                             this parameter is true then the file will be deleted.
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        async with self._get_operation_lock():
+            return await self._run(self._file.close, delete_empty)
+
+    async def flush(self):
+        """
+        python.org: Flush the write buffers of the stream if applicable.
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        async with self._get_operation_lock():
+            return await self._run(self._file.flush)
+
+    def _get_executor(self):
+        """
+        Returns the executor to run blocking calls in.
+
+        :return: (object) Executor
+        :since:  v1.1.0
+        """
+
+        return (
+            AsyncFile.get_default_executor()
+            if (self._executor is None)
+            else self._executor
+        )
+
+    def _get_operation_lock(self):
+        """
+        Returns the asyncio lock serializing operations. It is created lazily to
+        bind it to the running event loop.
+
+        :return: (object) asyncio lock
+        :since:  v1.1.0
+        """
+
+        if self._operation_lock is None:
+            self._operation_lock = asyncio.Lock()
+
+        return self._operation_lock
+
+    async def lock(self, lock_mode, timeout=None):
+        """
+        Changes file locking if needed without blocking the event loop.
+
+        :param lock_mode: The requested file locking mode ("r" or "w").
+        :param timeout: Timeout in seconds (defaults to the lock wait strategy
+                        or construction time value)
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        async with self._get_operation_lock():
+            return await self._lock(lock_mode, timeout)
+
+    async def _lock(self, lock_mode, timeout):
+        """
+        Waits with asyncio based backoff until the file lock is changed.
+
+        :param lock_mode: The requested file locking mode ("r" or "w").
+        :param timeout: Timeout in seconds (defaults to the lock wait strategy
+                        or construction time value)
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        file_instance = self._file
+
+        if (
+            file_instance._handle is None
+            or lock_mode == file_instance._handle_lock
+            or (lock_mode == "w" and file_instance.readonly)
+        ):
+            _return = file_instance.lock(lock_mode)
+        else:
+            strategy = file_instance.lock_wait_strategy
+
+            if timeout is None:
+                timeout = strategy.timeout
+            if timeout is None:
+                timeout = file_instance.timeout_retries
+
+            deadline = strategy.get_deadline(timeout)
+            _return = await self._try_locking(lock_mode)
+
+            if not _return:
+                for delay in strategy.iter_delays(deadline):
+                    await asyncio.sleep(delay)
+
+                    if await self._try_locking(lock_mode):
+                        _return = True
+                        break
+
+            if not _return and file_instance.log_handler is not None:
+                file_instance.log_handler.error(
+                    "ppt_file.AsyncFile.lock()- reporting: File lock change failed"
+                )
+
+        return _return
+
+    async def _try_locking(self, lock_mode):
+        """
+        Tries to change the file lock once in the executor without waiting. The
+        previous lock is restored if the calling coroutine is cancelled
+        meanwhile.
+
+        :param lock_mode: The requested file locking mode ("r" or "w").
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        request = {
+            "lock_mode": lock_mode,
+            "previous_lock_mode": self._file._handle_lock,
+            "is_cancelled": False,
+            "is_changed": False,
+        }
+
+        future = self._submit(self._change_lock, request)
+
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            with self._restore_lock:
+                request["is_cancelled"] = True
+
+                if request["is_changed"]:
+                    self._pending_lock_restore = request["previous_lock_mode"]
+
+            if self._pending_lock_restore is not None:
+                self._get_executor().submit(
+                    self._serialized_call, self._apply_pending_lock_restore
+                )
+
+            raise
+
+    def _apply_pending_lock_restore(self):
+        """
+        Restores the file lock of a cancelled lock change if pending. The
+        thread lock must be held.
+
+        :since: v1.1.0
+        """
+
+        with self._restore_lock:
+            lock_mode = self._pending_lock_restore
+            self._pending_lock_restore = None
+
+        if lock_mode is not None:
+            self._restore_locking(lock_mode)
+
+    def _change_lock(self, request):
+        """
+        Changes the file lock for the given request without waiting unless it
+        has been cancelled. A lock changed for a request cancelled meanwhile is
+        restored. The thread lock must be held.
+
+        :param request: Lock change request
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        with self._restore_lock:
+            if request["is_cancelled"]:
+                return False
+
+        _return = self._file._change_lock(request["lock_mode"], 0)
+
+        with self._restore_lock:
+            is_restore_required = _return and request["is_cancelled"]
+
+            if _return and not is_restore_required:
+                request["is_changed"] = True
+
+        if is_restore_required:
+            self._restore_locking(request["previous_lock_mode"])
+            _return = False
+
+        return _return
+
+    def _restore_locking(self, lock_mode):
+        """
+        Restores the given file lock after a cancelled lock change. A shared
+        lock is released as the file instance does not tell if it has been
+        held before. The thread lock must be held.
+
+        :param lock_mode: The file locking mode to restore ("r" or "w").
+
+        :since: v1.1.0
+        """
+
+        file_instance = self._file
+
+        if (
+            file_instance._handle is not None
+            and file_instance._handle_lock != lock_mode
+        ):
+            if lock_mode == "w":
+                file_instance._change_lock("w", 0)
+            else:
+                file_instance.unlock()
+
+    async def open(self, file_path_name, readonly=False, file_mode="r+b"):
+        """
+        Opens a file session.
+
+        :param file_path_name: Path to the requested file
+        :param readonly: Open file in readonly mode
+        :param file_mode: File mode to use
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        async with self._get_operation_lock():
+            return await self._run(self._file.open, file_path_name, readonly, file_mode)
+
+    async def read(self, n=0, timeout=-1):
+        """
+        python.org: Read up to n bytes from the object and return them.
+
+        :param n: How many bytes to read from the current position (0 means until
+                  EOF)
+        :param timeout: Timeout to use (defaults to construction time value)
+
+        :return: (bytes) Data; None if EOF
+        :since:  v1.1.0
+        """
+
+        async with self._get_operation_lock():
+            _return = None
+
+            if await self._lock("r", None):
+                _return = await self._run(self._file.read, n, timeout)
+
+            return _return
+
+    async def readinto(self, buffer, timeout=-1):
+        """
+        python.org: Read bytes into a pre-allocated, writable bytes-like object b
+        and return the number of bytes read.
+
+        :param buffer: Writable bytes-like object to fill
+        :param timeout: Timeout to use (defaults to construction time value)
+
+        :return: (int) Number of bytes read
+        :since:  v1.1.0
+        """
+
+        async with self._get_operation_lock():
+            _return = 0
+
+            if await self._lock("r", None):
+                _return = await self._run(self._file.readinto, buffer, timeout)
+
+            return _return
+
+    async def _run(self, callback, *args):
+        """
+        Runs the given blocking callable in the executor.
+
+        :param callback: Blocking callable
+
+        :return: (mixed) Result of the callable
+        :since:  v1.1.0
+        """
+
+        return await self._submit(callback, *args)
+
+    def _serialized_call(self, callback, *args):
+        """
+        Calls the given callable while holding the thread lock of this instance.
+
+        :param callback: Blocking callable
+
+        :return: (mixed) Result of the callable
+        :since:  v1.1.0
+        """
+
+        with self._thread_lock:
+            self._apply_pending_lock_restore()
+            return callback(*args)
+
+    async def seek(self, offset):
+        """
+        python.org: Change the stream position to the given byte offset.
+
+        :param offset: Seek to the given offset
+
+        :return: (int) Return the new absolute position.
+        :since:  v1.1.0
+        """
+
+        async with self._get_operation_lock():
+            return await self._run(self._file.seek, offset)
+
+    def _submit(self, callback, *args):
+        """
+        Submits the given blocking callable to the executor.
+
+        :param callback: Blocking callable
+
+        :return: (object) asyncio future
+        :since:  v1.1.0
+        """
+
+        return asyncio.get_running_loop().run_in_executor(
+            self._get_executor(), partial(self._serialized_call, callback, *args)
+        )
+
+    async def tell(self):
+        """
+        python.org: Return the current stream position as an opaque number.
+
+        :return: (int) Stream position
+        :since:  v1.1.0
+        """
+
+        async with self._get_operation_lock():
+            return await self._run(self._file.tell)
+
+    async def truncate(self, new_size=None):
+        """
+        python.org: Resize the stream to the given size in bytes.
+
+        :param new_size: Cut file at the given byte position
+
+        :return: (int) New file size
+        :since:  v1.1.0
+        """
+
+        async with self._get_operation_lock():
+            if not await self._lock("w", None):
+                raise IOError("Failed to truncate the file")
+
+            return await self._run(self._file.truncate, new_size)
+
+    async def write(self, b, timeout=-1):
+        """
+        python.org: Write the given bytes or bytearray object, b, to the underlying
+        raw stream and return the number of bytes written.
+
+        :param b: (Over)write file with the given data at the current position
+        :param timeout: Timeout to use (defaults to construction time value)
+
+        :return: (int) Number of bytes written
+        :since:  v1.1.0
+        """
+
+        async with self._get_operation_lock():
+            _return = 0
+
+            if await self._lock("w", None):
+                _return = await self._run(self._file.write, b, timeout)
+
+            return _return
+
+    async def writev(self, buffers, timeout=-1):
+        """
+        Writes the given sequence of bytes-like objects at the current position
+        using a single vectored write if supported.
+
+        :param buffers: Sequence of bytes-like objects
+        :param timeout: Timeout to use (defaults to construction time value)
+
+        :return: (int) Number of bytes written
+        :since:  v1.1.0
+        """
+
+        async with self._get_operation_lock():
+            _return = 0
+
+            if await self._lock("w", None):
+                _return = await self._run(self._file.writev, buffers, timeout)
+
+            return _return
+
+    @staticmethod
+    def get_default_executor():
+        """
+        Returns the executor shared by instances not given an executor.
+
+        :return: (object) Executor
+        :since:  v1.1.0
+        """
+
+        # global: _default_executor, _default_executor_lock
+        # pylint: disable=global-statement
+
+        global _default_executor
+
+        if _default_executor is None:
+            with _default_executor_lock:
+                if _default_executor is None:
+                    _default_executor = ThreadPoolExecutor(
+                        max_workers=_DEFAULT_EXECUTOR_MAX_WORKERS,
+                        thread_name_prefix="ppt_file",
+                    )
+
+        return _default_executor
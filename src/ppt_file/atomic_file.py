@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+
+"""
+Personal Python Toolkit
+Modularized all-in-one toolkit for Python
+----------------------------------------------------------------------------
+(C) Tobias "NotTheEvilOne" Wolf - All rights reserved
+https://github.com/NotTheEvilOne/ppt_file
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint: disable=import-error,invalid-name
+
+from binascii import hexlify
+from os import path
+import os
+import stat
+
+from .file import File
+
+
+class AtomicFile(File):
+    """
+    File written to a temporary file in the same directory that atomically
+    replaces the target file on commit.
+
+    :author:     Tobias "NotTheEvilOne" Wolf et al.
+    :copyright:  Tobias "NotTheEvilOne" Wolf - All rights reserved
+    :package:    ppt
+    :subpackage: file
+    :since:      v1.1.0
+    :license:    http://mozilla.org/MPL/2.0/
+                 Mozilla Public License, v. 2.0
+    """
+
+    # pylint: disable=bad-option-value,slots-on-old-class
+    __slots__ = ("_target_path_name",)
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Constructor __init__(AtomicFile)
+
+        :since: v1.1.0
+        """
+
+        self._target_path_name = ""
+        """
+Path of the file replaced on commit
+        """
+
+        File.__init__(self, *args, **kwargs)
+
+    def __del__(self):
+        """
+        Destructor __del__(AtomicFile)
+
+        :since: v1.1.0
+        """
+
+        self.discard()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        python.org: Exit the runtime context related to this object.
+
+        :return: (bool) True to suppress exceptions
+        :since:  v1.1.0
+        """
+
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+    @property
+    def target_path_name(self):
+        """
+        Returns the path of the file replaced on commit.
+
+        :return: (str) Target file path and name
+        :since:  v1.1.0
+        """
+
+        return self._target_path_name
+
+    def close(self, delete_empty=False):
+        """
+        python.org: Flush and close this stream. The target file is replaced
+        with the data written.
+
+        :param delete_empty: If true and no data has been written the temporary
+                             file is discarded instead of replacing the target.
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        if delete_empty and self._handle is not None and self.file_size < 1:
+            self.discard()
+            _return = True
+        else:
+            _return = self.commit()
+
+        return _return
+
+    def commit(self):
+        """
+        Syncs the temporary file, replaces the target file with it and syncs
+        the directory.
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        if self._log_handler is not None:
+            self._log_handler.debug("ppt_file.AtomicFile.commit()")
+
+        _return = False
+
+        if self._handle is not None:
+            self._drain_write_buffer()
+            self._handle.flush()
+            os.fsync(self._handle.fileno())
+
+            temporary_path_name = self.file_path_name
+            target_path_name_os = path.normpath(self._target_path_name)
+
+            File.close(self)
+
+            os.replace(temporary_path_name, target_path_name_os)
+            _fsync_directory(path.dirname(path.abspath(target_path_name_os)))
+
+            self._target_path_name = ""
+            _return = True
+
+        return _return
+
+    def discard(self):
+        """
+        Closes and deletes the temporary file without touching the target file.
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        _return = False
+
+        if self._handle is not None:
+            temporary_path_name = self.file_path_name
+
+            File.close(self)
+
+            try:
+                os.unlink(temporary_path_name)
+                _return = True
+            except OSError:
+                pass
+
+            self._target_path_name = ""
+
+        return _return
+
+    def open(self, file_path_name, readonly=False, file_mode="w+b"):
+        """
+        Opens a temporary file session next to the given target file.
+
+        :param file_path_name: Path to the target file
+        :param readonly: Atomic files can not be opened read-only
+        :param file_mode: File mode to use
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        if readonly:
+            raise IOError("Atomic files can not be opened read-only")
+
+        if self._handle is not None:
+            return False
+
+        file_path_name_os = path.normpath(file_path_name)
+
+        try:
+            file_mode_bits = stat.S_IMODE(os.stat(file_path_name_os).st_mode)
+        except OSError:
+            # New targets get the same permissions as files created by "open()"
+            # of a file instance. The temporary file has been created with the
+            # process umask applied.
+            file_mode_bits = self._get_new_file_mode_bits()
+
+        temporary_path_name = _create_temporary_file(file_path_name_os)
+
+        if file_mode_bits is not None:
+            os.chmod(temporary_path_name, file_mode_bits)
+
+        _return = File.open(self, temporary_path_name, False, file_mode)
+
+        if _return:
+            self._target_path_name = file_path_name
+        else:
+            try:
+                os.unlink(temporary_path_name)
+            except OSError:
+                pass
+
+        return _return
+
+
+def _create_temporary_file(file_path_name_os):
+    """
+    Creates an empty temporary file in the directory of the given file.
+
+    :param file_path_name_os: Path of the target file
+
+    :return: (str) Path of the temporary file
+    :since:  v1.1.0
+    """
+
+    directory_path, file_name = path.split(path.abspath(file_path_name_os))
+    flags = os.O_CREAT | os.O_EXCL | os.O_RDWR | getattr(os, "O_CLOEXEC", 0)
+
+    while True:
+        _return = path.join(
+            directory_path,
+            ".{0}.{1}.tmp".format(file_name, hexlify(os.urandom(6)).decode("ascii")),
+        )
+
+        try:
+            os.close(os.open(_return, flags, 0o666))
+            break
+        except FileExistsError:
+            pass
+
+    return _return
+
+
+def _fsync_directory(directory_path):
+    """
+    Syncs the given directory to persist a rename.
+
+    :param directory_path: Directory path
+
+    :since: v1.1.0
+    """
+
+    try:
+        directory_descriptor = os.open(directory_path, os.O_RDONLY)
+    except OSError:
+        # Directories can not be opened on all platforms.
+        return
+
+    try:
+        os.fsync(directory_descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(directory_descriptor)
@@ -0,0 +1,1042 @@
+# -*- coding: utf-8 -*-
+
+"""
+Personal Python Toolkit
+Modularized all-in-one toolkit for Python
+----------------------------------------------------------------------------
+(C) Tobias "NotTheEvilOne" Wolf - All rights reserved
+https://github.com/NotTheEvilOne/ppt_file
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint: disable=import-error,invalid-name
+
+import struct
+import time
+import zlib
+
+from .file import _IO_CHUNK_SIZE, File, _new_digest
+
+try:
+    import lzma
+except ImportError:
+    lzma = None
+
+_CODECS = ("zlib", "lzma")
+"""
+Supported compression codecs in the order of their identifier stored
+"""
+_DECOMPRESSION_ERRORS = (
+    (zlib.error,) if (lzma is None) else (zlib.error, lzma.LZMAError)
+)
+"""
+Exceptions raised for corrupted compressed data
+"""
+_FOOTER = struct.Struct(">QQQ4s")
+"""
+Trailing footer containing the uncompressed size, the number of blocks, the
+offset of the block index and the magic
+"""
+_HEADER = struct.Struct(">4sBBI")
+"""
+Leading header containing the magic, the format version, the codec identifier
+and the uncompressed block size
+"""
+_MAGIC = b"PPTZ"
+"""
+Magic identifying compressed files
+"""
+
+
+class CompressedFile(File):
+    """
+    Binary file storing data in fixed-size, independently compressed blocks
+    followed by a block index. Reading and seeking use uncompressed offsets
+    and only decompress the blocks touched. Data can only be appended.
+
+    :author:     Tobias "NotTheEvilOne" Wolf et al.
+    :copyright:  Tobias "NotTheEvilOne" Wolf - All rights reserved
+    :package:    ppt
+    :subpackage: file
+    :since:      v1.1.0
+    :license:    http://mozilla.org/MPL/2.0/
+                 Mozilla Public License, v. 2.0
+    """
+
+    # pylint: disable=bad-option-value,slots-on-old-class
+    __slots__ = (
+        "block_size",
+        "_block_cache",
+        "_block_offsets",
+        "compression",
+        "compression_level",
+        "_data_end",
+        "_pending",
+        "_position",
+        "_trailer_dirty",
+    )
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    _is_raw = False
+    """
+Compressed files do not store data as given
+    """
+
+    def __init__(
+        self,
+        *args,
+        compression="zlib",
+        compression_level=None,
+        block_size=65536,
+        **kwargs,
+    ):
+        """
+        Constructor __init__(CompressedFile)
+
+        :param compression: Compression codec used for new files ("zlib" or
+                            "lzma")
+        :param compression_level: Compression level or preset (None for the
+                                  codec default)
+        :param block_size: Uncompressed size of each block of new files
+
+        :since: v1.1.0
+        """
+
+        if compression not in _CODECS or (compression == "lzma" and lzma is None):
+            raise ValueError("Unsupported compression codec")
+
+        if block_size < 1:
+            raise ValueError("Block size must be positive")
+
+        self.block_size = block_size
+        """
+Uncompressed size of each block
+        """
+        self._block_cache = None
+        """
+Index and data of the block decompressed last
+        """
+        self._block_offsets = []
+        """
+Offsets of the compressed blocks written
+        """
+        self.compression = compression
+        """
+Compression codec in use
+        """
+        self.compression_level = compression_level
+        """
+Compression level or preset (None for the codec default)
+        """
+        self._data_end = _HEADER.size
+        """
+Offset after the last compressed block written
+        """
+        self._pending = None
+        """
+Uncompressed data of the incomplete last block
+        """
+        self._position = 0
+        """
+Uncompressed stream position
+        """
+        self._trailer_dirty = False
+        """
+True if the block index needs to be written
+        """
+
+        File.__init__(self, *args, **kwargs)
+
+    def close(self, delete_empty=False):
+        """
+        python.org: Flush and close this stream. The block index is written
+        before.
+
+        :param delete_empty: If the file handle is valid, the file is empty and
+                             this parameter is true then the file will be deleted.
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        if (
+            self._handle is not None
+            and self._trailer_dirty
+            and not (delete_empty and self.file_size < 1)
+            and self.lock("w")
+        ):
+            self._write_trailer()
+
+        _return = File.close(self, delete_empty)
+
+        self._block_cache = None
+        self._block_offsets = []
+        self._data_end = _HEADER.size
+        self._pending = None
+        self._position = 0
+        self._trailer_dirty = False
+
+        return _return
+
+    def copy_to(self, other, offset=None, length=None, timeout=-1):
+        """
+        Copying raw data is not supported for compressed files.
+
+        :since: v1.1.0
+        """
+
+        raise IOError("Compressed files do not support copying raw data")
+
+    def digest(self, algorithm="sha256", offset=0, length=None):
+        """
+        Hashes the uncompressed data in one locked pass reusing a single
+        buffer. The file position is not changed.
+
+        :param algorithm: "crc32" or an algorithm supported by "hashlib.new()"
+        :param offset: Uncompressed offset to start hashing at
+        :param length: Number of bytes to hash (defaults to all data until EOF)
+
+        :return: (str) Hexadecimal digest; None on error
+        :since:  v1.1.0
+        """
+
+        if self._log_handler is not None:
+            self._log_handler.debug("ppt_file.CompressedFile.digest({0})", algorithm)
+
+        _return = None
+
+        if self._handle_lock == "w" or self.lock("r"):
+            if length is None:
+                length = max(0, self.file_size - offset)
+
+            digest = _new_digest(algorithm)
+            buffer = bytearray(min(length, self.block_size))
+            bytes_hashed = 0
+
+            with memoryview(buffer) as view:
+                while bytes_hashed < length:
+                    part_size = min(len(buffer), length - bytes_hashed)
+
+                    bytes_read = self._copy_uncompressed(
+                        view[:part_size], offset + bytes_hashed
+                    )
+
+                    if bytes_read < 1:
+                        break
+
+                    digest.update(view[:bytes_read])
+                    bytes_hashed += bytes_read
+
+            _return = digest.hexdigest()
+
+        return _return
+
+    def flush(self):
+        """
+        python.org: Flush the write buffers of the stream if applicable. The
+        block index is written before.
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        if self._handle is not None and self._trailer_dirty and self.lock("w"):
+            self._write_trailer()
+
+        return File.flush(self)
+
+    def follow(self, lines=False, timeout=-1, wait_strategy=None):
+        """
+        Following appended data is not supported for compressed files.
+
+        :since: v1.1.0
+        """
+
+        raise IOError("Compressed files do not support following appended data")
+
+    def iter_chunks(self, size=_IO_CHUNK_SIZE, timeout=-1):
+        """
+        Returns a generator reading the uncompressed data from the current
+        position until EOF in chunks of the given size. The shared lock is taken
+        once.
+
+        :param size: Chunk size in bytes
+        :param timeout: Timeout to use (defaults to construction time value)
+
+        :return: (object) Generator of data chunks
+        :since:  v1.1.0
+        """
+
+        if self._log_handler is not None:
+            self._log_handler.debug(
+                "ppt_file.CompressedFile.iter_chunks({0:d}, {1:d})", size, timeout
+            )
+
+        if self._handle_lock == "w" or self.lock("r"):
+            timeout_time = None if (timeout < 0) else (time.time() + timeout)
+
+            while not self.is_eof:
+                if timeout_time is not None and time.time() >= timeout_time:
+                    self._log_timeout_before_eof()
+                    break
+
+                chunk = self._read_binary(self._get_read_size(size), timeout_time)
+
+                if self.metrics is not None:
+                    self.metrics.increment("bytes_read", len(chunk))
+
+                if len(chunk) < 1:
+                    break
+
+                if self._running_digest is not None:
+                    self._update_running_digest(chunk)
+
+                yield chunk
+
+    def iter_lines(self, timeout=-1):
+        """
+        Returns a generator reading the uncompressed data line by line from the
+        current position until EOF. The shared lock is taken once.
+
+        :param timeout: Timeout to use (defaults to construction time value)
+
+        :return: (object) Generator of lines including line endings
+        :since:  v1.1.0
+        """
+
+        if self._log_handler is not None:
+            self._log_handler.debug(
+                "ppt_file.CompressedFile.iter_lines({0:d})", timeout
+            )
+
+        if self._handle_lock == "w" or self.lock("r"):
+            timeout_time = None if (timeout < 0) else (time.time() + timeout)
+
+            while not self.is_eof:
+                if timeout_time is not None and time.time() >= timeout_time:
+                    self._log_timeout_before_eof()
+                    break
+
+                line = self._readline()
+
+                if self.metrics is not None:
+                    self.metrics.increment("bytes_read", len(line))
+
+                if len(line) < 1:
+                    break
+
+                if self._running_digest is not None:
+                    self._update_running_digest(line)
+
+                yield line
+
+    def open(self, file_path_name, readonly=False, file_mode="r+b", dir_fd=None):
+        """
+        Opens a compressed file session. Empty files are initialized with the
+        codec and block size of this instance.
+
+        :param file_path_name: Path to the requested file
+        :param readonly: Open file in readonly mode
+        :param file_mode: File mode to use
+        :param dir_fd: Directory descriptor relative paths are resolved against
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        if "b" not in file_mode or "a" in file_mode:
+            raise IOError("Compressed files require a binary, non-append file mode")
+
+        _return = File.open(self, file_path_name, readonly, file_mode, dir_fd)
+
+        if _return:
+            if self.file_size < 1:
+                self.file_size = 0
+                self._trailer_dirty = not self.readonly
+            else:
+                try:
+                    self._read_index()
+                except IOError:
+                    File.close(self)
+                    raise
+
+        return _return
+
+    def parallel_map(self, *args, **kwargs):
+        """
+        Mapping raw data ranges is not supported for compressed files.
+
+        :since: v1.1.0
+        """
+
+        raise IOError("Compressed files do not support mapping raw data ranges")
+
+    def preallocate(self, size):
+        """
+        Preallocating raw data is not supported for compressed files.
+
+        :since: v1.1.0
+        """
+
+        raise IOError("Compressed files do not support preallocating raw data")
+
+    def pread_many(self, ranges):
+        """
+        Reads the given uncompressed ranges while taking the shared lock once.
+        The file position is not changed.
+
+        :param ranges: Sequence of offset and length tuples
+
+        :return: (list) Data of each range in the order given; None on error
+        :since:  v1.1.0
+        """
+
+        if self._log_handler is not None:
+            self._log_handler.debug("ppt_file.CompressedFile.pread_many()")
+
+        _return = None
+
+        if self._handle_lock == "w" or self.lock("r"):
+            _return = [self._read_at(offset, n, None) for offset, n in ranges]
+
+        return _return
+
+    def punch_hole(self, offset, length):
+        """
+        Deallocating raw data ranges is not supported for compressed files.
+
+        :since: v1.1.0
+        """
+
+        raise IOError("Compressed files do not support deallocating raw data")
+
+    def _read_binary(self, size, timeout_time):
+        """
+        Reads up to the given size of uncompressed bytes.
+
+        :param size: How many bytes to read from the current position
+        :param timeout_time: Time after which reading is aborted; None for no
+                             timeout
+
+        :return: (bytes) Data
+        :since:  v1.1.0
+        """
+
+        _return = bytearray(size)
+
+        with memoryview(_return) as view:
+            bytes_read = self._readinto(view, timeout_time)
+
+        if bytes_read < size:
+            del _return[bytes_read:]
+
+        return bytes(_return)
+
+    def _get_read_size(self, n):
+        """
+        Returns the number of uncompressed bytes available for reading from the
+        current position limited by n.
+
+        :param n: Maximum number of bytes requested (0 means until EOF)
+
+        :return: (int) Number of bytes to read
+        :since:  v1.1.0
+        """
+
+        _return = max(0, self.file_size - self._position)
+        if n > 0 and n < _return:
+            _return = n
+
+        return _return
+
+    def read_range(self, offset, n, timeout=-1):
+        """
+        Reads n uncompressed bytes at the given offset while holding the shared
+        lock. The file position is not changed.
+
+        :param offset: Uncompressed offset to read from
+        :param n: How many bytes to read
+        :param timeout: Timeout to use (defaults to construction time value)
+
+        :return: (bytes) Data; None on error
+        :since:  v1.1.0
+        """
+
+        if self._log_handler is not None:
+            self._log_handler.debug(
+                "ppt_file.CompressedFile.read_range({0:d}, {1:d}, {2:d})",
+                offset,
+                n,
+                timeout,
+            )
+
+        _return = None
+
+        if self._handle_lock == "w" or self.lock("r"):
+            timeout_time = None if (timeout < 0) else (time.time() + timeout)
+            _return = self._read_at(offset, n, timeout_time)
+
+            if self.metrics is not None:
+                self.metrics.increment("bytes_read", len(_return))
+
+        return _return
+
+    def _read_at(self, offset, n, timeout_time):
+        """
+        Reads up to n uncompressed bytes at the given offset.
+
+        :param offset: Uncompressed offset to read from
+        :param n: How many bytes to read
+        :param timeout_time: Time after which reading is aborted; None for no
+                             timeout
+
+        :return: (bytes) Data
+        :since:  v1.1.0
+        """
+
+        _return = bytearray(max(0, min(n, self.file_size - offset)))
+        bytes_read = 0
+
+        with memoryview(_return) as view:
+            while bytes_read < len(_return) and (
+                timeout_time is None or time.time() < timeout_time
+            ):
+                part_size = self._copy_uncompressed(
+                    view[bytes_read:], offset + bytes_read
+                )
+
+                if part_size < 1:
+                    break
+
+                bytes_read += part_size
+
+        if bytes_read < len(_return):
+            del _return[bytes_read:]
+
+        return bytes(_return)
+
+    def _readinto(self, view, timeout_time):
+        """
+        Fills the given memoryview with uncompressed data from the current
+        position.
+
+        :param view: Writable memoryview of bytes to fill
+        :param timeout_time: Time after which reading is aborted; None for no
+                             timeout
+
+        :return: (int) Number of bytes read
+        :since:  v1.1.0
+        """
+
+        _return = 0
+        size = len(view)
+
+        while _return < size and (timeout_time is None or time.time() < timeout_time):
+            bytes_read = self._copy_uncompressed(view[_return:], self._position)
+
+            if bytes_read < 1:
+                break
+
+            _return += bytes_read
+            self._position += bytes_read
+
+        if timeout_time is not None and _return < size and time.time() >= timeout_time:
+            self._log_timeout_before_eof()
+
+        return _return
+
+    def _readline(self):
+        """
+        Reads uncompressed data from the current position up to and including
+        the next line ending.
+
+        :return: (bytes) Line read
+        :since:  v1.1.0
+        """
+
+        parts = []
+
+        while self._position < self.file_size:
+            block_index = self._position // self.block_size
+            data = self._get_block(block_index)
+
+            start = self._position - (block_index * self.block_size)
+            end = data.find(b"\n", start)
+            end = len(data) if (end < 0) else end + 1
+
+            if end <= start:
+                break
+
+            parts.append(bytes(data[start:end]))
+            self._position += end - start
+
+            if data[end - 1] == 10:
+                break
+
+        return b"".join(parts)
+
+    def refresh_size(self):
+        """
+        Refreshing the size from the raw file is not supported for compressed
+        files.
+
+        :since: v1.1.0
+        """
+
+        raise IOError("Compressed files do not support refreshing the file size")
+
+    def seek(self, offset):
+        """
+        python.org: Change the stream position to the given uncompressed byte
+        offset.
+
+        :param offset: Seek to the given offset
+
+        :return: (int) Return the new absolute position.
+        :since:  v1.1.0
+        """
+
+        if self._log_handler is not None:
+            self._log_handler.debug("ppt_file.CompressedFile.seek({0:d})", offset)
+
+        if self._handle is None:
+            _return = -1
+        elif offset < 0:
+            raise IOError("Negative seek position")
+        else:
+            self._position = offset
+            _return = offset
+
+        return _return
+
+    def tell(self):
+        """
+        python.org: Return the current uncompressed stream position.
+
+        :return: (int) Stream position
+        :since:  v1.1.0
+        """
+
+        return -1 if (self._handle is None) else self._position
+
+    def truncate(self, new_size=None):
+        """
+        python.org: Resize the uncompressed stream to the given size in bytes.
+        Only the last block kept is decompressed and rewritten.
+
+        :param new_size: Cut file at the given byte position
+
+        :return: (int) New file size
+        :since:  v1.1.0
+        """
+
+        if new_size is None:
+            new_size = max(0, self.tell())
+        if self._log_handler is not None:
+            self._log_handler.debug("ppt_file.CompressedFile.truncate({0:d})", new_size)
+
+        if self.lock("w"):
+            self._load_pending_block()
+
+            if new_size > self.file_size:
+                zero_block = bytes(self.block_size)
+
+                while self.file_size < new_size:
+                    part_size = min(self.block_size, new_size - self.file_size)
+                    self._append(memoryview(zero_block)[:part_size])
+            else:
+                block_index = new_size // self.block_size
+                block_offset = new_size - (block_index * self.block_size)
+
+                if block_index < len(self._block_offsets):
+                    data = self._get_block(block_index)
+
+                    self._pending = bytearray(data[:block_offset])
+                    self._data_end = self._block_offsets[block_index]
+
+                    del self._block_offsets[block_index:]
+                    self._block_cache = None
+                else:
+                    del self._pending[block_offset:]
+
+                self.file_size = new_size
+
+            self._trailer_dirty = True
+            _return = new_size
+        else:
+            raise IOError("Failed to truncate the file")
+
+        return _return
+
+    def write(self, b, timeout=-1):
+        """
+        python.org: Write the given bytes or bytearray object, b, to the underlying
+        raw stream and return the number of bytes written. Data can only be
+        appended at the end of the uncompressed stream.
+
+        :param b: Data to append at the current position
+        :param timeout: Timeout to use (defaults to construction time value)
+
+        :return: (int) Number of bytes written
+        :since:  v1.1.0
+        """
+
+        if self._log_handler is not None:
+            self._log_handler.debug("ppt_file.CompressedFile.write({0:d})", timeout)
+
+        _return = 0
+
+        if self.lock("w"):
+            if self._position != self.file_size:
+                raise IOError("Compressed files only support appending data")
+
+            view = self._get_binary_view(b)
+
+            timeout_time = time.time()
+            timeout_time += self.timeout_retries if (timeout < 0) else timeout
+
+            self._load_pending_block()
+
+            while _return < len(view) and time.time() < timeout_time:
+                part_size = min(_IO_CHUNK_SIZE, len(view) - _return)
+                self._append(view[_return : _return + part_size])
+                _return += part_size
+
+            self._position = self.file_size
+            self._trailer_dirty = True
+
+            if self._running_digest is not None:
+                self._update_running_digest(view[:_return])
+
+            if self.metrics is not None:
+                self.metrics.increment("bytes_written", _return)
+
+            if _return < len(view):
+                if self.metrics is not None:
+                    self.metrics.increment("write_timeouts")
+
+                if self._log_handler is not None:
+                    self._log_handler.error(
+                        "ppt_file.CompressedFile.write()- reporting: Timeout occured before EOF"
+                    )
+
+        return _return
+
+    def _append(self, view):
+        """
+        Appends the given data to the incomplete last block and writes each
+        block completed.
+
+        :param view: memoryview of bytes
+
+        :since: v1.1.0
+        """
+
+        bytes_appended = 0
+
+        while bytes_appended < len(view):
+            part_size = min(
+                self.block_size - len(self._pending), len(view) - bytes_appended
+            )
+
+            self._pending += view[bytes_appended : bytes_appended + part_size]
+            bytes_appended += part_size
+
+            if len(self._pending) >= self.block_size:
+                self._write_block(self._pending)
+                self._pending = bytearray()
+
+        self.file_size += bytes_appended
+
+    def write_range(self, offset, b, timeout=-1):
+        """
+        Writing at an offset is not supported for compressed files.
+
+        :since: v1.1.0
+        """
+
+        raise IOError("Compressed files only support appending data")
+
+    def writev(self, buffers, timeout=-1):
+        """
+        Appends the given sequence of bytes-like objects at the current position.
+
+        :param buffers: Sequence of bytes-like objects
+        :param timeout: Timeout to use (defaults to construction time value)
+
+        :return: (int) Number of bytes written
+        :since:  v1.1.0
+        """
+
+        _return = 0
+
+        for buffer in buffers:
+            _return += self.write(buffer, timeout)
+
+        return _return
+
+    def _compress(self, data):
+        """
+        Compresses the given block data with the codec in use.
+
+        :param data: Uncompressed block data
+
+        :return: (bytes) Compressed block data
+        :since:  v1.1.0
+        """
+
+        if self.compression == "lzma":
+            _return = (
+                lzma.compress(data)
+                if (self.compression_level is None)
+                else lzma.compress(data, preset=self.compression_level)
+            )
+        else:
+            _return = zlib.compress(
+                data, -1 if (self.compression_level is None) else self.compression_level
+            )
+
+        return _return
+
+    def _copy_uncompressed(self, view, offset):
+        """
+        Copies uncompressed data of the block containing the given offset into
+        the given memoryview.
+
+        :param view: Writable memoryview of bytes to fill
+        :param offset: Uncompressed offset to copy from
+
+        :return: (int) Number of bytes copied
+        :since:  v1.1.0
+        """
+
+        block_index = offset // self.block_size
+        data = self._get_block(block_index)
+
+        start = offset - (block_index * self.block_size)
+        _return = max(0, min(len(view), len(data) - start))
+
+        if _return > 0:
+            view[:_return] = data[start : start + _return]
+
+        return _return
+
+    def _decompress(self, data):
+        """
+        Decompresses the given block data with the codec in use.
+
+        :param data: Compressed block data
+
+        :return: (bytes) Uncompressed block data
+        :since:  v1.1.0
+        """
+
+        try:
+            _return = (
+                lzma.decompress(data)
+                if (self.compression == "lzma")
+                else zlib.decompress(data)
+            )
+        except _DECOMPRESSION_ERRORS:
+            raise IOError("Compressed block is corrupted")
+
+        return _return
+
+    def _get_block(self, block_index):
+        """
+        Returns the uncompressed data of the given block.
+
+        :param block_index: Block index
+
+        :return: (bytes) Uncompressed block data
+        :since:  v1.1.0
+        """
+
+        block_count = len(self._block_offsets)
+
+        if block_index < block_count:
+            block_cache = self._block_cache
+
+            if block_cache is not None and block_cache[0] == block_index:
+                _return = block_cache[1]
+            else:
+                block_end = (
+                    self._block_offsets[block_index + 1]
+                    if (block_index + 1 < block_count)
+                    else self._data_end
+                )
+
+                _return = self._decompress(
+                    self._read_raw(
+                        self._block_offsets[block_index],
+                        block_end - self._block_offsets[block_index],
+                    )
+                )
+
+                self._block_cache = (block_index, _return)
+        elif block_index == block_count and self._pending is not None:
+            _return = self._pending
+        else:
+            _return = b""
+
+        return _return
+
+    def _load_pending_block(self):
+        """
+        Decompresses an incomplete last block to append data to it.
+
+        :since: v1.1.0
+        """
+
+        if self._pending is None:
+            block_count = len(self._block_offsets)
+
+            if block_count > 0 and self.file_size < (block_count * self.block_size):
+                self._pending = bytearray(self._get_block(block_count - 1))
+                self._data_end = self._block_offsets.pop()
+                self._block_cache = None
+            else:
+                self._pending = bytearray()
+
+    def _read_index(self):
+        """
+        Reads the header and the block index of the opened file.
+
+        :since: v1.1.0
+        """
+
+        raw_size = self.file_size
+
+        if raw_size < (_HEADER.size + _FOOTER.size):
+            raise IOError("Invalid compressed file")
+
+        magic, version, codec, block_size = _HEADER.unpack(
+            self._read_raw(0, _HEADER.size)
+        )
+
+        if magic != _MAGIC or version != 1 or codec >= len(_CODECS) or block_size < 1:
+            raise IOError("Invalid compressed file")
+
+        uncompressed_size, block_count, index_offset, magic = _FOOTER.unpack(
+            self._read_raw(raw_size - _FOOTER.size, _FOOTER.size)
+        )
+
+        if magic != _MAGIC or index_offset + (8 * block_count) + _FOOTER.size != (
+            raw_size
+        ):
+            raise IOError("Invalid compressed file")
+
+        if _CODECS[codec] == "lzma" and lzma is None:
+            raise IOError("Compression codec not supported")
+
+        self.block_size = block_size
+        self._block_offsets = list(
+            struct.unpack(
+                ">{0:d}Q".format(block_count),
+                self._read_raw(index_offset, 8 * block_count),
+            )
+        )
+        self.compression = _CODECS[codec]
+        self._data_end = index_offset
+        self.file_size = uncompressed_size
+
+    def _read_raw(self, offset, n):
+        """
+        Reads exactly n raw bytes at the given offset without changing the file
+        position.
+
+        :param offset: Raw offset to read from
+        :param n: How many bytes to read
+
+        :return: (bytearray) Data
+        :since:  v1.1.0
+        """
+
+        if not self.readonly:
+            self._handle.flush()
+
+        file_descriptor = self._handle.fileno()
+        _return = bytearray(n)
+        bytes_read = 0
+
+        with memoryview(_return) as view:
+            while bytes_read < n:
+                part_size = self._pread_into(
+                    file_descriptor, view[bytes_read:], offset + bytes_read
+                )
+
+                if self.metrics is not None:
+                    self.metrics.increment("syscalls")
+
+                if part_size < 1:
+                    raise IOError("Invalid compressed file")
+
+                bytes_read += part_size
+
+        return _return
+
+    def _write_block(self, data):
+        """
+        Compresses and writes the given complete block.
+
+        :param data: Uncompressed block data
+
+        :since: v1.1.0
+        """
+
+        compressed_data = self._compress(data)
+
+        self._handle.seek(self._data_end)
+        self._handle.write(compressed_data)
+
+        if self.metrics is not None:
+            self.metrics.increment("syscalls")
+
+        self._block_offsets.append(self._data_end)
+        self._data_end += len(compressed_data)
+
+    def _write_trailer(self):
+        """
+        Writes the header, the incomplete last block and the block index. The
+        incomplete block is kept in memory to append further data.
+
+        :since: v1.1.0
+        """
+
+        self._load_pending_block()
+
+        block_offsets = list(self._block_offsets)
+        trailer = bytearray()
+
+        if len(self._pending) > 0:
+            block_offsets.append(self._data_end)
+            trailer += self._compress(self._pending)
+
+        index_offset = self._data_end + len(trailer)
+
+        trailer += struct.pack(">{0:d}Q".format(len(block_offsets)), *block_offsets)
+
+        trailer += _FOOTER.pack(
+            self.file_size, len(block_offsets), index_offset, _MAGIC
+        )
+
+        self._handle.seek(0)
+
+        self._handle.write(
+            _HEADER.pack(_MAGIC, 1, _CODECS.index(self.compression), self.block_size)
+        )
+
+        self._handle.seek(self._data_end)
+        self._handle.write(trailer)
+        self._handle.truncate()
+
+        if self.metrics is not None:
+            self.metrics.increment("syscalls", 3)
+
+        self._trailer_dirty = False
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+"""
+Personal Python Toolkit
+Modularized all-in-one toolkit for Python
+----------------------------------------------------------------------------
+(C) Tobias "NotTheEvilOne" Wolf - All rights reserved
+https://github.com/NotTheEvilOne/ppt_file
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint: disable=invalid-name
+
+import struct
+import zlib
+
+
+class Crc32Digest(object):
+    """
+    "zlib.crc32()" checksum providing the interface of "hashlib" objects.
+
+    :author:     Tobias "NotTheEvilOne" Wolf et al.
+    :copyright:  Tobias "NotTheEvilOne" Wolf - All rights reserved
+    :package:    ppt
+    :subpackage: file
+    :since:      v1.1.0
+    :license:    http://mozilla.org/MPL/2.0/
+                 Mozilla Public License, v. 2.0
+    """
+
+    # pylint: disable=bad-option-value,slots-on-old-class
+    __slots__ = ("_value",)
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    block_size = 1
+    """
+Internal block size of the checksum algorithm in bytes
+    """
+    digest_size = 4
+    """
+Size of the resulting checksum in bytes
+    """
+    name = "crc32"
+    """
+Canonical name of the checksum algorithm
+    """
+
+    def __init__(self, data=None):
+        """
+        Constructor __init__(Crc32Digest)
+
+        :param data: Initial data to update the checksum with
+
+        :since: v1.1.0
+        """
+
+        self._value = 0
+        """
+Current checksum value
+        """
+
+        if data is not None:
+            self.update(data)
+
+    def copy(self):
+        """
+        python.org: Return a copy ("clone") of the hash object.
+
+        :return: (object) Crc32Digest instance
+        :since:  v1.1.0
+        """
+
+        _return = Crc32Digest()
+        _return._value = self._value
+
+        return _return
+
+    def digest(self):
+        """
+        python.org: Return the digest of the data passed to the update() method
+        so far.
+
+        :return: (bytes) Big-endian checksum
+        :since:  v1.1.0
+        """
+
+        return struct.pack(">I", self._value)
+
+    def hexdigest(self):
+        """
+        python.org: Like digest() except the digest is returned as a string
+        object of double length, containing only hexadecimal digits.
+
+        :return: (str) Hexadecimal checksum
+        :since:  v1.1.0
+        """
+
+        return "{0:08x}".format(self._value)
+
+    def update(self, data):
+        """
+        python.org: Update the hash object with the bytes-like object.
+
+        :param data: Data to update the checksum with
+
+        :since: v1.1.0
+        """
+
+        self._value = zlib.crc32(data, self._value)
@@ -14,12 +14,27 @@ obtain one at http://mozilla.org/MPL/2.0/.
 
 # pylint: disable=import-error,invalid-name,no-member,undefined-variable
 
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from functools import partial
 from os import path
 from weakref import proxy, ProxyTypes
+import errno
+import hashlib
 import os
 import stat
+import struct
+import sys
+import threading
 import time
 
+from .crc32_digest import Crc32Digest
+from .group_commit_syncer import GroupCommitSyncer
+from .lock_file_lease import LockFileLease
+from .lock_registry import LockRegistry
+from .lock_wait_strategy import LockWaitStrategy
+
 try:
     import fcntl
 
@@ -27,6 +42,94 @@ try:
 except ImportError:
     _USE_FILE_LOCKING = True
 
+_USE_OFD_LOCKING = (
+    not _USE_FILE_LOCKING
+    and sys.platform.startswith("linux")
+    and hasattr(fcntl, "F_OFD_SETLK")
+)
+
+_IO_CHUNK_SIZE = 16384
+"""
+Number of bytes transferred per step if a timeout is given
+"""
+
+_COPY_CHUNK_SIZE = 1048576
+"""
+Number of bytes copied per step by "File.copy_to()"
+"""
+
+_COPY_FALLBACK_ERRNOS = (
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EBADF,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.EPERM,
+)
+"""
+Error numbers raised by kernel-side copy calls not supporting the given files
+"""
+
+_FADVISE_NAMES = {
+    "normal": "POSIX_FADV_NORMAL",
+    "sequential": "POSIX_FADV_SEQUENTIAL",
+    "random": "POSIX_FADV_RANDOM",
+    "willneed": "POSIX_FADV_WILLNEED",
+    "dontneed": "POSIX_FADV_DONTNEED",
+    "noreuse": "POSIX_FADV_NOREUSE",
+}
+"""
+Names of "os.posix_fadvise()" constants by advice name
+"""
+
+_FALLOC_FL_KEEP_SIZE = 0x01
+"""
+"fallocate()" mode flag allocating space without changing the file size
+"""
+
+_FALLOC_FL_PUNCH_HOLE = 0x02
+"""
+"fallocate()" mode flag deallocating space
+"""
+
+_FALLOCATE_UNSUPPORTED_ERRNOS = (
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+)
+"""
+Error numbers raised by "fallocate()" if the file system does not support it
+"""
+
+_LIBC_FALLOCATE = None
+"""
+Linux "fallocate()" function supporting mode flags
+"""
+
+if sys.platform.startswith("linux"):
+    try:
+        import ctypes
+
+        _libc = ctypes.CDLL(None, use_errno=True)
+
+        _LIBC_FALLOCATE = getattr(_libc, "fallocate64", None) or _libc.fallocate
+        _LIBC_FALLOCATE.argtypes = (
+            ctypes.c_int,
+            ctypes.c_int,
+            ctypes.c_int64,
+            ctypes.c_int64,
+        )
+        _LIBC_FALLOCATE.restype = ctypes.c_int
+    except (AttributeError, ImportError, OSError):
+        _LIBC_FALLOCATE = None
+
+_POSITIONAL_READ_LOCK = threading.Lock()
+"""
+Lock used to emulate positional reads on platforms without "os.pread()"
+"""
+
 _PathLike = os.PathLike if (hasattr(os, "PathLike")) else object
 
 
@@ -47,26 +150,57 @@ class File(_PathLike):
     __slots__ = (
         "binary",
         "chmod",
+        "_dir_fd",
+        "durability",
         "file_path_name",
         "file_size",
         "_handle",
         "_handle_lock",
+        "_lock_file_lease",
         "_log_handler",
+        "lock_registry",
+        "_lock_registry_key",
+        "lock_wait_strategy",
+        "metrics",
+        "_preallocated_size",
+        "_preallocated_visible",
+        "preallocation_step",
         "readonly",
+        "_running_digest",
         "timeout_retries",
         "umask",
+        "_write_buffer",
+        "_write_buffer_length",
+        "_write_buffer_offset",
+        "write_buffer_size",
     )
     """
 python.org: __slots__ reserves space for the declared variables and prevents
 the automatic creation of __dict__ and __weakref__ for each instance.
     """
 
+    default_durability = "fsync"
+    """
+Durability policy used by "flush()" of instances without an explicit one
+("none", "fdatasync", "fsync" or "group_commit")
+    """
+    _is_raw = True
+    """
+True if data is stored as given and can be copied between file descriptors
+    """
+
     def __init__(
         self,
         default_umask=None,
         default_chmod=None,
         timeout_retries=5,
         log_handler=None,
+        lock_wait_strategy=None,
+        durability=None,
+        metrics=None,
+        write_buffer_size=0,
+        preallocation_step=0,
+        lock_registry=None,
     ):
         """
         Constructor __init__(File)
@@ -75,6 +209,18 @@ the automatic creation of __dict__ and __weakref__ for each instance.
         :param default_chmod: chmod to set when creating a new file
         :param timeout_retries: Retries before timing out
         :param log_handler: Log handler to use
+        :param lock_wait_strategy: Strategy used to wait for file locks
+        :param durability: Durability policy used by "flush()" (defaults to the
+                           process wide policy)
+        :param metrics: FileMetrics instance to record counters and latencies in
+        :param write_buffer_size: Size of the buffer coalescing smaller binary
+                                  writes (0 to disable)
+        :param preallocation_step: Size in bytes the space allocated is grown
+                                   by when writes extend the file without
+                                   changing its visible size (0 to disable)
+        :param lock_registry: LockRegistry instance coordinating the locks of
+                              the process in memory (True to use the shared
+                              instance)
 
         :since: v1.0.0
         """
@@ -86,6 +232,14 @@ Binary file flag
         self.chmod = None
         """
 chmod to set when creating a new file
+        """
+        self._dir_fd = None
+        """
+Directory descriptor the file path is relative to
+        """
+        self.durability = durability
+        """
+Durability policy used by "flush()"
         """
         self.file_path_name = ""
         """
@@ -102,15 +256,55 @@ Handle to the opened file
         self._handle_lock = "r"
         """
 Current locking mode
+        """
+        self._lock_file_lease = None
+        """
+Lock file lease used if "fcntl" is not available
         """
         self._log_handler = None
         """
 The log handler is called whenever debug messages should be logged or errors
 happened.
+        """
+        self.lock_registry = (
+            LockRegistry.get_instance() if (lock_registry is True) else lock_registry
+        )
+        """
+LockRegistry instance coordinating the locks of the process in memory
+        """
+        self._lock_registry_key = None
+        """
+Device and inode of the opened file used as the lock registry key
+        """
+        self.lock_wait_strategy = (
+            LockWaitStrategy() if (lock_wait_strategy is None) else lock_wait_strategy
+        )
+        """
+Strategy used to wait for file locks
+        """
+        self.metrics = metrics
+        """
+FileMetrics instance to record counters and latencies in; None to disable
+        """
+        self._preallocated_size = 0
+        """
+Size the space has been allocated for
+        """
+        self._preallocated_visible = False
+        """
+True if the preallocated space extended the size visible to the file system
+        """
+        self.preallocation_step = preallocation_step
+        """
+Size in bytes the space allocated is grown by when writes extend the file
         """
         self.readonly = False
         """
 True if file is opened read-only
+        """
+        self._running_digest = None
+        """
+Digest updated with data read or written sequentially
         """
         self.timeout_retries = 5 if (timeout_retries is None) else timeout_retries
         """
@@ -120,10 +314,26 @@ Retries before timing out
         """
 umask to set before creating a new file
         """
+        self._write_buffer = None
+        """
+Reusable buffer coalescing small writes
+        """
+        self._write_buffer_length = 0
+        """
+Number of bytes pending in the write buffer
+        """
+        self._write_buffer_offset = 0
+        """
+File position the pending bytes of the write buffer are written at
+        """
+        self.write_buffer_size = write_buffer_size
+        """
+Size of the buffer coalescing smaller binary writes (0 to disable)
+        """
 
         if isinstance(default_chmod, int):
             self.chmod = default_chmod
-        else:
+        elif default_chmod is not None:
             default_chmod = int(default_chmod, 8)
             self.chmod = 0
 
@@ -220,9 +430,7 @@ umask to set before creating a new file
         """
 
         return (
-            True
-            if (self._handle is None or self._handle.tell() == self.file_size)
-            else False
+            True if (self._handle is None or self.tell() == self.file_size) else False
         )
 
     @property
@@ -261,6 +469,17 @@ umask to set before creating a new file
             log_handler if (isinstance(log_handler, ProxyTypes)) else proxy(log_handler)
         )
 
+    @property
+    def running_digest(self):
+        """
+        Returns the digest updated with data read or written sequentially.
+
+        :return: (object) hashlib compatible digest; None if not started
+        :since:  v1.1.0
+        """
+
+        return self._running_digest
+
     @property
     def size(self):
         """
@@ -272,6 +491,47 @@ umask to set before creating a new file
 
         return -1 if (self._handle is None) else self.file_size
 
+    def advise(self, advice, offset=0, length=0):
+        """
+        Announces an intention to access the file data in a specific pattern.
+
+        :param advice: Access pattern ("normal", "sequential", "random",
+                       "willneed", "dontneed" or "noreuse")
+        :param offset: Offset of the data the advice applies to
+        :param length: Length of the data the advice applies to (0 means until
+                       EOF)
+
+        :return: (bool) True on success; False if not supported
+        :since:  v1.1.0
+        """
+
+        if self._log_handler is not None:
+            self._log_handler.debug(
+                "ppt_file.File.advise({0}, {1:d}, {2:d})", advice, offset, length
+            )
+
+        if advice not in _FADVISE_NAMES:
+            raise ValueError("Advice given is invalid")
+
+        _return = False
+        advice_value = getattr(os, _FADVISE_NAMES[advice], None)
+
+        if (
+            self._handle is not None
+            and advice_value is not None
+            and hasattr(os, "posix_fadvise")
+        ):
+            try:
+                os.posix_fadvise(self._handle.fileno(), offset, length, advice_value)
+                _return = True
+            except OSError:
+                pass
+
+            if self.metrics is not None:
+                self.metrics.increment("syscalls")
+
+        return _return
+
     def close(self, delete_empty=False):
         """
         python.org: Flush and close this stream.
@@ -291,314 +551,2019 @@ umask to set before creating a new file
         _return = False
 
         if self._handle is not None:
+            self._drain_write_buffer()
+
+            if self._preallocated_visible and self.lock("w"):
+                self._handle.truncate(self.file_size)
+
             file_position = self.tell()
 
             if not self.readonly and delete_empty and file_position < 1:
                 self.read(1)
                 file_position = self.tell()
 
+            if self._lock_registry_key is not None:
+                # Data must be written before the registry releases the flock.
+                self._write_pending_data()
+
+                self.lock_registry.release(self._lock_registry_key, self)
+                self._lock_registry_key = None
+
             self._handle.close()
             _return = True
 
-            if self._handle_lock == "w" and _USE_FILE_LOCKING:
-                lock_path_name_os = path.normpath(
-                    "{0}.lock".format(self.file_path_name)
-                )
+            if self.metrics is not None:
+                self.metrics.increment("closes")
+                self.metrics.increment("syscalls")
 
-                if path.exists(lock_path_name_os):
-                    try:
-                        os.unlink(lock_path_name_os)
-                    except IOError:
-                        pass
+            if self._lock_file_lease is not None:
+                self._lock_file_lease.close()
+                self._lock_file_lease = None
 
             if not self.readonly and delete_empty and file_position < 1:
-                file_path_name_os = path.normpath(self.file_path_name)
-                _return = True
-
-                try:
-                    os.unlink(file_path_name_os)
-                except IOError:
-                    _return = False
+                _return = self._unlink()
 
+            self._dir_fd = None
             self._handle = None
+            self._handle_lock = "r"
 
             self.file_path_name = ""
             self.file_size = -1
+            self._preallocated_size = 0
+            self._preallocated_visible = False
             self.readonly = False
 
         return _return
 
-    def flush(self):
+    def _unlink(self):
         """
-        python.org: Flush the write buffers of the stream if applicable.
+        Deletes the file by path.
 
         :return: (bool) True on success
-        :since:  v1.0.0
+        :since:  v1.1.0
         """
 
-        _return = False
-
-        if self._handle is not None:
+        try:
+            os.unlink(path.normpath(self.file_path_name), dir_fd=self._dir_fd)
             _return = True
-
-            if not self.readonly:
-                self._handle.flush()
-                os.fsync(self._handle.fileno())
+        except OSError:
+            _return = False
 
         return _return
 
-    def lock(self, lock_mode):
+    def copy_to(self, other, offset=None, length=None, timeout=-1):
         """
-        Changes file locking if needed.
+        Copies data of this file to the current position of the other file
+        inside the kernel if supported. Data is written with "write()" of
+        targets not storing it as given.
 
-        :param lock_mode: The requested file locking mode ("r" or "w").
+        :param other: Target file instance
+        :param offset: Offset to copy from (defaults to the current position
+                       which is advanced by the data copied)
+        :param length: Number of bytes to copy (defaults to all data until EOF)
+        :param timeout: Timeout to use (defaults to construction time value)
 
-        :return: (bool) True on success
-        :since:  v1.0.0
+        :return: (int) Number of bytes copied
+        :since:  v1.1.0
         """
 
         if self._log_handler is not None:
-            self._log_handler.debug("ppt_file.File.lock({0})", lock_mode)
+            self._log_handler.debug("ppt_file.File.copy_to({0:d})", timeout)
 
-        _return = False
+        _return = 0
 
-        if self._handle is None:
-            if self._log_handler is not None:
-                self._log_handler.warning(
-                    "ppt_file.File.lock()- reporting: File handle invalid"
-                )
-        elif lock_mode == "w" and self.readonly:
-            if self._log_handler is not None:
-                self._log_handler.error(
-                    "ppt_file.File.lock()- reporting: File handle is in readonly mode"
-                )
-        elif lock_mode == self._handle_lock:
-            _return = True
-        else:
-            timeout_retries = self.timeout_retries
+        if (self._handle is not None and not self.binary) or (
+            other.handle is not None and not other.binary
+        ):
+            raise IOError("Failed to copy data of a text file handle")
 
-            while timeout_retries > 0:
-                if self._locking(lock_mode):
-                    self._handle_lock = "w" if (lock_mode == "w") else "r"
-                    _return = True
-                    timeout_retries = -1
+        if self.lock("r") and other.lock("w"):
+            self._drain_write_buffer()
+            other._drain_write_buffer()
 
-                    break
-                else:
-                    timeout_retries -= 1
-                    time.sleep(1)
+            source_offset = self._handle.tell() if (offset is None) else offset
 
-            if timeout_retries > -1 and self._log_handler is not None:
-                self._log_handler.error(
-                    "ppt_file.File.lock()- reporting: File lock change failed"
+            if length is None:
+                length = max(0, self.file_size - source_offset)
+
+            if not self.readonly:
+                self._handle.flush()
+
+            timeout_time = time.time()
+            timeout_time += self.timeout_retries if (timeout < 0) else timeout
+
+            if other._is_raw:
+                other._handle.flush()
+                target_offset = other._handle.tell()
+
+                _return = self._copy_to(
+                    other, source_offset, target_offset, length, timeout_time
+                )
+
+                other._handle.seek(target_offset + _return)
+
+                other._update_written_file_size(
+                    target_offset,
+                    _return,
+                    (length - _return if (time.time() >= timeout_time) else 0),
+                )
+            else:
+                _return = self._copy_by_writing(
+                    other, source_offset, length, timeout_time
                 )
 
+            if offset is None:
+                self._handle.seek(source_offset + _return)
+
+            if self.metrics is not None:
+                self.metrics.increment("bytes_read", _return)
+
         return _return
 
-    def _locking(self, lock_mode, file_path_name=""):
+    def _copy_to(self, other, source_offset, target_offset, length, timeout_time):
         """
-        Runs flock or an alternative locking mechanism.
+        Copies data with "os.copy_file_range()", "os.sendfile()" or a buffer
+        reused for positional reads and writes.
 
-        :param lock_mode: The requested file locking mode ("r" or "w").
-        :param file_path_name: Alternative path to the locking file (used for
-                              _USE_FILE_LOCKING)
+        :param other: Target file instance
+        :param source_offset: Offset to copy from
+        :param target_offset: Offset to copy to
+        :param length: Number of bytes to copy
+        :param timeout_time: Time after which copying is aborted
 
-        :return: (bool) True on success
-        :since:  v1.0.0
+        :return: (int) Number of bytes copied
+        :since:  v1.1.0
         """
 
-        # global: _USE_FILE_LOCKING
-        # pylint: disable=broad-except
+        _return = 0
 
-        _return = False
+        source_descriptor = self._handle.fileno()
+        target_descriptor = other._handle.fileno()
 
-        if len(file_path_name) < 1:
-            file_path_name = self.file_path_name
-        lock_path_name_os = path.normpath("{0}.lock".format(file_path_name))
+        copy_methods = [
+            method for method in ("copy_file_range", "sendfile") if hasattr(os, method)
+        ]
 
-        if len(file_path_name) > 0 and self._handle is not None:
-            if lock_mode == "w" and self.readonly:
-                _return = False
-            elif _USE_FILE_LOCKING:
-                is_locked = path.exists(lock_path_name_os)
+        buffer = None
 
-                if is_locked:
-                    is_locked = False
+        while _return < length and time.time() < timeout_time:
+            part_size = min(length - _return, _COPY_CHUNK_SIZE)
+            bytes_copied = None
 
-                    if time.time() - self.timeout_retries < path.getmtime(
-                        lock_path_name_os
-                    ):
-                        try:
-                            os.unlink(lock_path_name_os)
-                        except IOError:
-                            pass
+            while bytes_copied is None and len(copy_methods) > 0:
+                try:
+                    if copy_methods[0] == "copy_file_range":
+                        bytes_copied = os.copy_file_range(
+                            source_descriptor,
+                            target_descriptor,
+                            part_size,
+                            source_offset + _return,
+                            target_offset + _return,
+                        )
                     else:
-                        is_locked = True
+                        os.lseek(
+                            target_descriptor, target_offset + _return, os.SEEK_SET
+                        )
+
+                        bytes_copied = os.sendfile(
+                            target_descriptor,
+                            source_descriptor,
+                            source_offset + _return,
+                            part_size,
+                        )
+                except OSError as handled_exception:
+                    if handled_exception.errno not in _COPY_FALLBACK_ERRNOS:
+                        raise
+
+                    copy_methods.pop(0)
+
+            if bytes_copied is None:
+                if buffer is None:
+                    buffer = bytearray(min(length, _COPY_CHUNK_SIZE))
+
+                with memoryview(buffer) as view:
+                    bytes_copied = self._pread_into(
+                        source_descriptor,
+                        view[: min(part_size, len(buffer))],
+                        source_offset + _return,
+                    )
 
-                if lock_mode == "w":
-                    if is_locked and self._handle_lock == "w":
-                        _return = True
-                    elif not is_locked:
-                        try:
-                            open(lock_path_name_os, "w").close()
-                            _return = True
-                        except IOError:
-                            pass
-                elif is_locked and self._handle_lock == "w":
-                    try:
-                        os.unlink(lock_path_name_os)
-                        _return = True
-                    except IOError:
-                        pass
-                elif not is_locked:
-                    _return = True
-            else:
-                operation = fcntl.LOCK_EX if (lock_mode == "w") else fcntl.LOCK_SH
+                    bytes_written = 0
 
-                try:
-                    fcntl.flock(self._handle, operation)
-                    _return = True
-                except Exception:
-                    pass
+                    while bytes_written < bytes_copied:
+                        bytes_written += os.pwrite(
+                            target_descriptor,
+                            view[bytes_written:bytes_copied],
+                            target_offset + _return + bytes_written,
+                        )
 
-        return _return
+                if self.metrics is not None:
+                    self.metrics.increment("syscalls")
 
-    def open(self, file_path_name, readonly=False, file_mode="r+b"):
-        """
-        Opens a file session.
+            if self.metrics is not None:
+                self.metrics.increment("syscalls")
 
-        :param file_path_name: Path to the requested file
-        :param readonly: Open file in readonly mode
-        :param file_mode: File mode to use
+            if bytes_copied < 1:
+                break
 
-        :return: (bool) True on success
-        :since:  v1.0.0
+            _return += bytes_copied
+
+        return _return
+
+    def _copy_by_writing(self, other, source_offset, length, timeout_time):
         """
+        Copies data with positional reads and "write()" of the other file.
 
-        if self._log_handler is not None:
-            self._log_handler.debug(
-                "ppt_file.File.open({0}, {1})", file_path_name, file_mode
-            )
+        :param other: Target file instance
+        :param source_offset: Offset to copy from
+        :param length: Number of bytes to copy
+        :param timeout_time: Time after which copying is aborted
 
-        if self._handle is None:
-            exists = False
-            file_path_name_os = path.normpath(file_path_name)
-            _return = True
+        :return: (int) Number of bytes copied
+        :since:  v1.1.0
+        """
 
-            self.readonly = True if (readonly) else False
+        _return = 0
 
-            if path.exists(file_path_name_os):
-                exists = True
-            elif not self.readonly:
-                if self.umask is not None:
-                    os.umask(int(self.umask, 8))
-            else:
-                _return = False
+        source_descriptor = self._handle.fileno()
+        buffer = bytearray(min(length, _COPY_CHUNK_SIZE))
 
-            is_binary = True if ("b" in file_mode) else False
+        with memoryview(buffer) as view:
+            while _return < length and time.time() < timeout_time:
+                part_size = min(length - _return, len(buffer))
 
-            if _return:
-                try:
-                    self._handle = self._open(file_path_name, file_mode, is_binary)
-                except IOError:
-                    _return = False
-            elif self._log_handler is not None:
-                self._log_handler.warning(
-                    "ppt_file.File.open()- reporting: Failed opening {0} - file does not exist",
-                    file_path_name,
+                bytes_read = self._pread_into(
+                    source_descriptor, view[:part_size], source_offset + _return
                 )
 
-            if self._handle is None:
-                if not exists and not self.readonly:
-                    try:
-                        os.unlink(file_path_name_os)
-                    except IOError:
-                        pass
-            else:
-                self.binary = is_binary
+                if self.metrics is not None:
+                    self.metrics.increment("syscalls")
 
-                if self.chmod is not None and not exists:
-                    os.chmod(file_path_name_os, self.chmod)
-                self.file_path_name = file_path_name
+                if bytes_read < 1:
+                    break
 
-                if self.lock("r"):
-                    self.file_size = os.stat(file_path_name_os).st_size
-                else:
-                    _return = False
-                    self.close(not exists)
-                    self._handle = None
-        else:
-            _return = False
+                other.write(view[:bytes_read], max(0, timeout_time - time.time()))
+                _return += bytes_read
 
         return _return
 
-    def _open(self, file_path_name_os, file_mode, is_binary):
+    def digest(self, algorithm="sha256", offset=0, length=None):
         """
-        Opens a file handle and sets the encoding to UTF-8.
+        Hashes the file data in one locked pass reusing a single buffer. The
+        file position is not changed.
 
-        :param file_path_name_os: Path to the requested file
-        :param file_mode: File mode to use
-        :param is_binary: False if the file is an UTF-8 (or ASCII) encoded one
+        :param algorithm: "crc32" or an algorithm supported by "hashlib.new()"
+        :param offset: Offset to start hashing at
+        :param length: Number of bytes to hash (defaults to all data until EOF)
 
-        :return: (object) File
-        :since:  v1.0.0
+        :return: (str) Hexadecimal digest; None on error
+        :since:  v1.1.0
         """
 
+        if self._log_handler is not None:
+            self._log_handler.debug("ppt_file.File.digest({0})", algorithm)
+
         _return = None
 
-        if not is_binary:
-            try:
-                _return = open(file_path_name_os, file_mode, encoding="utf-8")
-            except TypeError:
-                pass
+        if self._handle_lock == "w" or self.lock("r"):
+            if not self.readonly:
+                self._drain_write_buffer()
+                self._handle.flush()
 
-        if _return is None:
-            _return = open(file_path_name_os, file_mode)
+            if length is None:
+                length = max(0, self.file_size - offset)
 
-        return _return
+            digest = _new_digest(algorithm)
+            file_descriptor = self._handle.fileno()
+            buffer = bytearray(min(length, _COPY_CHUNK_SIZE))
+            bytes_hashed = 0
 
-    def read(self, n=0, timeout=-1):
-        """
-        python.org: Read up to n bytes from the object and return them.
+            with memoryview(buffer) as view:
+                while bytes_hashed < length:
+                    part_size = min(len(buffer), length - bytes_hashed)
 
-        :param n: How many bytes to read from the current position (0 means until
-                  EOF)
-        :param timeout: Timeout to use (defaults to construction time value)
+                    bytes_read = self._pread_into(
+                        file_descriptor, view[:part_size], offset + bytes_hashed
+                    )
 
-        :return: (bytes) Data; None if EOF
-        :since:  v1.0.0
-        """
+                    if self.metrics is not None:
+                        self.metrics.increment("syscalls")
 
-        if self._log_handler is not None:
-            self._log_handler.debug("ppt_file.File.read({0:d}, {1:d})", n, timeout)
+                    if bytes_read < 1:
+                        break
 
-        _return = None
+                    digest.update(view[:bytes_read])
+                    bytes_hashed += bytes_read
 
-        if self.lock("r"):
-            bytes_unread = n
-            _return = bytes() if (self.binary) else ""
-            timeout_time = None if (timeout < 0) else (time.time() + timeout)
+            if self.metrics is not None:
+                self.metrics.increment("bytes_read", bytes_hashed)
 
-            while (
-                (bytes_unread > 0 or n == 0)
-                and not self.is_eof
-                and (timeout_time is None or time.time() < timeout_time)
-            ):
-                part_size = 16384 if (bytes_unread > 16384 or n == 0) else bytes_unread
-                _return += self._handle.read(part_size)
+            _return = digest.hexdigest()
 
-                if n > 0:
-                    bytes_unread -= part_size
+        return _return
 
-            if (
-                bytes_unread > 0 or (n == 0 and self.is_eof)
-            ) and self._log_handler is not None:
+    def flush(self):
+        """
+        python.org: Flush the write buffers of the stream if applicable.
+
+        :return: (bool) True on success
+        :since:  v1.0.0
+        """
+
+        _return = False
+
+        if self._handle is not None:
+            _return = True
+
+            if not self.readonly:
+                self._drain_write_buffer()
+                self._handle.flush()
+                self._sync()
+
+        return _return
+
+    def follow(self, lines=False, timeout=-1, wait_strategy=None):
+        """
+        Returns a generator yielding data appended by other processes from the
+        current position. The size is refreshed with "os.fstat()" and the
+        generator waits with increasing delays while no data is appended. A
+        truncated file is followed from its start again and a rotated file is
+        reopened by path once the old one has been read completely.
+
+        :param lines: True to yield complete lines only
+        :param timeout: Seconds without new data after which following stops
+                        (negative values to follow forever)
+        :param wait_strategy: LockWaitStrategy instance providing the delays
+                              while waiting for new data
+
+        :return: (object) Generator of data or lines
+        :since:  v1.1.0
+        """
+
+        if self._log_handler is not None:
+            self._log_handler.debug("ppt_file.File.follow({0:d})", timeout)
+
+        if wait_strategy is None:
+            wait_strategy = LockWaitStrategy(initial_delay=0.01, max_delay=1.0)
+
+        delays = None
+        line_ending = b"\n" if (self.binary) else "\n"
+        partial_line = b"" if (self.binary) else ""
+
+        while self._handle is not None:
+            if self.refresh_size() < self.tell():
+                if self._log_handler is not None:
+                    self._log_handler.info(
+                        "ppt_file.File.follow()- reporting: File truncated"
+                    )
+
+                self.seek(0)
+                partial_line = partial_line[:0]
+
+            data = (
+                self.read(_COPY_CHUNK_SIZE) if (self.tell() < self.file_size) else None
+            )
+
+            if data:
+                delays = None
+
+                if not lines:
+                    yield data
+                else:
+                    data = partial_line + data
+                    line_end = data.rfind(line_ending) + 1
+                    partial_line = data[line_end:]
+
+                    for line in data[:line_end].splitlines(True):
+                        yield line
+            elif self._is_rotated():
+                if self._log_handler is not None:
+                    self._log_handler.info(
+                        "ppt_file.File.follow()- reporting: File rotated"
+                    )
+
+                if len(partial_line) > 0:
+                    yield partial_line
+                    partial_line = partial_line[:0]
+
+                dir_fd = self._dir_fd
+                file_path_name = self.file_path_name
+                readonly = self.readonly
+                file_mode = self._handle.mode
+
+                self.close()
+
+                if not self.open(file_path_name, readonly, file_mode, dir_fd):
+                    break
+            else:
+                if delays is None:
+                    delays = wait_strategy.iter_delays(
+                        wait_strategy.get_deadline(timeout)
+                    )
+
+                delay = next(delays, None)
+
+                if delay is None:
+                    break
+
+                time.sleep(delay)
+
+        if len(partial_line) > 0:
+            yield partial_line
+
+    def _is_rotated(self):
+        """
+        Returns true if the path of the file refers to another file than the
+        one opened.
+
+        :return: (bool) True if rotated
+        :since:  v1.1.0
+        """
+
+        try:
+            path_stat = os.stat(path.normpath(self.file_path_name), dir_fd=self._dir_fd)
+
+            file_stat = os.fstat(self._handle.fileno())
+
+            _return = (path_stat.st_dev, path_stat.st_ino) != (
+                file_stat.st_dev,
+                file_stat.st_ino,
+            )
+        except OSError:
+            # The new file has not been created yet
+            _return = False
+
+        if self.metrics is not None:
+            self.metrics.increment("syscalls", 2)
+
+        return _return
+
+    def _sync(self):
+        """
+        Syncs the file handle based on the durability policy.
+
+        :since: v1.1.0
+        """
+
+        durability = (
+            File.default_durability if (self.durability is None) else self.durability
+        )
+
+        if self.metrics is not None and durability != "none":
+            started = time.perf_counter()
+
+        if durability == "fsync":
+            os.fsync(self._handle.fileno())
+        elif durability == "fdatasync":
+            if hasattr(os, "fdatasync"):
+                os.fdatasync(self._handle.fileno())
+            else:
+                os.fsync(self._handle.fileno())
+        elif durability == "group_commit":
+            GroupCommitSyncer.get_instance().sync(self._handle.fileno())
+        elif durability != "none":
+            raise ValueError("Durability policy given is invalid")
+
+        if self.metrics is not None and durability != "none":
+            self.metrics.observe("fsync_seconds", time.perf_counter() - started)
+            self.metrics.increment("fsyncs")
+            self.metrics.increment("syscalls")
+
+    def start_digest(self, algorithm="sha256"):
+        """
+        Starts a digest updated with all data read or written sequentially by
+        "read()", "readinto()", "iter_chunks()", "iter_lines()", "write()" and
+        "writev()". Text data is hashed UTF-8 encoded.
+
+        :param algorithm: "crc32" or an algorithm supported by "hashlib.new()"
+
+        :return: (object) hashlib compatible digest
+        :since:  v1.1.0
+        """
+
+        self._running_digest = _new_digest(algorithm)
+        return self._running_digest
+
+    def stop_digest(self):
+        """
+        Stops updating the running digest.
+
+        :return: (object) hashlib compatible digest; None if not started
+        :since:  v1.1.0
+        """
+
+        _return = self._running_digest
+        self._running_digest = None
+
+        return _return
+
+    def _update_running_digest(self, data):
+        """
+        Updates the running digest with the given data.
+
+        :param data: Data read or written
+
+        :since: v1.1.0
+        """
+
+        self._running_digest.update(
+            data.encode("utf-8") if (isinstance(data, str)) else data
+        )
+
+    def iter_chunks(self, size=_IO_CHUNK_SIZE, timeout=-1):
+        """
+        Returns a generator reading the file from the current position until EOF
+        in chunks of the given size. The shared lock is taken once.
+
+        :param size: Chunk size in bytes (or characters for text files)
+        :param timeout: Timeout to use (defaults to construction time value)
+
+        :return: (object) Generator of data chunks
+        :since:  v1.1.0
+        """
+
+        if self._log_handler is not None:
+            self._log_handler.debug(
+                "ppt_file.File.iter_chunks({0:d}, {1:d})", size, timeout
+            )
+
+        if self.lock("r"):
+            self._drain_write_buffer()
+            timeout_time = None if (timeout < 0) else (time.time() + timeout)
+
+            while not self.is_eof:
+                if timeout_time is not None and time.time() >= timeout_time:
+                    self._log_timeout_before_eof()
+                    break
+
+                if self.binary:
+                    part_size = self._get_read_size(size)
+                    if part_size < 1:
+                        break
+                else:
+                    part_size = size
+
+                chunk = self._handle.read(part_size)
+
+                if self.metrics is not None:
+                    self.metrics.increment("bytes_read", len(chunk))
+                    self.metrics.increment("syscalls")
+
+                if len(chunk) < 1:
+                    break
+
+                if self._running_digest is not None:
+                    self._update_running_digest(chunk)
+
+                yield chunk
+
+    def iter_lines(self, timeout=-1):
+        """
+        Returns a generator reading the file line by line from the current
+        position until EOF. The shared lock is taken once.
+
+        :param timeout: Timeout to use (defaults to construction time value)
+
+        :return: (object) Generator of lines including line endings
+        :since:  v1.1.0
+        """
+
+        if self._log_handler is not None:
+            self._log_handler.debug("ppt_file.File.iter_lines({0:d})", timeout)
+
+        if self.lock("r"):
+            self._drain_write_buffer()
+            timeout_time = None if (timeout < 0) else (time.time() + timeout)
+
+            # EOF is detected by an empty read as "tell()" of text handles is
+            # expensive.
+            while self._handle is not None:
+                if timeout_time is not None and time.time() >= timeout_time:
+                    self._log_timeout_before_eof()
+                    break
+
+                if self.binary:
+                    part_size = self._get_read_size(0)
+                    if part_size < 1:
+                        break
+
+                    line = self._handle.readline(part_size)
+                else:
+                    line = self._handle.readline()
+
+                if self.metrics is not None:
+                    self.metrics.increment("bytes_read", len(line))
+                    self.metrics.increment("syscalls")
+
+                if len(line) < 1:
+                    break
+
+                if self._running_digest is not None:
+                    self._update_running_digest(line)
+
+                yield line
+
+    def lock(self, lock_mode, timeout=None):
+        """
+        Changes file locking if needed.
+
+        :param lock_mode: The requested file locking mode ("r" or "w").
+        :param timeout: Timeout in seconds (defaults to the lock wait strategy
+                        or construction time value)
+
+        :return: (bool) True on success
+        :since:  v1.0.0
+        """
+
+        if self._log_handler is not None:
+            self._log_handler.debug("ppt_file.File.lock({0})", lock_mode)
+
+        _return = False
+
+        if self._handle is None:
+            if self._log_handler is not None:
+                self._log_handler.warning(
+                    "ppt_file.File.lock()- reporting: File handle invalid"
+                )
+        elif lock_mode == "w" and self.readonly:
+            if self._log_handler is not None:
+                self._log_handler.error(
+                    "ppt_file.File.lock()- reporting: File handle is in readonly mode"
+                )
+        elif lock_mode == self._handle_lock:
+            _return = True
+        else:
+            _return = self._change_lock(lock_mode, timeout)
+
+            if not _return and self._log_handler is not None:
+                self._log_handler.error(
+                    "ppt_file.File.lock()- reporting: File lock change failed"
+                )
+
+        return _return
+
+    def _change_lock(self, lock_mode, timeout):
+        """
+        Acquires or converts the file lock.
+
+        :param lock_mode: The requested file locking mode ("r" or "w").
+        :param timeout: Timeout in seconds (defaults to the lock wait strategy
+                        or construction time value)
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        # global: _USE_FILE_LOCKING
+
+        if timeout is None:
+            timeout = self.lock_wait_strategy.timeout
+        if timeout is None:
+            timeout = self.timeout_retries
+
+        if lock_mode != "w":
+            self._write_pending_data()
+
+        if self._lock_registry_key is not None:
+            _return = self.lock_registry.acquire(
+                self._lock_registry_key,
+                self,
+                self._handle.fileno(),
+                lock_mode,
+                timeout,
+                self.lock_wait_strategy,
+            )
+        else:
+            attempt = partial(self._locking, lock_mode)
+
+            if _USE_FILE_LOCKING:
+                blocking_attempt = None
+                sleep = self._get_lock_file_lease().wait
+            else:
+                blocking_attempt = partial(self._locking_blocking, lock_mode)
+                sleep = None
+
+            if self.metrics is None:
+                _return = self.lock_wait_strategy.wait(
+                    attempt, timeout, blocking_attempt, sleep
+                )
+            else:
+                _return = self._lock_measured(attempt, timeout, blocking_attempt, sleep)
+
+        if _return:
+            self._handle_lock = "w" if (lock_mode == "w") else "r"
+
+        return _return
+
+    def lock_shared(self, timeout=None):
+        """
+        Acquires a shared lock. Other than "lock('r')" it is acquired even if
+        no exclusive lock has been held before.
+
+        :param timeout: Timeout in seconds (defaults to the lock wait strategy
+                        or construction time value)
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        if self._log_handler is not None:
+            self._log_handler.debug("ppt_file.File.lock_shared()")
+
+        _return = False
+
+        if self._handle is None:
+            if self._log_handler is not None:
+                self._log_handler.warning(
+                    "ppt_file.File.lock_shared()- reporting: File handle invalid"
+                )
+        else:
+            _return = self._change_lock("r", timeout)
+
+            if not _return and self._log_handler is not None:
                 self._log_handler.error(
-                    "ppt_file.File.read()- reporting: Timeout occured before EOF"
+                    "ppt_file.File.lock_shared()- reporting: File lock change failed"
                 )
 
         return _return
 
+    def _lock_measured(self, attempt, timeout, blocking_attempt, sleep=None):
+        """
+        Waits for a lock change with the lock wait strategy and records lock
+        waits, retries and timeouts.
+
+        :param attempt: Callable returning true if the lock has been acquired
+        :param timeout: Timeout in seconds (negative values to wait forever)
+        :param blocking_attempt: Callable waiting for the lock in a blocking call
+        :param sleep: Callable used to wait between retries
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        attempts = [0]
+
+        def _counted_attempt():
+            attempts[0] += 1
+            return attempt()
+
+        started = time.perf_counter()
+
+        _return = self.lock_wait_strategy.wait(
+            _counted_attempt, timeout, blocking_attempt, sleep
+        )
+
+        self.metrics.observe("lock_wait_seconds", time.perf_counter() - started)
+        self.metrics.increment("lock_waits")
+        self.metrics.increment("syscalls", max(1, attempts[0]))
+
+        if attempts[0] > 1:
+            self.metrics.increment("lock_retries", attempts[0] - 1)
+
+        if not _return:
+            self.metrics.increment("lock_timeouts")
+
+        return _return
+
+    def _locking(self, lock_mode, file_path_name=""):
+        """
+        Runs flock or an alternative locking mechanism.
+
+        :param lock_mode: The requested file locking mode ("r" or "w").
+        :param file_path_name: Alternative path to the locking file (used for
+                              _USE_FILE_LOCKING)
+
+        :return: (bool) True on success
+        :since:  v1.0.0
+        """
+
+        # global: _USE_FILE_LOCKING
+        # pylint: disable=broad-except
+
+        _return = False
+
+        if len(file_path_name) < 1:
+            file_path_name = self.file_path_name
+
+        if len(file_path_name) > 0 and self._handle is not None:
+            if lock_mode == "w" and self.readonly:
+                _return = False
+            elif _USE_FILE_LOCKING:
+                lock_file_lease = self._get_lock_file_lease(file_path_name)
+
+                if lock_mode == "w":
+                    _return = lock_file_lease.acquire()
+                elif lock_file_lease.is_held:
+                    lock_file_lease.release()
+                    _return = True
+                else:
+                    _return = not lock_file_lease.is_locked()
+            else:
+                operation = fcntl.LOCK_EX if (lock_mode == "w") else fcntl.LOCK_SH
+
+                try:
+                    fcntl.flock(self._handle, operation | fcntl.LOCK_NB)
+                    _return = True
+                except Exception:
+                    pass
+
+        return _return
+
+    def _get_lock_file_lease(self, file_path_name=""):
+        """
+        Returns the lock file lease used if "fcntl" is not available.
+
+        :param file_path_name: Alternative path to the locking file
+
+        :return: (object) LockFileLease instance
+        :since:  v1.1.0
+        """
+
+        if len(file_path_name) < 1:
+            file_path_name = self.file_path_name
+
+        lock_path_name_os = path.normpath("{0}.lock".format(file_path_name))
+
+        if (
+            self._lock_file_lease is None
+            or self._lock_file_lease.lock_path_name != lock_path_name_os
+        ):
+            if self._lock_file_lease is not None:
+                self._lock_file_lease.close()
+
+            self._lock_file_lease = LockFileLease(lock_path_name_os)
+
+        return self._lock_file_lease
+
+    def _locking_blocking(self, lock_mode, timeout):
+        """
+        Waits in a blocking flock call until the lock is acquired. Bounded waits
+        are not supported.
+
+        :param lock_mode: The requested file locking mode ("r" or "w").
+        :param timeout: Timeout in seconds; None to wait forever
+
+        :return: (bool) True on success; None if waiting is not supported
+        :since:  v1.1.0
+        """
+
+        if lock_mode == "w" and self.readonly:
+            _return = False
+        elif timeout is not None and timeout <= 0:
+            _return = self._locking(lock_mode)
+        else:
+            operation = fcntl.LOCK_EX if (lock_mode == "w") else fcntl.LOCK_SH
+            _return = _call_blocking(
+                partial(fcntl.flock, self._handle, operation), timeout
+            )
+
+        return _return
+
+    def lock_range(self, offset, length, lock_mode, timeout=None):
+        """
+        Locks the given byte range with a POSIX record lock.
+
+        :param offset: Offset of the byte range
+        :param length: Length of the byte range (0 means until EOF and beyond)
+        :param lock_mode: The requested locking mode ("r", "w" or "u" to unlock)
+        :param timeout: Timeout in seconds (defaults to the lock wait strategy
+                        or construction time value)
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        if self._log_handler is not None:
+            self._log_handler.debug(
+                "ppt_file.File.lock_range({0:d}, {1:d}, {2})", offset, length, lock_mode
+            )
+
+        _return = False
+
+        if self._handle is None:
+            if self._log_handler is not None:
+                self._log_handler.warning(
+                    "ppt_file.File.lock_range()- reporting: File handle invalid"
+                )
+        elif _USE_FILE_LOCKING:
+            if self._log_handler is not None:
+                self._log_handler.error(
+                    "ppt_file.File.lock_range()- reporting: Byte-range locks are not supported"
+                )
+        elif lock_mode == "w" and self.readonly:
+            if self._log_handler is not None:
+                self._log_handler.error(
+                    "ppt_file.File.lock_range()- reporting: File handle is in readonly mode"
+                )
+        elif lock_mode == "u":
+            _return = self._locking_range(lock_mode, offset, length)
+        else:
+            if timeout is None:
+                timeout = self.lock_wait_strategy.timeout
+            if timeout is None:
+                timeout = self.timeout_retries
+
+            _return = self.lock_wait_strategy.wait(
+                partial(self._locking_range, lock_mode, offset, length),
+                timeout,
+                partial(self._locking_range_blocking, lock_mode, offset, length),
+            )
+
+            if not _return and self._log_handler is not None:
+                self._log_handler.error(
+                    "ppt_file.File.lock_range()- reporting: Byte-range lock failed"
+                )
+
+        return _return
+
+    def unlock(self):
+        """
+        Releases the file lock held.
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        # global: _USE_FILE_LOCKING
+
+        if self._log_handler is not None:
+            self._log_handler.debug("ppt_file.File.unlock()")
+
+        _return = False
+
+        if self._handle is None:
+            if self._log_handler is not None:
+                self._log_handler.warning(
+                    "ppt_file.File.unlock()- reporting: File handle invalid"
+                )
+        else:
+            self._write_pending_data()
+
+            if self._lock_registry_key is not None:
+                self.lock_registry.release(self._lock_registry_key, self)
+            elif _USE_FILE_LOCKING:
+                if self._lock_file_lease is not None:
+                    self._lock_file_lease.release()
+            else:
+                fcntl.flock(self._handle, fcntl.LOCK_UN)
+
+            self._handle_lock = "r"
+            _return = True
+
+        return _return
+
+    def unlock_range(self, offset, length):
+        """
+        Unlocks the given byte range.
+
+        :param offset: Offset of the byte range
+        :param length: Length of the byte range (0 means until EOF and beyond)
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        return self.lock_range(offset, length, "u")
+
+    @contextmanager
+    def locked_range(self, offset, length, lock_mode, timeout=None):
+        """
+        Returns a context manager holding a lock of the given byte range.
+
+        :param offset: Offset of the byte range
+        :param length: Length of the byte range (0 means until EOF and beyond)
+        :param lock_mode: The requested locking mode ("r" or "w")
+        :param timeout: Timeout in seconds (defaults to the lock wait strategy
+                        or construction time value)
+
+        :return: (object) Context manager
+        :since:  v1.1.0
+        """
+
+        if not self.lock_range(offset, length, lock_mode, timeout):
+            raise IOError("Failed to lock the byte range requested")
+
+        try:
+            yield self
+        finally:
+            self.unlock_range(offset, length)
+
+    def _locking_range(self, lock_mode, offset, length, blocking=False):
+        """
+        Runs fcntl to set an open file description or POSIX record lock.
+
+        :param lock_mode: The requested locking mode ("r", "w" or "u" to unlock)
+        :param offset: Offset of the byte range
+        :param length: Length of the byte range (0 means until EOF and beyond)
+        :param blocking: True to wait until the lock is acquired
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        # pylint: disable=broad-except
+
+        _return = False
+
+        try:
+            if _USE_OFD_LOCKING:
+                if lock_mode == "w":
+                    lock_type = fcntl.F_WRLCK
+                elif lock_mode == "r":
+                    lock_type = fcntl.F_RDLCK
+                else:
+                    lock_type = fcntl.F_UNLCK
+
+                fcntl.fcntl(
+                    self._handle.fileno(),
+                    (fcntl.F_OFD_SETLKW if (blocking) else fcntl.F_OFD_SETLK),
+                    struct.pack("hhqqi", lock_type, os.SEEK_SET, offset, length, 0),
+                )
+            else:
+                if lock_mode == "w":
+                    operation = fcntl.LOCK_EX
+                elif lock_mode == "r":
+                    operation = fcntl.LOCK_SH
+                else:
+                    operation = fcntl.LOCK_UN
+
+                if not blocking:
+                    operation |= fcntl.LOCK_NB
+
+                fcntl.lockf(self._handle, operation, length, offset, os.SEEK_SET)
+
+            _return = True
+        except Exception:
+            pass
+
+        return _return
+
+    def _locking_range_blocking(self, lock_mode, offset, length, timeout):
+        """
+        Waits in a blocking fcntl call until the byte-range lock is acquired.
+        Bounded waits are not supported.
+
+        :param lock_mode: The requested locking mode ("r" or "w")
+        :param offset: Offset of the byte range
+        :param length: Length of the byte range (0 means until EOF and beyond)
+        :param timeout: Timeout in seconds; None to wait forever
+
+        :return: (bool) True on success; None if waiting is not supported
+        :since:  v1.1.0
+        """
+
+        if timeout is not None and timeout <= 0:
+            _return = self._locking_range(lock_mode, offset, length)
+        else:
+            _return = _call_blocking(
+                partial(self._locking_range, lock_mode, offset, length, True), timeout
+            )
+
+        return _return
+
+    def open(self, file_path_name, readonly=False, file_mode="r+b", dir_fd=None):
+        """
+        Opens a file session.
+
+        :param file_path_name: Path to the requested file
+        :param readonly: Open file in readonly mode
+        :param file_mode: File mode to use
+        :param dir_fd: Directory descriptor relative paths are resolved against
+
+        :return: (bool) True on success
+        :since:  v1.0.0
+        """
+
+        if self._log_handler is not None:
+            self._log_handler.debug(
+                "ppt_file.File.open({0}, {1})", file_path_name, file_mode
+            )
+
+        if self._handle is None:
+            file_path_name_os = path.normpath(file_path_name)
+            _return = False
+
+            self.readonly = True if (readonly) else False
+            is_binary = True if ("b" in file_mode) else False
+
+            try:
+                file_descriptor, is_created = self._open_descriptor(
+                    file_path_name_os, file_mode, is_binary, dir_fd
+                )
+
+                _return = True
+            except FileNotFoundError:
+                if self._log_handler is not None:
+                    self._log_handler.warning(
+                        "ppt_file.File.open()- reporting: Failed opening {0} - file does not exist",
+                        file_path_name,
+                    )
+            except IOError:
+                pass
+
+            if _return:
+                try:
+                    self._handle = self._open(file_descriptor, file_mode, is_binary)
+                    self._dir_fd = dir_fd
+                except (IOError, ValueError):
+                    os.close(file_descriptor)
+                    _return = False
+
+                    if is_created:
+                        try:
+                            os.unlink(file_path_name_os, dir_fd=dir_fd)
+                        except OSError:
+                            pass
+
+            if self._handle is not None:
+                self.binary = is_binary
+                self.file_path_name = file_path_name
+
+                file_stat = os.fstat(file_descriptor)
+
+                if self.lock_registry is not None and not _USE_FILE_LOCKING:
+                    self._lock_registry_key = (file_stat.st_dev, file_stat.st_ino)
+
+                if self.metrics is not None:
+                    self.metrics.increment("opens")
+                    self.metrics.increment("syscalls")
+
+                if self.lock("r"):
+                    self.file_size = file_stat.st_size
+                else:
+                    _return = False
+                    self.close(is_created)
+                    self._handle = None
+        else:
+            _return = False
+
+        return _return
+
+    def _open_descriptor(self, file_path_name_os, file_mode, is_binary, dir_fd):
+        """
+        Opens a file descriptor for the given file mode. New files are created
+        exclusively and get their permissions set on the descriptor.
+
+        :param file_path_name_os: Path to the requested file
+        :param file_mode: File mode to use
+        :param is_binary: False if the file is an UTF-8 (or ASCII) encoded one
+        :param dir_fd: Directory descriptor relative paths are resolved against
+
+        :return: (tuple) File descriptor and true if the file has been created
+        :since:  v1.1.0
+        """
+
+        flags = getattr(os, "O_CLOEXEC", 0)
+
+        if "+" in file_mode:
+            flags |= os.O_RDWR
+        elif "r" in file_mode:
+            flags |= os.O_RDONLY
+        else:
+            flags |= os.O_WRONLY
+
+        if "w" in file_mode:
+            flags |= os.O_TRUNC
+        elif "a" in file_mode:
+            flags |= os.O_APPEND
+
+        if is_binary:
+            flags |= getattr(os, "O_BINARY", 0)
+
+        is_creatable = not self.readonly and "r" not in file_mode
+        is_created = False
+
+        while True:
+            if is_creatable:
+                try:
+                    file_descriptor = os.open(
+                        file_path_name_os,
+                        flags | os.O_CREAT | os.O_EXCL,
+                        0o666,
+                        dir_fd=dir_fd,
+                    )
+
+                    is_created = True
+                    break
+                except FileExistsError:
+                    if "x" in file_mode:
+                        raise
+
+            try:
+                file_descriptor = os.open(file_path_name_os, flags, dir_fd=dir_fd)
+                break
+            except FileNotFoundError:
+                # The file has been deleted after the exclusive creation failed
+                if not is_creatable:
+                    raise
+
+        if self.metrics is not None:
+            self.metrics.increment("syscalls")
+
+        if is_created:
+            file_mode_bits = self._get_new_file_mode_bits()
+
+            if file_mode_bits is not None:
+                try:
+                    if hasattr(os, "fchmod"):
+                        os.fchmod(file_descriptor, file_mode_bits)
+                    else:
+                        os.chmod(file_path_name_os, file_mode_bits, dir_fd=dir_fd)
+                except OSError:
+                    os.close(file_descriptor)
+                    raise
+
+                if self.metrics is not None:
+                    self.metrics.increment("syscalls")
+
+        return (file_descriptor, is_created)
+
+    def _get_new_file_mode_bits(self):
+        """
+        Returns the permissions of new files based on the chmod and umask
+        values given at construction time.
+
+        :return: (int) Permission bits; None to keep the ones created with the
+                 process umask
+        :since:  v1.1.0
+        """
+
+        _return = self.chmod
+
+        if _return is None and self.umask is not None:
+            umask = self.umask if (isinstance(self.umask, int)) else int(self.umask, 8)
+            _return = 0o666 & ~umask
+
+        return _return
+
+    def _open(self, file_descriptor, file_mode, is_binary):
+        """
+        Opens a file handle for the given file descriptor and sets the encoding
+        to UTF-8.
+
+        :param file_descriptor: File descriptor opened
+        :param file_mode: File mode to use
+        :param is_binary: False if the file is an UTF-8 (or ASCII) encoded one
+
+        :return: (object) File
+        :since:  v1.0.0
+        """
+
+        # The descriptor has already been created or truncated.
+        file_mode = file_mode.replace("x", "w")
+
+        if is_binary:
+            _return = os.fdopen(file_descriptor, file_mode)
+        else:
+            _return = os.fdopen(file_descriptor, file_mode, encoding="utf-8")
+
+        return _return
+
+    def parallel_map(
+        self, func, chunk_size=67108864, workers=None, align="\n", ordered=True
+    ):
+        """
+        Splits the file into byte ranges aligned to the given delimiter and
+        returns a generator of the results of calling func with the data of
+        each range in a worker process. Each worker reopens the file read-only
+        and reads its range under a shared byte-range lock.
+
+        :param func: Picklable callable receiving the bytes of a range
+        :param chunk_size: Approximate size of each range in bytes
+        :param workers: Number of worker processes (defaults to the CPU count)
+        :param align: Delimiter ranges end after (None or empty for fixed
+                      sized ranges)
+        :param ordered: True to return results in file order; False to return
+                        them as they complete
+
+        :return: (object) Generator of results
+        :since:  v1.1.0
+        """
+
+        if self._log_handler is not None:
+            self._log_handler.debug("ppt_file.File.parallel_map({0:d})", chunk_size)
+
+        if chunk_size < 1:
+            raise ValueError("Chunk size given is invalid")
+
+        if self._dir_fd is not None:
+            raise IOError("Worker processes require a file opened by path")
+
+        if not self.lock("r"):
+            raise IOError("Failed to lock the file for reading")
+
+        if isinstance(align, str):
+            align = align.encode("utf-8")
+
+        ranges = self._get_parallel_ranges(chunk_size, align)
+        file_path_name = path.abspath(self.file_path_name)
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending_limit = 2 * workers
+            pending = deque()
+            range_iterator = iter(ranges)
+
+            while True:
+                for offset, length in range_iterator:
+                    pending.append(
+                        executor.submit(
+                            _parallel_map_worker,
+                            file_path_name,
+                            self.timeout_retries,
+                            func,
+                            offset,
+                            length,
+                        )
+                    )
+
+                    if len(pending) >= pending_limit:
+                        break
+
+                if len(pending) < 1:
+                    break
+
+                if ordered:
+                    yield pending.popleft().result()
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                    for future in done:
+                        pending.remove(future)
+                        yield future.result()
+
+    def _get_parallel_ranges(self, chunk_size, align):
+        """
+        Returns byte ranges of the given size ending after the next delimiter.
+
+        :param chunk_size: Approximate size of each range in bytes
+        :param align: Delimiter ranges end after
+
+        :return: (list) List of offset and length tuples
+        :since:  v1.1.0
+        """
+
+        _return = []
+
+        if not self.readonly:
+            self._drain_write_buffer()
+            self._handle.flush()
+
+        file_descriptor = self._handle.fileno()
+        file_size = self.file_size
+        offset = 0
+
+        while offset < file_size:
+            end = min(offset + chunk_size, file_size)
+
+            if align and end < file_size:
+                search_offset = end - len(align)
+                end = file_size
+
+                while search_offset < file_size:
+                    data = os.pread(
+                        file_descriptor,
+                        _IO_CHUNK_SIZE + len(align),
+                        search_offset,
+                    )
+
+                    if len(data) < 1:
+                        break
+
+                    position = data.find(align)
+
+                    if position > -1:
+                        end = min(search_offset + position + len(align), file_size)
+                        break
+
+                    search_offset += _IO_CHUNK_SIZE
+
+            _return.append((offset, end - offset))
+            offset = end
+
+        return _return
+
+    def preallocate(self, size):
+        """
+        Allocates space for the file up to the given size without changing the
+        logical file size. If the file system only supports
+        "os.posix_fallocate()" the size visible to other processes grows until
+        the file is closed.
+
+        :param size: Size in bytes to allocate space for
+
+        :return: (bool) True on success; False if not supported
+        :since:  v1.1.0
+        """
+
+        if self._log_handler is not None:
+            self._log_handler.debug("ppt_file.File.preallocate({0:d})", size)
+
+        _return = False
+
+        if self.lock("w"):
+            self._drain_write_buffer()
+
+            _return = (
+                True
+                if (size <= max(self.file_size, self._preallocated_size))
+                else self._preallocate(size)
+            )
+
+        return _return
+
+    def _preallocate(self, size, keep_size=False):
+        """
+        Allocates space from the end of the allocated space up to the given
+        size.
+
+        :param size: Size in bytes to allocate space for
+        :param keep_size: True to fail instead of growing the visible file size
+                          with "os.posix_fallocate()"
+
+        :return: (bool) True on success; False if not supported
+        :since:  v1.1.0
+        """
+
+        offset = max(self.file_size, self._preallocated_size)
+        _return = self._fallocate(_FALLOC_FL_KEEP_SIZE, offset, size - offset)
+
+        if not _return and not keep_size and hasattr(os, "posix_fallocate"):
+            self._handle.flush()
+
+            try:
+                os.posix_fallocate(self._handle.fileno(), offset, size - offset)
+
+                _return = True
+                self._preallocated_visible = True
+            except OSError as handled_exception:
+                if handled_exception.errno not in _FALLOCATE_UNSUPPORTED_ERRNOS:
+                    raise
+
+            if self.metrics is not None:
+                self.metrics.increment("syscalls")
+
+        if _return:
+            self._preallocated_size = size
+
+        return _return
+
+    def _grow_preallocation(self, size):
+        """
+        Grows the space allocated in steps if the given size exceeds it.
+        Growing is disabled if preallocation without changing the visible file
+        size is not supported as readers would see the zero padding as data.
+
+        :param size: Size in bytes the file will be extended to
+
+        :since: v1.1.0
+        """
+
+        if size > max(self.file_size, self._preallocated_size):
+            step = self.preallocation_step
+
+            if not self._preallocate(((size // step) + 1) * step, True):
+                self.preallocation_step = 0
+
+                if self._log_handler is not None:
+                    self._log_handler.warning(
+                        "ppt_file.File._grow_preallocation()- reporting: Preallocation disabled as it is not supported"
+                    )
+
+    def _fallocate(self, mode, offset, length):
+        """
+        Calls the Linux "fallocate()" function with the given mode flags.
+
+        :param mode: "fallocate()" mode flags
+        :param offset: Offset of the range
+        :param length: Length of the range
+
+        :return: (bool) True on success; False if not supported
+        :since:  v1.1.0
+        """
+
+        _return = False
+
+        if _LIBC_FALLOCATE is not None and length > 0:
+            if _LIBC_FALLOCATE(self._handle.fileno(), mode, offset, length) == 0:
+                _return = True
+            else:
+                error_number = ctypes.get_errno()
+
+                if error_number not in _FALLOCATE_UNSUPPORTED_ERRNOS:
+                    raise IOError(error_number, os.strerror(error_number))
+
+            if self.metrics is not None:
+                self.metrics.increment("syscalls")
+
+        return _return
+
+    def pread(self, offset, n):
+        """
+        Reads up to n bytes at the given offset without changing the file
+        position. It is safe to call concurrently from threads.
+
+        :param offset: Offset to read from
+        :param n: How many bytes to read
+
+        :return: (bytes) Data; None on error
+        :since:  v1.1.0
+        """
+
+        _return = self.pread_many(((offset, n),))
+        return None if (_return is None) else _return[0]
+
+    def pread_many(self, ranges):
+        """
+        Reads the given byte ranges while taking the shared lock once. Adjacent
+        ranges are read with a single vectored read. The file position is not
+        changed and it is safe to call concurrently from threads.
+
+        :param ranges: Sequence of offset and length tuples
+
+        :return: (list) Data of each range in the order given; None on error
+        :since:  v1.1.0
+        """
+
+        if self._log_handler is not None:
+            self._log_handler.debug("ppt_file.File.pread_many({0:d})", len(ranges))
+
+        _return = None
+
+        if self._handle is not None and not self.binary:
+            raise IOError("Failed to read byte ranges from a text file handle")
+
+        if self._handle_lock == "w" or self.lock("r"):
+            if self.metrics is not None:
+                started = time.perf_counter()
+
+            if not self.readonly:
+                self._drain_write_buffer()
+                self._handle.flush()
+
+            buffers = [bytearray(length) for _, length in ranges]
+            filled = [0] * len(ranges)
+
+            for group in _group_adjacent_ranges(ranges, _get_iov_max()):
+                self._pread_group(ranges, group, buffers, filled)
+
+            for index, buffer in enumerate(buffers):
+                if filled[index] < len(buffer):
+                    del buffer[filled[index] :]
+
+            _return = [bytes(buffer) for buffer in buffers]
+
+            if self.metrics is not None:
+                self.metrics.observe("read_seconds", time.perf_counter() - started)
+                self.metrics.increment("bytes_read", sum(filled))
+
+        return _return
+
+    def _pread_group(self, ranges, group, buffers, filled):
+        """
+        Fills the buffers of a group of adjacent ranges with positional reads.
+
+        :param ranges: Sequence of offset and length tuples
+        :param group: List of indices of adjacent ranges in ascending order
+        :param buffers: List of buffers for each range
+        :param filled: List of bytes read for each range to update
+
+        :since: v1.1.0
+        """
+
+        file_descriptor = self._handle.fileno()
+        offset = ranges[group[0]][0]
+
+        if len(group) > 1 and hasattr(os, "preadv"):
+            bytes_read = os.preadv(
+                file_descriptor, [buffers[index] for index in group], offset
+            )
+
+            if self.metrics is not None:
+                self.metrics.increment("syscalls")
+
+            for index in group:
+                filled[index] = min(bytes_read, len(buffers[index]))
+                bytes_read -= filled[index]
+
+        for index in group:
+            range_offset = ranges[index][0]
+            buffer = buffers[index]
+
+            with memoryview(buffer) as view:
+                while filled[index] < len(buffer):
+                    bytes_read = self._pread_into(
+                        file_descriptor,
+                        view[filled[index] :],
+                        range_offset + filled[index],
+                    )
+
+                    if self.metrics is not None:
+                        self.metrics.increment("syscalls")
+
+                    if bytes_read < 1:
+                        break
+
+                    filled[index] += bytes_read
+
+    def _pread_into(self, file_descriptor, view, offset):
+        """
+        Reads into the given memoryview at the given offset without changing the
+        file position.
+
+        :param file_descriptor: File descriptor to read from
+        :param view: Writable memoryview of bytes to fill
+        :param offset: Offset to read from
+
+        :return: (int) Number of bytes read
+        :since:  v1.1.0
+        """
+
+        if hasattr(os, "preadv"):
+            _return = os.preadv(file_descriptor, [view], offset)
+        elif hasattr(os, "pread"):
+            data = os.pread(file_descriptor, len(view), offset)
+            _return = len(data)
+            view[:_return] = data
+        else:
+            with _POSITIONAL_READ_LOCK:
+                position = os.lseek(file_descriptor, 0, os.SEEK_CUR)
+
+                try:
+                    os.lseek(file_descriptor, offset, os.SEEK_SET)
+                    _return = os.readv(file_descriptor, [view])
+                finally:
+                    os.lseek(file_descriptor, position, os.SEEK_SET)
+
+        return _return
+
+    def punch_hole(self, offset, length):
+        """
+        Deallocates the space of the given byte range. Data in the range reads
+        as zeros afterwards while the file size is not changed.
+
+        :param offset: Offset of the range
+        :param length: Length of the range
+
+        :return: (bool) True on success; False if not supported
+        :since:  v1.1.0
+        """
+
+        if self._log_handler is not None:
+            self._log_handler.debug(
+                "ppt_file.File.punch_hole({0:d}, {1:d})", offset, length
+            )
+
+        _return = False
+
+        if self.lock("w"):
+            self._drain_write_buffer()
+            self._handle.flush()
+
+            _return = self._fallocate(
+                _FALLOC_FL_PUNCH_HOLE | _FALLOC_FL_KEEP_SIZE, offset, length
+            )
+
+            if _return:
+                # Seeking discards data of the range buffered for reading
+                self._handle.seek(self._handle.tell())
+
+        return _return
+
+    def read(self, n=0, timeout=-1):
+        """
+        python.org: Read up to n bytes from the object and return them.
+
+        :param n: How many bytes to read from the current position (0 means until
+                  EOF)
+        :param timeout: Timeout to use (defaults to construction time value)
+
+        :return: (bytes) Data; None if EOF
+        :since:  v1.0.0
+        """
+
+        if self._log_handler is not None:
+            self._log_handler.debug("ppt_file.File.read({0:d}, {1:d})", n, timeout)
+
+        _return = None
+
+        if self.lock("r"):
+            if self.metrics is not None:
+                started = time.perf_counter()
+
+            self._drain_write_buffer()
+            timeout_time = None if (timeout < 0) else (time.time() + timeout)
+
+            if self.binary:
+                _return = self._read_binary(self._get_read_size(n), timeout_time)
+            else:
+                _return = self._read_text(n, timeout_time)
+
+            if self._running_digest is not None:
+                self._update_running_digest(_return)
+
+            if self.metrics is not None:
+                self.metrics.observe("read_seconds", time.perf_counter() - started)
+                self.metrics.increment("bytes_read", len(_return))
+
+        return _return
+
+    def _log_timeout_before_eof(self):
+        """
+        Logs and counts that a timeout occured before EOF has been reached.
+
+        :since: v1.1.0
+        """
+
+        if self.metrics is not None:
+            self.metrics.increment("read_timeouts")
+
+        if self._log_handler is not None:
+            self._log_handler.error(
+                "ppt_file.File.read()- reporting: Timeout occured before EOF"
+            )
+
+    def _read_binary(self, size, timeout_time):
+        """
+        Reads up to the given size of bytes into a buffer allocated once.
+
+        :param size: How many bytes to read from the current position
+        :param timeout_time: Time after which reading is aborted; None for no
+                             timeout
+
+        :return: (bytes) Data
+        :since:  v1.1.0
+        """
+
+        if timeout_time is None:
+            _return = self._handle.read(size)
+
+            if self.metrics is not None:
+                self.metrics.increment("syscalls")
+        else:
+            _return = bytearray(size)
+
+            with memoryview(_return) as view:
+                bytes_read = self._readinto(view, timeout_time)
+
+            if bytes_read < size:
+                del _return[bytes_read:]
+
+            _return = bytes(_return)
+
+        return _return
+
+    def _read_text(self, n, timeout_time):
+        """
+        Reads up to n characters from an UTF-8 encoded file handle.
+
+        :param n: How many characters to read from the current position (0
+                  means until EOF)
+        :param timeout_time: Time after which reading is aborted; None for no
+                             timeout
+
+        :return: (str) Data
+        :since:  v1.1.0
+        """
+
+        bytes_unread = n
+        parts = []
+
+        while (
+            (bytes_unread > 0 or n == 0)
+            and not self.is_eof
+            and (timeout_time is None or time.time() < timeout_time)
+        ):
+            part_size = (
+                _IO_CHUNK_SIZE
+                if (bytes_unread > _IO_CHUNK_SIZE or n == 0)
+                else bytes_unread
+            )
+
+            part = self._handle.read(part_size)
+
+            if self.metrics is not None:
+                self.metrics.increment("syscalls")
+
+            if len(part) < 1:
+                break
+
+            parts.append(part)
+
+            if n > 0:
+                bytes_unread -= len(part)
+
+        if timeout_time is not None and time.time() >= timeout_time:
+            self._log_timeout_before_eof()
+
+        return "".join(parts)
+
+    def _get_read_size(self, n):
+        """
+        Returns the number of bytes available for reading from the current
+        position limited by n.
+
+        :param n: Maximum number of bytes requested (0 means until EOF)
+
+        :return: (int) Number of bytes to read
+        :since:  v1.1.0
+        """
+
+        _return = max(0, self.file_size - self._handle.tell())
+        if n > 0 and n < _return:
+            _return = n
+
+        return _return
+
+    def read_range(self, offset, n, timeout=-1):
+        """
+        Reads n bytes at the given offset while holding a shared lock of the
+        byte range. The file position is not changed.
+
+        :param offset: Offset to read from
+        :param n: How many bytes to read
+        :param timeout: Timeout to use (defaults to construction time value)
+
+        :return: (bytes) Data; None on error
+        :since:  v1.1.0
+        """
+
+        if self._log_handler is not None:
+            self._log_handler.debug(
+                "ppt_file.File.read_range({0:d}, {1:d}, {2:d})", offset, n, timeout
+            )
+
+        _return = None
+
+        if self._handle is not None and not self.binary:
+            raise IOError("Failed to read a byte range from a text file handle")
+
+        if n < 1:
+            # A length of 0 would lock the byte range until EOF and beyond
+            _return = b""
+        elif self.lock_range(offset, n, "r"):
+            try:
+                timeout_time = None if (timeout < 0) else (time.time() + timeout)
+
+                if not self.readonly:
+                    self._drain_write_buffer()
+                    self._handle.flush()
+
+                file_descriptor = self._handle.fileno()
+                _return = bytearray(n)
+                bytes_read = 0
+
+                with memoryview(_return) as view:
+                    while bytes_read < n and (
+                        timeout_time is None or time.time() < timeout_time
+                    ):
+                        part_size = self._pread_into(
+                            file_descriptor, view[bytes_read:], offset + bytes_read
+                        )
+
+                        if self.metrics is not None:
+                            self.metrics.increment("syscalls")
+
+                        if part_size < 1:
+                            break
+
+                        bytes_read += part_size
+
+                if bytes_read < n:
+                    del _return[bytes_read:]
+
+                _return = bytes(_return)
+
+                if self.metrics is not None:
+                    self.metrics.increment("bytes_read", bytes_read)
+            finally:
+                self.unlock_range(offset, n)
+
+        return _return
+
+    def readinto(self, buffer, timeout=-1):
+        """
+        python.org: Read bytes into a pre-allocated, writable bytes-like object b
+        and return the number of bytes read.
+
+        :param buffer: Writable bytes-like object to fill
+        :param timeout: Timeout to use (defaults to construction time value)
+
+        :return: (int) Number of bytes read
+        :since:  v1.1.0
+        """
+
+        if self._log_handler is not None:
+            self._log_handler.debug("ppt_file.File.readinto({0:d})", timeout)
+
+        _return = 0
+
+        if self.lock("r"):
+            if not self.binary:
+                raise IOError("Failed to read into a buffer from a text file handle")
+
+            self._drain_write_buffer()
+            timeout_time = None if (timeout < 0) else (time.time() + timeout)
+
+            with memoryview(buffer) as view:
+                with view.cast("B") as byte_view:
+                    size = self._get_read_size(len(byte_view))
+                    _return = self._readinto(byte_view[:size], timeout_time)
+
+                    if self._running_digest is not None:
+                        self._update_running_digest(byte_view[:_return])
+
+            if self.metrics is not None:
+                self.metrics.increment("bytes_read", _return)
+
+        return _return
+
+    def read_view(self, buffer, timeout=-1):
+        """
+        Reads into the given buffer and returns a memoryview of the filled part.
+
+        :param buffer: Writable bytes-like object to fill
+        :param timeout: Timeout to use (defaults to construction time value)
+
+        :return: (memoryview) View of the data read
+        :since:  v1.1.0
+        """
+
+        bytes_read = self.readinto(buffer, timeout)
+        return memoryview(buffer).cast("B")[:bytes_read]
+
+    def _readinto(self, view, timeout_time):
+        """
+        Fills the given memoryview from the current position of the file handle.
+
+        :param view: Writable memoryview of bytes to fill
+        :param timeout_time: Time after which reading is aborted; None for no
+                             timeout
+
+        :return: (int) Number of bytes read
+        :since:  v1.1.0
+        """
+
+        _return = 0
+        size = len(view)
+
+        if timeout_time is None:
+            while _return < size:
+                bytes_read = self._handle.readinto(view[_return:])
+
+                if self.metrics is not None:
+                    self.metrics.increment("syscalls")
+
+                if not bytes_read:
+                    break
+
+                _return += bytes_read
+        else:
+            while _return < size and time.time() < timeout_time:
+                part_size = min(_IO_CHUNK_SIZE, size - _return)
+                bytes_read = self._handle.readinto(view[_return : _return + part_size])
+
+                if self.metrics is not None:
+                    self.metrics.increment("syscalls")
+
+                if not bytes_read:
+                    break
+
+                _return += bytes_read
+
+            if _return < size and time.time() >= timeout_time:
+                self._log_timeout_before_eof()
+
+        return _return
+
+    def refresh_size(self):
+        """
+        Refreshes the file size with "os.fstat()" to include data written by
+        other processes since the file has been opened.
+
+        :return: (int) File size; -1 if not opened
+        :since:  v1.1.0
+        """
+
+        if self._handle is None:
+            _return = -1
+        else:
+            if not self.readonly:
+                self._drain_write_buffer()
+                self._handle.flush()
+
+            if not self._preallocated_visible:
+                self.file_size = os.fstat(self._handle.fileno()).st_size
+
+                if self.metrics is not None:
+                    self.metrics.increment("syscalls")
+
+            _return = self.file_size
+
+        return _return
+
     def seek(self, offset):
         """
         python.org: Change the stream position to the given byte offset.
@@ -612,7 +2577,13 @@ umask to set before creating a new file
         if self._log_handler is not None:
             self._log_handler.debug("ppt_file.File.seek({0:d})", offset)
 
-        return -1 if (self._handle is None) else self._handle.seek(offset)
+        if self._handle is None:
+            _return = -1
+        else:
+            self._drain_write_buffer()
+            _return = self._handle.seek(offset)
+
+        return _return
 
     def tell(self):
         """
@@ -622,7 +2593,14 @@ umask to set before creating a new file
         :since:  v1.0.0
         """
 
-        return -1 if (self._handle is None) else self._handle.tell()
+        if self._handle is None:
+            _return = -1
+        elif self._write_buffer_length > 0:
+            _return = self._write_buffer_offset + self._write_buffer_length
+        else:
+            _return = self._handle.tell()
+
+        return _return
 
     def truncate(self, new_size=None):
         """
@@ -640,8 +2618,11 @@ umask to set before creating a new file
             self._log_handler.debug("ppt_file.File.truncate({0:d})", new_size)
 
         if self.lock("w"):
+            self._drain_write_buffer()
             _return = self._handle.truncate(new_size)
             self.file_size = new_size
+            self._preallocated_size = new_size
+            self._preallocated_visible = False
         else:
             raise IOError("Failed to truncate the file")
 
@@ -665,34 +2646,448 @@ umask to set before creating a new file
         _return = 0
 
         if self.lock("w"):
-            if self.binary and not isinstance(b, bytes):
-                b = str.encode(b, "raw_unicode_escape")
+            if self.metrics is not None:
+                started = time.perf_counter()
 
-            bytes_unwritten = len(b)
-            bytes_written = self._handle.tell()
+            if self.binary:
+                b = self._get_binary_view(b)
 
-            if (bytes_written + bytes_unwritten) <= self.file_size:
-                new_size = 0
+            if self.binary and len(b) < self.write_buffer_size:
+                _return = self._write_buffered(b)
             else:
-                new_size = bytes_written + bytes_unwritten
+                self._drain_write_buffer()
 
-            timeout_time = time.time()
-            timeout_time += self.timeout_retries if (timeout < 0) else timeout
+                bytes_unwritten = len(b)
+                bytes_written = self._handle.tell()
 
-            while bytes_unwritten > 0 and time.time() < timeout_time:
-                part_size = 16384 if (bytes_unwritten > 16384) else bytes_unwritten
+                if self.preallocation_step > 0:
+                    self._grow_preallocation(bytes_written + bytes_unwritten)
 
-                self._handle.write(b[_return : (_return + part_size)])
-                bytes_unwritten -= part_size
-                _return += part_size
+                timeout_time = time.time()
+                timeout_time += self.timeout_retries if (timeout < 0) else timeout
 
-            if bytes_unwritten > 0:
-                self.file_size = os.stat(path.normpath(self.file_path_name)).st_size
-                if self._log_handler is not None:
-                    self._log_handler.error(
-                        "ppt_file.File.write()- reporting: Timeout occured before EOF"
+                while bytes_unwritten > 0 and time.time() < timeout_time:
+                    part_size = (
+                        _IO_CHUNK_SIZE
+                        if (bytes_unwritten > _IO_CHUNK_SIZE)
+                        else bytes_unwritten
+                    )
+
+                    self._handle.write(b[_return : (_return + part_size)])
+                    bytes_unwritten -= part_size
+                    _return += part_size
+
+                    if self.metrics is not None:
+                        self.metrics.increment("syscalls")
+
+                self._update_written_file_size(bytes_written, _return, bytes_unwritten)
+
+                if self._running_digest is not None:
+                    self._update_running_digest(b[:_return])
+
+            if self.metrics is not None:
+                self.metrics.observe("write_seconds", time.perf_counter() - started)
+
+        return _return
+
+    def _write_buffered(self, view):
+        """
+        Appends the given data to the write buffer. The buffer is drained first
+        if it is too full to take the data.
+
+        :param view: memoryview of bytes
+
+        :return: (int) Number of bytes written
+        :since:  v1.1.0
+        """
+
+        if self._write_buffer is None or len(self._write_buffer) != (
+            self.write_buffer_size
+        ):
+            self._drain_write_buffer()
+            self._write_buffer = bytearray(self.write_buffer_size)
+        elif self._write_buffer_length + len(view) > len(self._write_buffer):
+            self._drain_write_buffer()
+
+        if self._write_buffer_length < 1:
+            self._write_buffer_offset = self._handle.tell()
+
+        _return = len(view)
+
+        buffer_end = self._write_buffer_length + _return
+        self._write_buffer[self._write_buffer_length : buffer_end] = view
+        self._write_buffer_length = buffer_end
+
+        file_position = self._write_buffer_offset + buffer_end
+
+        if self._running_digest is not None:
+            self._update_running_digest(view)
+
+        if file_position > self.file_size:
+            self.file_size = file_position
+
+        if self.metrics is not None:
+            self.metrics.increment("bytes_written", _return)
+
+        return _return
+
+    def _drain_write_buffer(self):
+        """
+        Writes pending data of the write buffer to the file handle.
+
+        :since: v1.1.0
+        """
+
+        if self._write_buffer_length > 0:
+            if self.preallocation_step > 0:
+                self._grow_preallocation(
+                    self._write_buffer_offset + self._write_buffer_length
+                )
+
+            with memoryview(self._write_buffer) as view:
+                self._handle.write(view[: self._write_buffer_length])
+
+            self._write_buffer_length = 0
+
+            if self.metrics is not None:
+                self.metrics.increment("syscalls")
+
+    def _write_pending_data(self):
+        """
+        Writes pending data of the write buffer and of the file handle before
+        an exclusive lock is given up.
+
+        :since: v1.1.0
+        """
+
+        self._drain_write_buffer()
+
+        if self._handle_lock == "w":
+            self._handle.flush()
+
+            if self.metrics is not None:
+                self.metrics.increment("syscalls")
+
+    def write_range(self, offset, b, timeout=-1):
+        """
+        Writes the given data at the given offset while holding an exclusive lock
+        of the byte range. The file position is not changed.
+
+        :param offset: Offset to write at
+        :param b: Data to be written
+        :param timeout: Timeout to use (defaults to construction time value)
+
+        :return: (int) Number of bytes written
+        :since:  v1.1.0
+        """
+
+        if self._log_handler is not None:
+            self._log_handler.debug(
+                "ppt_file.File.write_range({0:d}, {1:d})", offset, timeout
+            )
+
+        _return = 0
+
+        if self._handle is not None and not self.binary:
+            raise IOError("Failed to write a byte range to a text file handle")
+
+        view = self._get_binary_view(b)
+        bytes_unwritten = len(view)
+
+        # A length of 0 would lock the byte range until EOF and beyond
+        if bytes_unwritten > 0 and self.lock_range(offset, bytes_unwritten, "w"):
+            if self.metrics is not None:
+                started = time.perf_counter()
+
+            try:
+                timeout_time = time.time()
+                timeout_time += self.timeout_retries if (timeout < 0) else timeout
+
+                self._drain_write_buffer()
+                self._handle.flush()
+                file_descriptor = self._handle.fileno()
+
+                if self.preallocation_step > 0:
+                    self._grow_preallocation(offset + bytes_unwritten)
+
+                while bytes_unwritten > 0 and time.time() < timeout_time:
+                    bytes_written = os.pwrite(
+                        file_descriptor, view[_return:], offset + _return
                     )
-            elif new_size > 0:
-                self.file_size = new_size
+
+                    bytes_unwritten -= bytes_written
+                    _return += bytes_written
+
+                    if self.metrics is not None:
+                        self.metrics.increment("syscalls")
+
+                self._update_written_file_size(offset, _return, bytes_unwritten)
+            finally:
+                self.unlock_range(offset, len(view))
+
+            if self.metrics is not None:
+                self.metrics.observe("write_seconds", time.perf_counter() - started)
+
+        return _return
+
+    def writev(self, buffers, timeout=-1):
+        """
+        Writes the given sequence of bytes-like objects at the current position
+        using a single vectored write if supported.
+
+        :param buffers: Sequence of bytes-like objects
+        :param timeout: Timeout to use (defaults to construction time value)
+
+        :return: (int) Number of bytes written
+        :since:  v1.1.0
+        """
+
+        if self._log_handler is not None:
+            self._log_handler.debug("ppt_file.File.writev({0:d})", timeout)
+
+        _return = 0
+
+        if self.lock("w"):
+            self._drain_write_buffer()
+
+            if self.binary and hasattr(os, "writev"):
+                if self.metrics is not None:
+                    started = time.perf_counter()
+
+                views = [self._get_binary_view(buffer) for buffer in buffers]
+                bytes_unwritten = sum(len(view) for view in views)
+                bytes_written = self._handle.tell()
+
+                if self.preallocation_step > 0:
+                    self._grow_preallocation(bytes_written + bytes_unwritten)
+
+                timeout_time = time.time()
+                timeout_time += self.timeout_retries if (timeout < 0) else timeout
+
+                self._handle.flush()
+                _return = self._writev(views, timeout_time)
+                self._handle.seek(bytes_written + _return)
+
+                self._update_written_file_size(
+                    bytes_written, _return, bytes_unwritten - _return
+                )
+
+                if self._running_digest is not None:
+                    bytes_hashed = 0
+
+                    for view in views:
+                        if bytes_hashed >= _return:
+                            break
+
+                        self._update_running_digest(view[: _return - bytes_hashed])
+                        bytes_hashed += len(view)
+
+                if self.metrics is not None:
+                    self.metrics.observe("write_seconds", time.perf_counter() - started)
+            else:
+                for buffer in buffers:
+                    _return += self.write(buffer, timeout)
+
+        return _return
+
+    def _writev(self, views, timeout_time):
+        """
+        Writes the given memoryviews with "os.writev()" and retries partial
+        writes until all data is written or the timeout occurs.
+
+        :param views: List of memoryviews of bytes
+        :param timeout_time: Time after which writing is aborted
+
+        :return: (int) Number of bytes written
+        :since:  v1.1.0
+        """
+
+        _return = 0
+
+        file_descriptor = self._handle.fileno()
+        iov_max = _get_iov_max()
+        views = [view for view in views if len(view) > 0]
+        view_index = 0
+
+        while view_index < len(views) and time.time() < timeout_time:
+            bytes_written = os.writev(
+                file_descriptor, views[view_index : view_index + iov_max]
+            )
+
+            _return += bytes_written
+
+            if self.metrics is not None:
+                self.metrics.increment("syscalls")
+
+            while view_index < len(views) and bytes_written >= len(views[view_index]):
+                bytes_written -= len(views[view_index])
+                view_index += 1
+
+            if bytes_written > 0:
+                views[view_index] = views[view_index][bytes_written:]
 
         return _return
+
+    def _get_binary_view(self, b):
+        """
+        Returns a memoryview of bytes for the given data. Strings are encoded
+        with "raw_unicode_escape".
+
+        :param b: Data to be written
+
+        :return: (object) memoryview instance
+        :since:  v1.1.0
+        """
+
+        if isinstance(b, str):
+            b = str.encode(b, "raw_unicode_escape")
+
+        _return = memoryview(b)
+        return _return if (_return.format == "B") else _return.cast("B")
+
+    def _update_written_file_size(self, position, bytes_written, bytes_unwritten):
+        """
+        Updates the file size and metrics after data has been written at the
+        given position.
+
+        :param position: Position the data has been written at
+        :param bytes_written: Number of bytes written
+        :param bytes_unwritten: Number of bytes not written due to a timeout
+
+        :since: v1.1.0
+        """
+
+        if self.metrics is not None:
+            self.metrics.increment("bytes_written", bytes_written)
+
+        if bytes_unwritten > 0:
+            self.file_size = max(self.file_size, position + bytes_written)
+
+            if self.metrics is not None:
+                self.metrics.increment("write_timeouts")
+
+            if self._log_handler is not None:
+                self._log_handler.error(
+                    "ppt_file.File.write()- reporting: Timeout occured before EOF"
+                )
+        elif (position + bytes_written) > self.file_size:
+            self.file_size = position + bytes_written
+
+
+def _parallel_map_worker(file_path_name, timeout_retries, func, offset, length):
+    """
+    Process pool entry point of "File.parallel_map()" reading the given range
+    read-only and calling func with its data.
+
+    :param file_path_name: Path to the file
+    :param timeout_retries: Retries before timing out
+    :param func: Callable receiving the bytes of the range
+    :param offset: Offset of the range
+    :param length: Length of the range
+
+    :return: (mixed) Result of func
+    :since:  v1.1.0
+    """
+
+    file_instance = File(timeout_retries=timeout_retries)
+
+    if not file_instance.open(file_path_name, True, "rb"):
+        raise IOError("Failed to open the file for parallel processing")
+
+    try:
+        if _USE_FILE_LOCKING:
+            file_instance.seek(offset)
+            data = file_instance.read(length)
+        else:
+            data = file_instance.read_range(offset, length)
+
+        if data is None:
+            raise IOError("Failed to read the file range for parallel processing")
+    finally:
+        file_instance.close()
+
+    return func(data)
+
+
+def _group_adjacent_ranges(ranges, max_group_size):
+    """
+    Groups the indices of adjacent byte ranges sorted by offset.
+
+    :param ranges: Sequence of offset and length tuples
+    :param max_group_size: Maximum number of ranges per group
+
+    :return: (list) List of lists of range indices
+    :since:  v1.1.0
+    """
+
+    _return = []
+
+    group = None
+    group_end = -1
+
+    for index in sorted(range(len(ranges)), key=lambda index: ranges[index][0]):
+        offset, length = ranges[index]
+
+        if group is None or offset != group_end or len(group) >= max_group_size:
+            group = []
+            _return.append(group)
+
+        group.append(index)
+        group_end = offset + length
+
+    return _return
+
+
+def _get_iov_max():
+    """
+    Returns the maximum number of buffers accepted by "os.writev()".
+
+    :return: (int) Maximum number of buffers
+    :since:  v1.1.0
+    """
+
+    try:
+        _return = os.sysconf("SC_IOV_MAX")
+    except (AttributeError, OSError, ValueError):
+        _return = -1
+
+    return 1024 if (_return < 1) else _return
+
+
+def _call_blocking(callback, timeout):
+    """
+    Calls the given blocking callable if waiting without a timeout is
+    requested. Bounded waits are not interrupted but left to the non-blocking
+    retries with backoff of the lock wait strategy.
+
+    :param callback: Blocking callable to call
+    :param timeout: Timeout in seconds; None to wait forever
+
+    :return: (bool) True on success; None if waiting is not supported
+    :since:  v1.1.0
+    """
+
+    # pylint: disable=broad-except
+
+    _return = None
+
+    if timeout is None:
+        try:
+            _return = callback() is not False
+        except Exception:
+            _return = False
+
+    return _return
+
+
+def _new_digest(algorithm):
+    """
+    Returns a new hashlib compatible digest for the given algorithm.
+
+    :param algorithm: "crc32" or an algorithm supported by "hashlib.new()"
+
+    :return: (object) hashlib compatible digest
+    :since:  v1.1.0
+    """
+
+    return Crc32Digest() if (algorithm == "crc32") else hashlib.new(algorithm)
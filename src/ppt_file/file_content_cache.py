@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+
+"""
+Personal Python Toolkit
+Modularized all-in-one toolkit for Python
+----------------------------------------------------------------------------
+(C) Tobias "NotTheEvilOne" Wolf - All rights reserved
+https://github.com/NotTheEvilOne/ppt_file
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint: disable=import-error,invalid-name
+
+from collections import OrderedDict
+from os import path
+import os
+import threading
+
+from .file import File
+
+
+class FileContentCache(object):
+    """
+    Cache of file contents with a byte budget evicting the least recently used
+    entries. Entries are validated by inode, modification time and size with
+    a single "os.stat()" call.
+
+    :author:     Tobias "NotTheEvilOne" Wolf et al.
+    :copyright:  Tobias "NotTheEvilOne" Wolf - All rights reserved
+    :package:    ppt
+    :subpackage: file
+    :since:      v1.1.0
+    :license:    http://mozilla.org/MPL/2.0/
+                 Mozilla Public License, v. 2.0
+    """
+
+    # pylint: disable=bad-option-value,slots-on-old-class
+    __slots__ = ("_cached_bytes", "_entries", "_file_kwargs", "_lock", "max_bytes")
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    def __init__(self, max_bytes=67108864, **kwargs):
+        """
+        Constructor __init__(FileContentCache)
+
+        :param max_bytes: Maximum number of bytes cached
+        :param kwargs: Keyword arguments for file instances reading uncached
+                       files
+
+        :since: v1.1.0
+        """
+
+        self._cached_bytes = 0
+        """
+Number of bytes cached
+        """
+        self._entries = OrderedDict()
+        """
+Cached contents with their stat values ordered from least to most recently
+used
+        """
+        self._file_kwargs = kwargs
+        """
+Keyword arguments for file instances reading uncached files
+        """
+        self._lock = threading.Lock()
+        """
+Lock protecting the cache
+        """
+        self.max_bytes = max_bytes
+        """
+Maximum number of bytes cached
+        """
+
+    def __len__(self):
+        """
+        python.org: Called to implement the built-in function len().
+
+        :return: (int) Number of files cached
+        :since:  v1.1.0
+        """
+
+        with self._lock:
+            return len(self._entries)
+
+    @property
+    def cached_bytes(self):
+        """
+        Returns the number of bytes cached.
+
+        :return: (int) Number of bytes cached
+        :since:  v1.1.0
+        """
+
+        with self._lock:
+            return self._cached_bytes
+
+    def clear(self):
+        """
+        Removes all cached contents.
+
+        :since: v1.1.0
+        """
+
+        with self._lock:
+            self._entries.clear()
+            self._cached_bytes = 0
+
+    def _get_stat_values(self, file_stat):
+        """
+        Returns the values used to validate a cached content.
+
+        :param file_stat: "os.stat_result" instance
+
+        :return: (tuple) Device, inode, modification time and size
+        :since:  v1.1.0
+        """
+
+        return (
+            file_stat.st_dev,
+            file_stat.st_ino,
+            file_stat.st_mtime_ns,
+            file_stat.st_size,
+        )
+
+    def invalidate(self, file_path_name):
+        """
+        Removes the cached content of the given file.
+
+        :param file_path_name: Path to the file
+
+        :since: v1.1.0
+        """
+
+        with self._lock:
+            self._pop_entry(path.normpath(file_path_name))
+
+    def _load(self, file_path_name):
+        """
+        Reads the given file with a file instance.
+
+        :param file_path_name: Path to the file
+
+        :return: (tuple) Content and stat values of the file read
+        :since:  v1.1.0
+        """
+
+        file_instance = File(**self._file_kwargs)
+
+        if not file_instance.open(file_path_name, True, "rb"):
+            raise IOError("Failed to open the file requested")
+
+        try:
+            data = file_instance.read()
+
+            if data is None:
+                raise IOError("Failed to read the file requested")
+
+            stat_values = self._get_stat_values(os.fstat(file_instance.handle.fileno()))
+        finally:
+            file_instance.close()
+
+        return (data, stat_values)
+
+    def _pop_entry(self, key):
+        """
+        Removes the cached content of the given key. The cache lock must be
+        held.
+
+        :param key: Cache key
+
+        :since: v1.1.0
+        """
+
+        entry = self._entries.pop(key, None)
+
+        if entry is not None:
+            self._cached_bytes -= len(entry[0])
+
+    def read(self, file_path_name, as_view=False):
+        """
+        Returns the content of the given file. Unchanged files are served from
+        memory without opening, locking and reading them.
+
+        :param file_path_name: Path to the file
+        :param as_view: True to return a read-only memoryview
+
+        :return: (mixed) Content as bytes or read-only memoryview
+        :since:  v1.1.0
+        """
+
+        key = path.normpath(file_path_name)
+        metrics = self._file_kwargs.get("metrics")
+
+        try:
+            stat_values = self._get_stat_values(os.stat(key))
+        except OSError:
+            with self._lock:
+                self._pop_entry(key)
+
+            raise IOError("Failed to open the file requested")
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or entry[1] != stat_values:
+                _return = None
+            else:
+                _return = entry[0]
+                self._entries.move_to_end(key)
+
+        if _return is None:
+            if metrics is not None:
+                metrics.increment("cache_misses")
+
+            _return, stat_values = self._load(file_path_name)
+
+            # Contents changed while being read are not cached.
+            if len(_return) == stat_values[3]:
+                self._store(key, _return, stat_values)
+        elif metrics is not None:
+            metrics.increment("cache_hits")
+
+        return memoryview(_return) if (as_view) else _return
+
+    def _store(self, key, data, stat_values):
+        """
+        Caches the given content and evicts the least recently used contents
+        exceeding the byte budget.
+
+        :param key: Cache key
+        :param data: File content
+        :param stat_values: Values returned by "_get_stat_values()"
+
+        :since: v1.1.0
+        """
+
+        with self._lock:
+            self._pop_entry(key)
+
+            if len(data) <= self.max_bytes:
+                self._entries[key] = (data, stat_values)
+                self._cached_bytes += len(data)
+
+                while self._cached_bytes > self.max_bytes:
+                    self._cached_bytes -= len(self._entries.popitem(last=False)[1][0])
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+"""
+Personal Python Toolkit
+Modularized all-in-one toolkit for Python
+----------------------------------------------------------------------------
+(C) Tobias "NotTheEvilOne" Wolf - All rights reserved
+https://github.com/NotTheEvilOne/ppt_file
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint: disable=invalid-name
+
+from bisect import bisect_left
+import threading
+
+
+class FileMetrics(object):
+    """
+    Counters and latency histograms collected by file instances it has been
+    given to.
+
+    :author:     Tobias "NotTheEvilOne" Wolf et al.
+    :copyright:  Tobias "NotTheEvilOne" Wolf - All rights reserved
+    :package:    ppt
+    :subpackage: file
+    :since:      v1.1.0
+    :license:    http://mozilla.org/MPL/2.0/
+                 Mozilla Public License, v. 2.0
+    """
+
+    # pylint: disable=bad-option-value,slots-on-old-class
+    __slots__ = ("_counters", "_histograms", "_lock")
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    HISTOGRAM_BOUNDS = (
+        0.00001,
+        0.00005,
+        0.0001,
+        0.0005,
+        0.001,
+        0.005,
+        0.01,
+        0.05,
+        0.1,
+        0.5,
+        1.0,
+        5.0,
+    )
+    """
+Upper bounds in seconds of the histogram buckets. Larger values are counted in
+an additional overflow bucket.
+    """
+
+    def __init__(self):
+        """
+        Constructor __init__(FileMetrics)
+
+        :since: v1.1.0
+        """
+
+        self._counters = {}
+        """
+Counter values by name
+        """
+        self._histograms = {}
+        """
+Histogram data by name
+        """
+        self._lock = threading.Lock()
+        """
+Lock protecting counters and histograms
+        """
+
+    def increment(self, name, value=1):
+        """
+        Increments the given counter.
+
+        :param name: Counter name
+        :param value: Value to add
+
+        :since: v1.1.0
+        """
+
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name, seconds):
+        """
+        Adds the given duration to the given histogram.
+
+        :param name: Histogram name
+        :param seconds: Duration in seconds
+
+        :since: v1.1.0
+        """
+
+        with self._lock:
+            histogram = self._histograms.get(name)
+
+            if histogram is None:
+                histogram = [0, 0.0, 0.0, [0] * (len(FileMetrics.HISTOGRAM_BOUNDS) + 1)]
+                self._histograms[name] = histogram
+
+            histogram[0] += 1
+            histogram[1] += seconds
+
+            if seconds > histogram[2]:
+                histogram[2] = seconds
+
+            histogram[3][bisect_left(FileMetrics.HISTOGRAM_BOUNDS, seconds)] += 1
+
+    def reset(self):
+        """
+        Resets all counters and histograms.
+
+        :since: v1.1.0
+        """
+
+        with self._lock:
+            self._counters = {}
+            self._histograms = {}
+
+    def snapshot(self):
+        """
+        Returns a snapshot of all counters and histograms.
+
+        :return: (dict) Dictionary with "counters" and "histograms"; histograms
+                 contain "count", "sum", "max" and "buckets" as a list of upper
+                 bounds (None for the overflow bucket) and counts
+        :since:  v1.1.0
+        """
+
+        with self._lock:
+            counters = self._counters.copy()
+
+            histograms = {
+                name: {
+                    "count": histogram[0],
+                    "sum": histogram[1],
+                    "max": histogram[2],
+                    "buckets": list(
+                        zip(FileMetrics.HISTOGRAM_BOUNDS + (None,), histogram[3])
+                    ),
+                }
+                for name, histogram in self._histograms.items()
+            }
+
+        return {"counters": counters, "histograms": histograms}
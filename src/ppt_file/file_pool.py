@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+
+"""
+Personal Python Toolkit
+Modularized all-in-one toolkit for Python
+----------------------------------------------------------------------------
+(C) Tobias "NotTheEvilOne" Wolf - All rights reserved
+https://github.com/NotTheEvilOne/ppt_file
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint: disable=import-error,invalid-name,protected-access
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from os import path
+import os
+import threading
+import time
+
+from .file import File
+
+
+class FilePool(object):
+    """
+    Pool keeping file instances open for reuse keyed by path and mode.
+    Instances of truncating or exclusively creating file modes are closed on
+    release instead.
+
+    :author:     Tobias "NotTheEvilOne" Wolf et al.
+    :copyright:  Tobias "NotTheEvilOne" Wolf - All rights reserved
+    :package:    ppt
+    :subpackage: file
+    :since:      v1.1.0
+    :license:    http://mozilla.org/MPL/2.0/
+                 Mozilla Public License, v. 2.0
+    """
+
+    # pylint: disable=bad-option-value,slots-on-old-class
+    __slots__ = (
+        "_file_kwargs",
+        "_idle",
+        "idle_timeout",
+        "_in_use",
+        "_lock",
+        "max_open",
+    )
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    def __init__(self, max_open=128, idle_timeout=60, **kwargs):
+        """
+        Constructor __init__(FilePool)
+
+        :param max_open: Maximum number of open file instances
+        :param idle_timeout: Seconds an unused file instance is kept open
+        :param kwargs: Keyword arguments for new file instances
+
+        :since: v1.1.0
+        """
+
+        self._file_kwargs = kwargs
+        """
+Keyword arguments for new file instances
+        """
+        self._idle = OrderedDict()
+        """
+Unused file instances with their stat values and release time ordered from
+least to most recently used
+        """
+        self.idle_timeout = idle_timeout
+        """
+Seconds an unused file instance is kept open
+        """
+        self._in_use = {}
+        """
+File instances currently acquired by ID with their pool key
+        """
+        self._lock = threading.Lock()
+        """
+Lock protecting the pool
+        """
+        self.max_open = max_open
+        """
+Maximum number of open file instances
+        """
+
+    def __enter__(self):
+        """
+        python.org: Enter the runtime context related to this object.
+
+        :since: v1.1.0
+        """
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        python.org: Exit the runtime context related to this object.
+
+        :return: (bool) True to suppress exceptions
+        :since:  v1.1.0
+        """
+
+        self.close()
+
+    @property
+    def open_count(self):
+        """
+        Returns the number of open file instances.
+
+        :return: (int) Number of open file instances
+        :since:  v1.1.0
+        """
+
+        with self._lock:
+            return len(self._idle) + len(self._in_use)
+
+    def acquire(self, file_path_name, readonly=False, file_mode="r+b"):
+        """
+        Returns an open file instance positioned at the start of the file for
+        exclusive use until it is released.
+
+        :param file_path_name: Path to the requested file
+        :param readonly: Open file in readonly mode
+        :param file_mode: File mode to use
+
+        :return: (object) File instance
+        :since:  v1.1.0
+        """
+
+        key = (path.normpath(file_path_name), bool(readonly), file_mode)
+        file_instance = None
+        expired_files = []
+
+        with self._lock:
+            self._pop_expired_files(expired_files)
+
+            entry = self._idle.pop(key, None)
+
+            if entry is not None:
+                file_instance = entry[0]
+                self._in_use[id(file_instance)] = (key, file_instance)
+
+        self._close_files(expired_files)
+
+        if file_instance is not None and not self._revalidate(file_instance, entry[1]):
+            with self._lock:
+                del self._in_use[id(file_instance)]
+
+            file_instance.close()
+            file_instance = None
+
+        if file_instance is None:
+            file_instance = self._open(key, file_path_name, readonly, file_mode)
+
+        return file_instance
+
+    def close(self):
+        """
+        Closes all unused file instances. Acquired ones are closed on release.
+
+        :since: v1.1.0
+        """
+
+        with self._lock:
+            files = [entry[0] for entry in self._idle.values()]
+            self._idle.clear()
+
+        self._close_files(files)
+
+    def _close_files(self, files):
+        """
+        Closes the given file instances.
+
+        :param files: List of file instances
+
+        :since: v1.1.0
+        """
+
+        for file_instance in files:
+            file_instance.close()
+
+    @contextmanager
+    def file(self, file_path_name, readonly=False, file_mode="r+b"):
+        """
+        Returns a context manager acquiring and releasing a file instance.
+
+        :param file_path_name: Path to the requested file
+        :param readonly: Open file in readonly mode
+        :param file_mode: File mode to use
+
+        :return: (object) Context manager
+        :since:  v1.1.0
+        """
+
+        file_instance = self.acquire(file_path_name, readonly, file_mode)
+
+        try:
+            yield file_instance
+        finally:
+            self.release(file_instance)
+
+    def _get_stat_values(self, file_instance):
+        """
+        Returns the values used to revalidate a file instance before reuse.
+
+        :param file_instance: File instance
+
+        :return: (tuple) Device, inode and modification time
+        :since:  v1.1.0
+        """
+
+        file_stat = os.fstat(file_instance.handle.fileno())
+        return (file_stat.st_dev, file_stat.st_ino, file_stat.st_mtime_ns)
+
+    def _open(self, key, file_path_name, readonly, file_mode):
+        """
+        Opens a new file instance after making room for it if needed.
+
+        :param key: Pool key
+        :param file_path_name: Path to the requested file
+        :param readonly: Open file in readonly mode
+        :param file_mode: File mode to use
+
+        :return: (object) File instance
+        :since:  v1.1.0
+        """
+
+        evicted_files = []
+
+        with self._lock:
+            while (
+                len(self._idle) + len(self._in_use) >= self.max_open
+                and len(self._idle) > 0
+            ):
+                evicted_files.append(self._idle.popitem(last=False)[1][0])
+
+            if len(self._idle) + len(self._in_use) >= self.max_open:
+                raise IOError("Maximum number of open files in the pool reached")
+
+            file_instance = File(**self._file_kwargs)
+            self._in_use[id(file_instance)] = (key, file_instance)
+
+        self._close_files(evicted_files)
+
+        if not file_instance.open(file_path_name, readonly, file_mode):
+            with self._lock:
+                del self._in_use[id(file_instance)]
+
+            raise IOError("Failed to open the file requested")
+
+        return file_instance
+
+    def _pop_expired_files(self, expired_files):
+        """
+        Removes unused file instances exceeding the idle timeout. The pool lock
+        must be held.
+
+        :param expired_files: List the expired file instances are appended to
+
+        :since: v1.1.0
+        """
+
+        expiry_time = time.monotonic() - self.idle_timeout
+
+        while len(self._idle) > 0:
+            entry = next(iter(self._idle.values()))
+
+            if entry[2] > expiry_time:
+                break
+
+            expired_files.append(self._idle.popitem(last=False)[1][0])
+
+    def release(self, file_instance):
+        """
+        Returns an acquired file instance to the pool.
+
+        :param file_instance: File instance
+
+        :since: v1.1.0
+        """
+
+        expired_files = []
+
+        with self._lock:
+            key, _ = self._in_use.pop(id(file_instance), (None, None))
+
+        if key is None:
+            raise ValueError("File instance given has not been acquired")
+
+        # Reusing instances of truncating or exclusively creating modes would
+        # return existing data instead of an empty file.
+        is_reusable = file_instance.is_valid and not ("w" in key[2] or "x" in key[2])
+
+        if is_reusable:
+            # Idle file instances must not block other processes.
+            if file_instance._handle_lock == "w":
+                file_instance.flush()
+
+            is_reusable = file_instance.unlock()
+
+        if is_reusable:
+            stat_values = self._get_stat_values(file_instance)
+
+            with self._lock:
+                self._pop_expired_files(expired_files)
+
+                if key in self._idle:
+                    expired_files.append(file_instance)
+                else:
+                    self._idle[key] = (file_instance, stat_values, time.monotonic())
+        else:
+            expired_files.append(file_instance)
+
+        self._close_files(expired_files)
+
+    def _revalidate(self, file_instance, stat_values):
+        """
+        Checks that the path still refers to the opened file and refreshes the
+        file size if it has been modified since the instance was released.
+
+        :param file_instance: File instance
+        :param stat_values: Values returned by "_get_stat_values()" on release
+
+        :return: (bool) True if the file instance can be reused
+        :since:  v1.1.0
+        """
+
+        _return = False
+
+        try:
+            path_stat = os.stat(path.normpath(file_instance.file_path_name))
+            file_stat = os.fstat(file_instance.handle.fileno())
+
+            if (path_stat.st_dev, path_stat.st_ino) == (
+                file_stat.st_dev,
+                file_stat.st_ino,
+            ):
+                _return = True
+
+                if (
+                    file_stat.st_mtime_ns != stat_values[2]
+                    or file_stat.st_size != file_instance.file_size
+                ):
+                    file_instance.file_size = file_stat.st_size
+
+                # Seeking to EOF discards data buffered before the release as
+                # changes within the timestamp granularity are not detected.
+                file_instance.handle.seek(0, os.SEEK_END)
+                file_instance.seek(0)
+        except OSError:
+            pass
+
+        return _return
@@ -0,0 +1,277 @@
+# -*- coding: utf-8 -*-
+
+"""
+Personal Python Toolkit
+Modularized all-in-one toolkit for Python
+----------------------------------------------------------------------------
+(C) Tobias "NotTheEvilOne" Wolf - All rights reserved
+https://github.com/NotTheEvilOne/ppt_file
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint: disable=import-error,invalid-name,protected-access
+
+from contextlib import contextmanager
+import os
+import time
+
+from .lock_wait_strategy import LockWaitStrategy
+
+
+class FileSet(object):
+    """
+    Set of file instances locked together. Locks are acquired in the order of
+    device and inode without waiting. If a lock is not available all locks
+    acquired by the set are released again before retrying with backoff until
+    one overall deadline is reached. Exclusive locks held before are kept as
+    they are.
+
+    :author:     Tobias "NotTheEvilOne" Wolf et al.
+    :copyright:  Tobias "NotTheEvilOne" Wolf - All rights reserved
+    :package:    ppt
+    :subpackage: file
+    :since:      v1.1.0
+    :license:    http://mozilla.org/MPL/2.0/
+                 Mozilla Public License, v. 2.0
+    """
+
+    # pylint: disable=bad-option-value,slots-on-old-class
+    __slots__ = ("_entries", "_is_locked", "_locked_files", "lock_wait_strategy")
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    def __init__(self, files=None, lock_wait_strategy=None):
+        """
+        Constructor __init__(FileSet)
+
+        :param files: Dictionary of file instances with their locking mode or
+                      list of file instances locked exclusively
+        :param lock_wait_strategy: Strategy used to wait between retries
+
+        :since: v1.1.0
+        """
+
+        self._entries = {}
+        """
+Locking modes by file instance ID with the file instance
+        """
+        self._is_locked = False
+        """
+True if all file instances are locked
+        """
+        self._locked_files = []
+        """
+File instances locked by the set in the order of locking
+        """
+        self.lock_wait_strategy = (
+            LockWaitStrategy() if (lock_wait_strategy is None) else lock_wait_strategy
+        )
+        """
+Strategy used to wait between retries
+        """
+
+        if isinstance(files, dict):
+            for file_instance, lock_mode in files.items():
+                self.add(file_instance, lock_mode)
+        elif files is not None:
+            for file_instance in files:
+                self.add(file_instance)
+
+    def __len__(self):
+        """
+        python.org: Called to implement the built-in function len().
+
+        :return: (int) Number of file instances
+        :since:  v1.1.0
+        """
+
+        return len(self._entries)
+
+    @property
+    def is_locked(self):
+        """
+        Returns true if all file instances are locked.
+
+        :return: (bool) True if locked
+        :since:  v1.1.0
+        """
+
+        return self._is_locked
+
+    def add(self, file_instance, lock_mode="w"):
+        """
+        Adds a file instance to be locked with the given mode. A file instance
+        added again is locked exclusively if any of the modes requested is
+        exclusive.
+
+        :param file_instance: Opened file instance
+        :param lock_mode: The requested locking mode ("r" or "w")
+
+        :since: v1.1.0
+        """
+
+        if lock_mode not in ("r", "w"):
+            raise ValueError("Lock mode given is invalid")
+
+        if self._is_locked:
+            raise IOError("File set is already locked")
+
+        entry = self._entries.get(id(file_instance))
+
+        if entry is not None and entry[0] == "w":
+            lock_mode = "w"
+
+        self._entries[id(file_instance)] = (lock_mode, file_instance)
+
+    def _get_ordered_entries(self):
+        """
+        Returns the locking modes and file instances ordered by device and
+        inode.
+
+        :return: (list) Locking modes with their file instance
+        :since:  v1.1.0
+        """
+
+        keyed_entries = []
+
+        for lock_mode, file_instance in self._entries.values():
+            if file_instance.handle is None:
+                raise IOError("File handle invalid")
+
+            file_stat = os.fstat(file_instance.handle.fileno())
+            key = (file_stat.st_dev, file_stat.st_ino)
+
+            keyed_entries.append((key, lock_mode, file_instance))
+
+        keyed_entries.sort(key=lambda keyed_entry: keyed_entry[0])
+
+        for index in range(1, len(keyed_entries)):
+            if keyed_entries[index][0] == keyed_entries[index - 1][0] and "w" in (
+                keyed_entries[index][1],
+                keyed_entries[index - 1][1],
+            ):
+                raise ValueError("File instances given refer to the same file")
+
+        return [
+            (lock_mode, file_instance) for _, lock_mode, file_instance in keyed_entries
+        ]
+
+    def lock(self, timeout=None):
+        """
+        Locks all file instances.
+
+        :param timeout: Timeout in seconds (defaults to the lock wait strategy
+                        or the largest file instance construction time value)
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        if self._is_locked:
+            return True
+
+        ordered_entries = self._get_ordered_entries()
+
+        if timeout is None:
+            timeout = self.lock_wait_strategy.timeout
+        if timeout is None:
+            timeout = max(
+                (file_instance.timeout_retries for _, file_instance in ordered_entries),
+                default=0,
+            )
+
+        deadline = self.lock_wait_strategy.get_deadline(timeout)
+        self._is_locked = self._try_lock(ordered_entries)
+
+        if not self._is_locked:
+            for delay in self.lock_wait_strategy.iter_delays(deadline):
+                time.sleep(delay)
+
+                if self._try_lock(ordered_entries):
+                    self._is_locked = True
+                    break
+
+        return self._is_locked
+
+    @contextmanager
+    def locked(self, timeout=None):
+        """
+        Returns a context manager holding the locks of all file instances.
+
+        :param timeout: Timeout in seconds (defaults to the lock wait strategy
+                        or the largest file instance construction time value)
+
+        :return: (object) Context manager
+        :since:  v1.1.0
+        """
+
+        if not self.lock(timeout):
+            raise IOError("Failed to lock the files requested")
+
+        try:
+            yield self
+        finally:
+            self.unlock()
+
+    def _try_lock(self, ordered_entries):
+        """
+        Tries to lock the given file instances in order without waiting. Locks
+        acquired are released again if one is not available. File instances
+        already holding an exclusive lock are skipped.
+
+        :param ordered_entries: Locking modes with their file instance
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        locked_files = []
+        _return = True
+
+        for lock_mode, file_instance in ordered_entries:
+            if file_instance._handle_lock == "w":
+                continue
+
+            if lock_mode == "w" and file_instance.readonly:
+                is_locked = file_instance.lock("w", 0)
+            else:
+                is_locked = file_instance._change_lock(lock_mode, 0)
+
+            if not is_locked:
+                if file_instance.log_handler is not None:
+                    file_instance.log_handler.debug(
+                        "ppt_file.FileSet._try_lock()- reporting: File lock not available"
+                    )
+
+                _return = False
+                break
+
+            locked_files.append(file_instance)
+
+        if _return:
+            self._locked_files = locked_files
+        else:
+            for file_instance in reversed(locked_files):
+                file_instance.unlock()
+
+        return _return
+
+    def unlock(self):
+        """
+        Releases the locks acquired by the set. Exclusive locks held before
+        locking the set are kept.
+
+        :since: v1.1.0
+        """
+
+        if self._is_locked:
+            for file_instance in reversed(self._locked_files):
+                file_instance.unlock()
+
+            self._is_locked = False
+            self._locked_files = []
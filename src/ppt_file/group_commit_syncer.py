@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+"""
+Personal Python Toolkit
+Modularized all-in-one toolkit for Python
+----------------------------------------------------------------------------
+(C) Tobias "NotTheEvilOne" Wolf - All rights reserved
+https://github.com/NotTheEvilOne/ppt_file
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint: disable=invalid-name
+
+import os
+import threading
+import time
+
+
+class GroupCommitSyncer(object):
+    """
+    Background syncer batching sync requests of many file descriptors into one
+    sync pass per interval.
+
+    :author:     Tobias "NotTheEvilOne" Wolf et al.
+    :copyright:  Tobias "NotTheEvilOne" Wolf - All rights reserved
+    :package:    ppt
+    :subpackage: file
+    :since:      v1.1.0
+    :license:    http://mozilla.org/MPL/2.0/
+                 Mozilla Public License, v. 2.0
+    """
+
+    # pylint: disable=bad-option-value,slots-on-old-class
+    __slots__ = ("_condition", "interval", "_requests", "_thread", "use_fdatasync")
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    _instance = None
+    """
+Syncer instance shared by the process
+    """
+    _instance_lock = threading.Lock()
+    """
+Lock used to create the shared syncer instance
+    """
+
+    def __init__(self, interval=0.005, use_fdatasync=True):
+        """
+        Constructor __init__(GroupCommitSyncer)
+
+        :param interval: Seconds to collect requests before syncing them
+        :param use_fdatasync: True to use "os.fdatasync()" if available
+
+        :since: v1.1.0
+        """
+
+        self._condition = threading.Condition()
+        """
+Condition used to wake the syncer thread and waiting requests
+        """
+        self.interval = interval
+        """
+Seconds to collect requests before syncing them
+        """
+        self._requests = []
+        """
+Pending sync requests
+        """
+        self._thread = None
+        """
+Syncer thread
+        """
+        self.use_fdatasync = use_fdatasync
+        """
+True to use "os.fdatasync()" if available
+        """
+
+    def _run(self):
+        """
+        Syncs all requests collected per interval.
+
+        :since: v1.1.0
+        """
+
+        while True:
+            with self._condition:
+                while len(self._requests) < 1:
+                    self._condition.wait()
+
+            if self.interval > 0:
+                time.sleep(self.interval)
+
+            with self._condition:
+                requests = self._requests
+                self._requests = []
+
+            sync_function = (
+                os.fdatasync
+                if (self.use_fdatasync and hasattr(os, "fdatasync"))
+                else os.fsync
+            )
+
+            errors = {}
+
+            for file_descriptor in {request[0] for request in requests}:
+                try:
+                    sync_function(file_descriptor)
+                except OSError as handled_exception:
+                    errors[file_descriptor] = handled_exception
+
+            with self._condition:
+                for request in requests:
+                    request[1] = errors.get(request[0])
+                    request[2] = True
+
+                self._condition.notify_all()
+
+    def sync(self, file_descriptor):
+        """
+        Waits until the given file descriptor has been synced with the next
+        batch.
+
+        :param file_descriptor: File descriptor to sync
+
+        :since: v1.1.0
+        """
+
+        request = [file_descriptor, None, False]
+
+        with self._condition:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="ppt_file.GroupCommitSyncer", daemon=True
+                )
+
+                self._thread.start()
+
+            self._requests.append(request)
+            self._condition.notify_all()
+
+            while not request[2]:
+                self._condition.wait()
+
+        if request[1] is not None:
+            raise request[1]
+
+    @staticmethod
+    def get_instance():
+        """
+        Returns the syncer instance shared by the process.
+
+        :return: (object) GroupCommitSyncer instance
+        :since:  v1.1.0
+        """
+
+        if GroupCommitSyncer._instance is None:
+            with GroupCommitSyncer._instance_lock:
+                if GroupCommitSyncer._instance is None:
+                    GroupCommitSyncer._instance = GroupCommitSyncer()
+
+        return GroupCommitSyncer._instance
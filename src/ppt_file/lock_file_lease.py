@@ -0,0 +1,578 @@
+# -*- coding: utf-8 -*-
+
+"""
+Personal Python Toolkit
+Modularized all-in-one toolkit for Python
+----------------------------------------------------------------------------
+(C) Tobias "NotTheEvilOne" Wolf - All rights reserved
+https://github.com/NotTheEvilOne/ppt_file
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint: disable=import-error,invalid-name,undefined-variable
+
+from binascii import hexlify
+from os import path
+from weakref import WeakSet
+import os
+import select
+import socket
+import sys
+import threading
+import time
+
+_IN_DELETE = 0x00000200
+"""
+inotify event mask of files deleted from the watched directory
+"""
+
+_IN_MOVED_FROM = 0x00000040
+"""
+inotify event mask of files moved out of the watched directory
+"""
+
+_LIBC_INOTIFY = None
+"""
+C library providing the inotify functions
+"""
+
+if sys.platform.startswith("linux"):
+    try:
+        import ctypes
+
+        _libc = ctypes.CDLL(None, use_errno=True)
+
+        _libc.inotify_init1.argtypes = (ctypes.c_int,)
+        _libc.inotify_init1.restype = ctypes.c_int
+        _libc.inotify_add_watch.argtypes = (
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        )
+        _libc.inotify_add_watch.restype = ctypes.c_int
+
+        _LIBC_INOTIFY = _libc
+    except (AttributeError, ImportError, OSError):
+        _LIBC_INOTIFY = None
+
+
+class LockFileLease(object):
+    """
+    Exclusive lease on a lock file created atomically with "O_CREAT|O_EXCL".
+    The lock file records the owner and the lease expiry. Held leases are
+    renewed by a heartbeat thread and expired leases of other owners are
+    reclaimed.
+
+    :author:     Tobias "NotTheEvilOne" Wolf et al.
+    :copyright:  Tobias "NotTheEvilOne" Wolf - All rights reserved
+    :package:    ppt
+    :subpackage: file
+    :since:      v1.1.0
+    :license:    http://mozilla.org/MPL/2.0/
+                 Mozilla Public License, v. 2.0
+    """
+
+    # pylint: disable=bad-option-value,slots-on-old-class
+    __slots__ = (
+        "__weakref__",
+        "_expiry",
+        "lease_duration",
+        "lock_path_name",
+        "_token",
+        "_watch_descriptor",
+    )
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    _heartbeat_condition = threading.Condition()
+    """
+Condition used to wake the heartbeat thread
+    """
+    _heartbeat_thread = None
+    """
+Heartbeat thread renewing the leases held by the process
+    """
+    _held_leases = WeakSet()
+    """
+Leases held by the process
+    """
+
+    def __init__(self, lock_path_name, lease_duration=10.0):
+        """
+        Constructor __init__(LockFileLease)
+
+        :param lock_path_name: Path to the lock file
+        :param lease_duration: Seconds a lease is valid without being renewed
+
+        :since: v1.1.0
+        """
+
+        self._expiry = None
+        """
+Expiry time of the lease held; None if not held
+        """
+        self.lease_duration = lease_duration
+        """
+Seconds a lease is valid without being renewed
+        """
+        self.lock_path_name = lock_path_name
+        """
+Path to the lock file
+        """
+        self._token = hexlify(os.urandom(8)).decode("ascii")
+        """
+Token identifying the owner of the lease
+        """
+        self._watch_descriptor = None
+        """
+inotify descriptor watching the lock file directory; False if not supported
+        """
+
+    @property
+    def is_held(self):
+        """
+        Returns true if the lease is held by this instance.
+
+        :return: (bool) True if held
+        :since:  v1.1.0
+        """
+
+        return self._expiry is not None
+
+    def acquire(self):
+        """
+        Tries to acquire the lease without waiting. A lease held already is
+        renewed.
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        if self.is_held:
+            _return = self.renew()
+        else:
+            _return = self._create()
+
+            if not _return and self._reclaim_if_expired():
+                _return = self._create()
+
+        return _return
+
+    def close(self):
+        """
+        Releases the lease and the directory watch.
+
+        :since: v1.1.0
+        """
+
+        self.release()
+
+        if self._watch_descriptor:
+            os.close(self._watch_descriptor)
+
+        self._watch_descriptor = None
+
+    def _create(self):
+        """
+        Creates the lock file atomically.
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_CLOEXEC", 0)
+
+        try:
+            file_descriptor = os.open(self.lock_path_name, flags, 0o644)
+        except FileExistsError:
+            return False
+
+        expiry = time.time() + self.lease_duration
+
+        try:
+            os.write(file_descriptor, self._get_content(expiry))
+        finally:
+            os.close(file_descriptor)
+
+        self._set_held(expiry)
+        return True
+
+    def _open_owned(self, flags):
+        """
+        Opens the lock file and checks through the descriptor that it contains
+        the lease of this instance.
+
+        :param flags: Flags to open the lock file with
+
+        :return: (int) File descriptor; None if the lease is not owned
+        :since:  v1.1.0
+        """
+
+        try:
+            file_descriptor = os.open(
+                self.lock_path_name, flags | getattr(os, "O_CLOEXEC", 0)
+            )
+        except OSError:
+            return None
+
+        try:
+            lease = _parse_lease(os.read(file_descriptor, 1024))
+        except OSError:
+            lease = None
+
+        if lease is None or lease[2] != self._token:
+            os.close(file_descriptor)
+            file_descriptor = None
+
+        return file_descriptor
+
+    def _get_content(self, expiry):
+        """
+        Returns the lock file content describing the owner and lease expiry.
+
+        :param expiry: Lease expiry time
+
+        :return: (bytes) Lock file content
+        :since:  v1.1.0
+        """
+
+        return "{0:d}\n{1}\n{2}\n{3:.6f}\n".format(
+            os.getpid(), socket.gethostname(), self._token, expiry
+        ).encode("utf-8")
+
+    def is_locked(self):
+        """
+        Returns true if an unexpired lease exists.
+
+        :return: (bool) True if locked
+        :since:  v1.1.0
+        """
+
+        return self.is_held or (
+            path.exists(self.lock_path_name) and not self._is_expired()
+        )
+
+    def _is_expired(self, lease=None):
+        """
+        Returns true if the lease of the lock file has expired or its owner
+        process on this host has exited.
+
+        :param lease: Lease values read before
+
+        :return: (bool) True if expired
+        :since:  v1.1.0
+        """
+
+        if lease is None:
+            lease = _read_lease(self.lock_path_name)
+
+        if lease is None:
+            # The owner has not written the lease yet or the file is gone.
+            try:
+                _return = (
+                    os.stat(self.lock_path_name).st_mtime + self.lease_duration
+                ) < time.time()
+            except OSError:
+                _return = False
+        else:
+            pid, host_name, _, expiry = lease
+            _return = expiry < time.time()
+
+            if (
+                not _return
+                and os.name == "posix"
+                and host_name == socket.gethostname()
+                and pid != os.getpid()
+            ):
+                try:
+                    os.kill(pid, 0)
+                except ProcessLookupError:
+                    _return = True
+                except OSError:
+                    pass
+
+        return _return
+
+    def _reclaim_if_expired(self):
+        """
+        Removes an expired lock file of another owner. The lock file is renamed
+        first so that only one waiter reclaims it.
+
+        :return: (bool) True if reclaimed
+        :since:  v1.1.0
+        """
+
+        lease = _read_lease(self.lock_path_name)
+        _return = False
+
+        if self._is_expired(lease):
+            stale_path_name = "{0}.{1}.stale".format(self.lock_path_name, self._token)
+
+            try:
+                os.rename(self.lock_path_name, stale_path_name)
+                _return = True
+            except OSError:
+                pass
+
+            if _return and _read_lease(stale_path_name) != lease:
+                # The lease has been renewed or replaced in the meantime.
+                _return = False
+
+                try:
+                    os.link(stale_path_name, self.lock_path_name)
+                except OSError:
+                    pass
+
+            if _return or path.exists(stale_path_name):
+                try:
+                    os.unlink(stale_path_name)
+                except OSError:
+                    pass
+
+        return _return
+
+    def release(self):
+        """
+        Removes the lock file if the lease is held by this instance.
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        _return = False
+
+        if self.is_held:
+            self._set_held(None)
+            file_descriptor = self._open_owned(os.O_RDONLY)
+
+            if file_descriptor is not None:
+                try:
+                    # The lock file may have been reclaimed and replaced since.
+                    if _is_same_file(os.fstat(file_descriptor), self.lock_path_name):
+                        os.unlink(self.lock_path_name)
+                        _return = True
+                except OSError:
+                    pass
+                finally:
+                    os.close(file_descriptor)
+
+        return _return
+
+    def renew(self):
+        """
+        Extends the lease held if the lock file is still owned by this
+        instance.
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        _return = False
+
+        if self.is_held:
+            file_descriptor = self._open_owned(os.O_RDWR)
+
+            if file_descriptor is not None:
+                expiry = time.time() + self.lease_duration
+                content = self._get_content(expiry)
+
+                try:
+                    os.lseek(file_descriptor, 0, os.SEEK_SET)
+                    os.write(file_descriptor, content)
+                    os.ftruncate(file_descriptor, len(content))
+
+                    # A reclaimer renaming the lock file meanwhile restores it
+                    # as the lease read afterwards has been renewed.
+                    if _is_same_file(os.fstat(file_descriptor), self.lock_path_name):
+                        self._set_held(expiry)
+                        _return = True
+                except OSError:
+                    pass
+                finally:
+                    os.close(file_descriptor)
+
+            if not _return:
+                self._set_held(None)
+
+        return _return
+
+    def _set_held(self, expiry):
+        """
+        Sets the lease expiry and registers held leases for renewal.
+
+        :param expiry: Lease expiry time; None if not held
+
+        :since: v1.1.0
+        """
+
+        with LockFileLease._heartbeat_condition:
+            self._expiry = expiry
+
+            if expiry is None:
+                LockFileLease._held_leases.discard(self)
+            else:
+                LockFileLease._held_leases.add(self)
+
+                if LockFileLease._heartbeat_thread is None:
+                    LockFileLease._heartbeat_thread = threading.Thread(
+                        target=LockFileLease._run_heartbeat,
+                        name="ppt_file.LockFileLease",
+                        daemon=True,
+                    )
+
+                    LockFileLease._heartbeat_thread.start()
+
+            LockFileLease._heartbeat_condition.notify_all()
+
+    def wait(self, timeout):
+        """
+        Waits until the lock file directory changes or the timeout is reached.
+        Directory changes are watched with inotify if supported.
+
+        :param timeout: Timeout in seconds
+
+        :since: v1.1.0
+        """
+
+        if self._watch_descriptor is None:
+            self._watch_descriptor = self._create_watch()
+
+        if self._watch_descriptor:
+            readable, _, _ = select.select([self._watch_descriptor], [], [], timeout)
+
+            if readable:
+                try:
+                    os.read(self._watch_descriptor, 4096)
+                except BlockingIOError:
+                    pass
+        else:
+            time.sleep(timeout)
+
+    def _create_watch(self):
+        """
+        Creates an inotify descriptor watching for lock files being removed
+        from the lock file directory.
+
+        :return: (mixed) inotify descriptor; False if not supported
+        :since:  v1.1.0
+        """
+
+        _return = False
+
+        if _LIBC_INOTIFY is not None:
+            watch_descriptor = _LIBC_INOTIFY.inotify_init1(
+                os.O_NONBLOCK | getattr(os, "O_CLOEXEC", 0)
+            )
+
+            if watch_descriptor >= 0:
+                directory_path = path.dirname(path.abspath(self.lock_path_name))
+
+                if (
+                    _LIBC_INOTIFY.inotify_add_watch(
+                        watch_descriptor,
+                        os.fsencode(directory_path),
+                        _IN_DELETE | _IN_MOVED_FROM,
+                    )
+                    < 0
+                ):
+                    os.close(watch_descriptor)
+                else:
+                    _return = watch_descriptor
+
+        return _return
+
+    @staticmethod
+    def _run_heartbeat():
+        """
+        Renews held leases once a third of their duration has passed.
+
+        :since: v1.1.0
+        """
+
+        condition = LockFileLease._heartbeat_condition
+
+        while True:
+            with condition:
+                while len(LockFileLease._held_leases) < 1:
+                    condition.wait()
+
+                renewal_times = {
+                    lease: lease._expiry - (2 * lease.lease_duration / 3)
+                    for lease in LockFileLease._held_leases
+                    if lease._expiry is not None
+                }
+
+                next_renewal_time = min(renewal_times.values(), default=None)
+
+                if next_renewal_time is not None and next_renewal_time > time.time():
+                    condition.wait(next_renewal_time - time.time())
+                    continue
+
+            for lease, renewal_time in renewal_times.items():
+                if renewal_time <= time.time():
+                    lease.renew()
+
+
+def _is_same_file(file_stat, file_path_name):
+    """
+    Returns true if the given path refers to the file of the given stat
+    result.
+
+    :param file_stat: "os.stat_result" instance of an opened file
+    :param file_path_name: Path to compare
+
+    :return: (bool) True if the same file
+    :since:  v1.1.0
+    """
+
+    try:
+        path_stat = os.stat(file_path_name)
+    except OSError:
+        return False
+
+    return (path_stat.st_dev, path_stat.st_ino) == (file_stat.st_dev, file_stat.st_ino)
+
+
+def _parse_lease(data):
+    """
+    Parses the owner and lease expiry of the given lock file content.
+
+    :param data: Lock file content
+
+    :return: (tuple) Owner PID, host name, token and lease expiry; None if not
+             valid
+    :since:  v1.1.0
+    """
+
+    try:
+        pid, host_name, token, expiry = data.decode("utf-8").split("\n")[:4]
+        _return = (int(pid), host_name, token, float(expiry))
+    except (UnicodeDecodeError, ValueError):
+        _return = None
+
+    return _return
+
+
+def _read_lease(lock_path_name):
+    """
+    Reads the owner and lease expiry recorded in the given lock file.
+
+    :param lock_path_name: Path to the lock file
+
+    :return: (tuple) Owner PID, host name, token and lease expiry; None if not
+             readable
+    :since:  v1.1.0
+    """
+
+    try:
+        with open(lock_path_name, "rb") as file_object:
+            _return = _parse_lease(file_object.read(1024))
+    except OSError:
+        _return = None
+
+    return _return
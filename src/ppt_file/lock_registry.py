@@ -0,0 +1,404 @@
+# -*- coding: utf-8 -*-
+
+"""
+Personal Python Toolkit
+Modularized all-in-one toolkit for Python
+----------------------------------------------------------------------------
+(C) Tobias "NotTheEvilOne" Wolf - All rights reserved
+https://github.com/NotTheEvilOne/ppt_file
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint: disable=import-error,invalid-name
+
+from collections import deque
+from functools import partial
+import os
+import threading
+import time
+
+from .lock_wait_strategy import LockWaitStrategy
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class LockRegistry(object):
+    """
+    Process-wide registry of fair reader/writer locks keyed by device and
+    inode. Threads and file instances of the process are coordinated in
+    memory while "flock" is only called if the first holder takes the lock,
+    the lock mode changes or the last holder releases it.
+
+    :author:     Tobias "NotTheEvilOne" Wolf et al.
+    :copyright:  Tobias "NotTheEvilOne" Wolf - All rights reserved
+    :package:    ppt
+    :subpackage: file
+    :since:      v1.1.0
+    :license:    http://mozilla.org/MPL/2.0/
+                 Mozilla Public License, v. 2.0
+    """
+
+    # pylint: disable=bad-option-value,slots-on-old-class
+    __slots__ = ("_condition", "_entries")
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    _instance = None
+    """
+Registry instance shared by the process
+    """
+    _instance_lock = threading.Lock()
+    """
+Lock used to create the shared registry instance
+    """
+
+    def __init__(self):
+        """
+        Constructor __init__(LockRegistry)
+
+        :since: v1.1.0
+        """
+
+        self._condition = threading.Condition()
+        """
+Condition used to wait for and to announce lock changes
+        """
+        self._entries = {}
+        """
+Lock entries by device and inode
+        """
+
+    def acquire(
+        self,
+        key,
+        owner,
+        file_descriptor,
+        lock_mode,
+        timeout=-1,
+        lock_wait_strategy=None,
+    ):
+        """
+        Acquires or changes the lock of the given owner. Waiting owners are
+        served in order. Like "flock" conversions upgrading a shared lock
+        releases it first to avoid deadlocks between upgrading owners.
+
+        :param key: Tuple of device and inode of the file
+        :param owner: Object holding the lock
+        :param file_descriptor: File descriptor duplicated for "flock" if the
+                                file is not locked yet
+        :param lock_mode: The requested locking mode ("r" or "w")
+        :param timeout: Timeout in seconds (negative values to wait forever)
+        :param lock_wait_strategy: Strategy used to wait for "flock"
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        if lock_mode not in ("r", "w"):
+            raise ValueError("Lock mode given is invalid")
+
+        if lock_wait_strategy is None:
+            lock_wait_strategy = LockWaitStrategy()
+
+        deadline = lock_wait_strategy.get_deadline(timeout)
+        owner_id = id(owner)
+
+        with self._condition:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                entry = _LockRegistryEntry()
+                self._entries[key] = entry
+
+            current_mode = entry.holders.get(owner_id)
+
+            if current_mode == lock_mode:
+                return True
+
+            if current_mode == "r":
+                del entry.holders[owner_id]
+                current_mode = None
+
+                self._condition.notify_all()
+
+            ticket = (owner_id, lock_mode)
+            entry.waiters.append(ticket)
+            is_granted = False
+
+            try:
+                while True:
+                    if entry.is_grantable(ticket, current_mode is not None):
+                        entry.holders[owner_id] = lock_mode
+                        is_granted = True
+                        break
+
+                    remaining = (
+                        None if (deadline is None) else deadline - time.monotonic()
+                    )
+
+                    if remaining is not None and remaining <= 0:
+                        break
+
+                    self._condition.wait(remaining)
+            finally:
+                entry.waiters.remove(ticket)
+                self._condition.notify_all()
+
+            if not is_granted:
+                self._remove_entry_if_unused(key, entry)
+                return False
+
+            if entry.descriptor is None:
+                entry.descriptor = os.dup(file_descriptor)
+
+        _return = self._apply_file_lock(key, entry, deadline, lock_wait_strategy)
+
+        if not _return:
+            with self._condition:
+                if current_mode is None:
+                    del entry.holders[owner_id]
+                else:
+                    entry.holders[owner_id] = current_mode
+
+                self._condition.notify_all()
+
+            self._apply_file_lock(key, entry, deadline, lock_wait_strategy)
+
+        return _return
+
+    def _apply_file_lock(self, key, entry, deadline, lock_wait_strategy):
+        """
+        Changes the "flock" of the entry to match the modes held in memory.
+        The entry is removed if it is no longer held or waited for.
+
+        :param key: Tuple of device and inode of the file
+        :param entry: Lock entry
+        :param deadline: Deadline based on "time.monotonic()"; None for no
+                         deadline
+        :param lock_wait_strategy: Strategy used to wait for "flock"; None to
+                                   only release it
+
+        :return: (bool) True if the "flock" matches the modes held
+        :since:  v1.1.0
+        """
+
+        with entry.file_lock:
+            with self._condition:
+                file_lock_mode = entry.get_file_lock_mode()
+
+            if file_lock_mode == entry.file_lock_mode:
+                _return = True
+            elif file_lock_mode is None:
+                fcntl.flock(entry.descriptor, fcntl.LOCK_UN)
+                entry.file_lock_mode = None
+                _return = True
+            elif lock_wait_strategy is None:
+                # Waiting owners change the "flock" themselves
+                _return = False
+            else:
+                operation = fcntl.LOCK_EX if (file_lock_mode == "w") else fcntl.LOCK_SH
+
+                _return = lock_wait_strategy.wait(
+                    partial(_try_flock, entry.descriptor, operation),
+                    -1 if (deadline is None) else max(0, deadline - time.monotonic()),
+                )
+
+                # Converting a "flock" may release the previous one first.
+                entry.file_lock_mode = file_lock_mode if (_return) else None
+
+            with self._condition:
+                self._remove_entry_if_unused(key, entry)
+
+        return _return
+
+    def holders(self, key):
+        """
+        Returns the number of owners holding the lock of the given file.
+
+        :param key: Tuple of device and inode of the file
+
+        :return: (int) Number of owners
+        :since:  v1.1.0
+        """
+
+        with self._condition:
+            entry = self._entries.get(key)
+            return 0 if (entry is None) else len(entry.holders)
+
+    def release(self, key, owner):
+        """
+        Releases the lock of the given owner.
+
+        :param key: Tuple of device and inode of the file
+        :param owner: Object holding the lock
+
+        :since: v1.1.0
+        """
+
+        with self._condition:
+            entry = self._entries.get(key)
+
+            if entry is None or entry.holders.pop(id(owner), None) is None:
+                return
+
+            self._condition.notify_all()
+
+        self._apply_file_lock(key, entry, None, None)
+
+    def _remove_entry_if_unused(self, key, entry):
+        """
+        Removes the entry and closes its descriptor if it is no longer held,
+        waited for or locked. The condition must be held.
+
+        :param key: Tuple of device and inode of the file
+        :param entry: Lock entry
+
+        :since: v1.1.0
+        """
+
+        if (
+            len(entry.holders) < 1
+            and len(entry.waiters) < 1
+            and entry.file_lock_mode is None
+            and self._entries.get(key) is entry
+        ):
+            del self._entries[key]
+
+            if entry.descriptor is not None:
+                os.close(entry.descriptor)
+                entry.descriptor = None
+
+    @staticmethod
+    def get_instance():
+        """
+        Returns the registry instance shared by the process.
+
+        :return: (object) LockRegistry instance
+        :since:  v1.1.0
+        """
+
+        if LockRegistry._instance is None:
+            with LockRegistry._instance_lock:
+                if LockRegistry._instance is None:
+                    LockRegistry._instance = LockRegistry()
+
+        return LockRegistry._instance
+
+
+class _LockRegistryEntry(object):
+    """
+    Lock state of one file in the lock registry.
+
+    :since: v1.1.0
+    """
+
+    # pylint: disable=bad-option-value,slots-on-old-class
+    __slots__ = ("descriptor", "file_lock", "file_lock_mode", "holders", "waiters")
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    def __init__(self):
+        """
+        Constructor __init__(_LockRegistryEntry)
+
+        :since: v1.1.0
+        """
+
+        self.descriptor = None
+        """
+Duplicated file descriptor "flock" is called with
+        """
+        self.file_lock = threading.Lock()
+        """
+Lock serializing "flock" changes
+        """
+        self.file_lock_mode = None
+        """
+Mode of the "flock" held
+        """
+        self.holders = {}
+        """
+Locking modes by owner ID
+        """
+        self.waiters = deque()
+        """
+Queue of owner ID and locking mode tickets waiting
+        """
+
+    def get_file_lock_mode(self):
+        """
+        Returns the "flock" mode required by the modes held in memory.
+
+        :return: (str) Locking mode; None if not held
+        :since:  v1.1.0
+        """
+
+        if len(self.holders) < 1:
+            _return = None
+        elif "w" in self.holders.values():
+            _return = "w"
+        else:
+            _return = "r"
+
+        return _return
+
+    def is_grantable(self, ticket, is_holder):
+        """
+        Returns true if the given ticket can be granted without conflicting
+        with other holders or overtaking earlier waiters.
+
+        :param ticket: Owner ID and locking mode ticket
+        :param is_holder: True if the owner already holds the lock
+
+        :return: (bool) True if grantable
+        :since:  v1.1.0
+        """
+
+        owner_id, lock_mode = ticket
+        _return = True
+
+        for holder_id, holder_mode in self.holders.items():
+            if holder_id != owner_id and (lock_mode == "w" or holder_mode == "w"):
+                _return = False
+                break
+
+        if _return and not is_holder:
+            for waiter in self.waiters:
+                if waiter is ticket:
+                    break
+
+                if lock_mode == "w" or waiter[1] == "w":
+                    _return = False
+                    break
+
+        return _return
+
+
+def _try_flock(file_descriptor, operation):
+    """
+    Calls "flock" without blocking.
+
+    :param file_descriptor: File descriptor to lock
+    :param operation: "flock" operation
+
+    :return: (bool) True on success
+    :since:  v1.1.0
+    """
+
+    try:
+        fcntl.flock(file_descriptor, operation | fcntl.LOCK_NB)
+        _return = True
+    except OSError:
+        _return = False
+
+    return _return
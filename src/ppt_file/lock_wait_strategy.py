@@ -0,0 +1,179 @@
+# -*- coding: utf-8 -*-
+
+"""
+Personal Python Toolkit
+Modularized all-in-one toolkit for Python
+----------------------------------------------------------------------------
+(C) Tobias "NotTheEvilOne" Wolf - All rights reserved
+https://github.com/NotTheEvilOne/ppt_file
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint: disable=invalid-name
+
+import random
+import time
+
+
+class LockWaitStrategy(object):
+    """
+    Waits for a lock with exponential backoff and jitter until a deadline is
+    reached.
+
+    :author:     Tobias "NotTheEvilOne" Wolf et al.
+    :copyright:  Tobias "NotTheEvilOne" Wolf - All rights reserved
+    :package:    ppt
+    :subpackage: file
+    :since:      v1.1.0
+    :license:    http://mozilla.org/MPL/2.0/
+                 Mozilla Public License, v. 2.0
+    """
+
+    # pylint: disable=bad-option-value,slots-on-old-class
+    __slots__ = (
+        "backoff_factor",
+        "blocking",
+        "initial_delay",
+        "jitter",
+        "max_delay",
+        "timeout",
+    )
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    def __init__(
+        self,
+        timeout=None,
+        initial_delay=0.001,
+        max_delay=0.25,
+        backoff_factor=2.0,
+        jitter=0.5,
+        blocking=False,
+    ):
+        """
+        Constructor __init__(LockWaitStrategy)
+
+        :param timeout: Timeout in seconds (None to use the retries of the file
+                        instance; negative values to wait forever)
+        :param initial_delay: Delay in seconds before the first retry
+        :param max_delay: Maximum delay in seconds between retries
+        :param backoff_factor: Factor the delay is multiplied with per retry
+        :param jitter: Fraction of the delay randomly subtracted per retry
+        :param blocking: True to wait in a blocking lock call if no timeout
+                         applies
+
+        :since: v1.1.0
+        """
+
+        self.backoff_factor = backoff_factor
+        """
+Factor the delay is multiplied with per retry
+        """
+        self.blocking = blocking
+        """
+True to wait in a blocking lock call if no timeout applies
+        """
+        self.initial_delay = initial_delay
+        """
+Delay in seconds before the first retry
+        """
+        self.jitter = jitter
+        """
+Fraction of the delay randomly subtracted per retry
+        """
+        self.max_delay = max_delay
+        """
+Maximum delay in seconds between retries
+        """
+        self.timeout = timeout
+        """
+Timeout in seconds
+        """
+
+    def get_deadline(self, timeout):
+        """
+        Returns the deadline for the given timeout.
+
+        :param timeout: Timeout in seconds (negative values to wait forever)
+
+        :return: (float) Deadline based on "time.monotonic()"; None for no
+                 deadline
+        :since:  v1.1.0
+        """
+
+        return None if (timeout < 0) else (time.monotonic() + timeout)
+
+    def iter_delays(self, deadline):
+        """
+        Returns a generator of delays to wait between retries. The generator is
+        exhausted when the deadline is reached.
+
+        :param deadline: Deadline based on "time.monotonic()"; None for no
+                         deadline
+
+        :return: (object) Generator of delays in seconds
+        :since:  v1.1.0
+        """
+
+        delay = self.initial_delay
+
+        while True:
+            jittered_delay = delay * (1 - (self.jitter * random.random()))
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+
+                if remaining <= 0:
+                    break
+
+                if jittered_delay > remaining:
+                    jittered_delay = remaining
+
+            yield jittered_delay
+
+            delay = min(delay * self.backoff_factor, self.max_delay)
+
+    def wait(self, attempt, timeout, blocking_attempt=None, sleep=None):
+        """
+        Calls the given attempt callable until it succeeds or the timeout is
+        reached.
+
+        :param attempt: Callable returning true if the lock has been acquired
+        :param timeout: Timeout in seconds (negative values to wait forever)
+        :param blocking_attempt: Callable waiting for the lock for the given
+                                 number of seconds (None to wait forever). It
+                                 returns None if it can not block.
+        :param sleep: Callable used to wait between retries
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        deadline = self.get_deadline(timeout)
+        _return = None
+
+        if self.blocking and blocking_attempt is not None:
+            _return = blocking_attempt(
+                None if (deadline is None) else max(0, deadline - time.monotonic())
+            )
+
+        if _return is None:
+            _return = attempt()
+
+            if not _return:
+                if sleep is None:
+                    sleep = time.sleep
+
+                for delay in self.iter_delays(deadline):
+                    sleep(delay)
+
+                    if attempt():
+                        _return = True
+                        break
+
+        return _return
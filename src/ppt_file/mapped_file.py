@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+
+"""
+Personal Python Toolkit
+Modularized all-in-one toolkit for Python
+----------------------------------------------------------------------------
+(C) Tobias "NotTheEvilOne" Wolf - All rights reserved
+https://github.com/NotTheEvilOne/ppt_file
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+# pylint: disable=import-error,invalid-name
+
+import mmap
+
+from .file import File
+
+
+class MappedFile(File):
+    """
+    Read-only file memory-mapped after the shared lock has been taken.
+
+    :author:     Tobias "NotTheEvilOne" Wolf et al.
+    :copyright:  Tobias "NotTheEvilOne" Wolf - All rights reserved
+    :package:    ppt
+    :subpackage: file
+    :since:      v1.1.0
+    :license:    http://mozilla.org/MPL/2.0/
+                 Mozilla Public License, v. 2.0
+    """
+
+    # pylint: disable=bad-option-value,slots-on-old-class
+    __slots__ = ("_mapping", "_view")
+    """
+python.org: __slots__ reserves space for the declared variables and prevents
+the automatic creation of __dict__ and __weakref__ for each instance.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Constructor __init__(MappedFile)
+
+        :since: v1.1.0
+        """
+
+        self._mapping = None
+        """
+Memory-mapping of the file
+        """
+        self._view = None
+        """
+memoryview of the memory-mapping
+        """
+
+        File.__init__(self, *args, **kwargs)
+
+    def __getitem__(self, key):
+        """
+        python.org: Called to implement evaluation of self[key].
+
+        :param key: Index or slice of the mapped data
+
+        :return: (mixed) Byte value or memoryview of the given slice
+        :since:  v1.1.0
+        """
+
+        return self.view[key]
+
+    def __len__(self):
+        """
+        python.org: Called to implement the built-in function len().
+
+        :return: (int) Size of the mapped data
+        :since:  v1.1.0
+        """
+
+        return len(self.view)
+
+    @property
+    def mapping(self):
+        """
+        Returns the memory-mapping of the file.
+
+        :return: (object) mmap instance; None if not opened or empty
+        :since:  v1.1.0
+        """
+
+        return self._mapping
+
+    @property
+    def view(self):
+        """
+        Returns a read-only memoryview of the mapped data.
+
+        :return: (object) memoryview instance
+        :since:  v1.1.0
+        """
+
+        if self._handle is None:
+            raise IOError("File handle invalid")
+
+        return self._view
+
+    def close(self, delete_empty=False):
+        """
+        python.org: Flush and close this stream.
+
+        :param delete_empty: If the file handle is valid, the file is empty and
+                             this parameter is true then the file will be deleted.
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+
+        if self._mapping is not None:
+            try:
+                self._mapping.close()
+            except BufferError:
+                # Slices of the view are still referenced; the mapping is
+                # released by the garbage collector.
+                pass
+
+            self._mapping = None
+
+        return File.close(self, delete_empty)
+
+    def find(self, sub, start=0, end=None):
+        """
+        Returns the lowest index in the mapped data where the subsequence sub is
+        found.
+
+        :param sub: Subsequence to search for
+        :param start: Index to start the search at
+        :param end: Index to end the search at
+
+        :return: (int) Index found; -1 if not found
+        :since:  v1.1.0
+        """
+
+        if self._handle is None:
+            raise IOError("File handle invalid")
+
+        if self._mapping is None:
+            _return = -1
+        elif end is None:
+            _return = self._mapping.find(sub, start)
+        else:
+            _return = self._mapping.find(sub, start, end)
+
+        return _return
+
+    def follow(self, lines=False, timeout=-1, wait_strategy=None):
+        """
+        Following appended data is not supported for memory-mapped files.
+
+        :since: v1.1.0
+        """
+
+        raise IOError("Memory-mapped files do not support following appended data")
+
+    def open(self, file_path_name, readonly=True, file_mode="rb", dir_fd=None):
+        """
+        Opens a file session and maps it into memory.
+
+        :param file_path_name: Path to the requested file
+        :param readonly: Memory-mapped files are always opened read-only
+        :param file_mode: File mode to use
+        :param dir_fd: Directory descriptor relative paths are resolved against
+
+        :return: (bool) True on success
+        :since:  v1.1.0
+        """
+
+        if "b" not in file_mode:
+            raise IOError("Memory-mapped files require a binary file mode")
+
+        _return = File.open(self, file_path_name, True, file_mode, dir_fd)
+
+        # The shared lock excludes writers while the mapping is alive.
+        if _return and not self.lock_shared():
+            File.close(self)
+            _return = False
+
+        if _return:
+            if self.file_size > 0:
+                self._mapping = mmap.mmap(
+                    self._handle.fileno(), self.file_size, access=mmap.ACCESS_READ
+                )
+
+                self._view = memoryview(self._mapping)
+            else:
+                self._view = memoryview(bytes())
+
+        return _return
+
+    def read(self, n=0, timeout=-1):
+        """
+        python.org: Read up to n bytes from the object and return them.
+
+        :param n: How many bytes to read from the current position (0 means until
+                  EOF)
+        :param timeout: Timeout is ignored as data is read from memory
+
+        :return: (bytes) Data; None if EOF
+        :since:  v1.1.0
+        """
+
+        if self._log_handler is not None:
+            self._log_handler.debug(
+                "ppt_file.MappedFile.read({0:d}, {1:d})", n, timeout
+            )
+
+        _return = None
+
+        if self.lock("r"):
+            position = self._handle.tell()
+            size = self._get_read_size(n)
+
+            _return = self._view[position : position + size].tobytes()
+            self._handle.seek(position + len(_return))
+
+        return _return
+
+    def refresh_size(self):
+        """
+        Refreshing the size from the raw file is not supported for memory-mapped
+        files.
+
+        :since: v1.1.0
+        """
+
+        raise IOError("Memory-mapped files do not support refreshing the file size")
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+"""
+Personal Python Toolkit
+Modularized all-in-one toolkit for Python
+----------------------------------------------------------------------------
+(C) Tobias "NotTheEvilOne" Wolf - All rights reserved
+https://github.com/NotTheEvilOne/ppt_file
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import threading
+import time
+
+import pytest
+
+from ppt_file import AsyncFile, File
+
+
+class _SlowLockFile(File):
+    __slots__ = ("lock_changed",)
+
+    def __init__(self, *args, **kwargs):
+        File.__init__(self, *args, **kwargs)
+        self.lock_changed = threading.Event()
+
+    def _change_lock(self, lock_mode, timeout):
+        _return = File._change_lock(self, lock_mode, timeout)
+        self.lock_changed.set()
+
+        time.sleep(0.2)
+        return _return
+
+
+def _is_exclusively_lockable(file_path_name):
+    file_instance = File()
+    assert file_instance.open(file_path_name)
+
+    _return = file_instance.lock("w", 0)
+    file_instance.close()
+
+    return _return
+
+
+@pytest.fixture
+def file_path_name(tmp_path):
+    _return = tmp_path / "file.bin"
+    _return.write_bytes(b"data")
+
+    return str(_return)
+
+
+def test_cancelled_lock_is_restored(file_path_name):
+    async def _run():
+        file_instance = _SlowLockFile()
+
+        with ThreadPoolExecutor(2) as executor:
+            async_file = AsyncFile(file_instance, executor)
+            assert await async_file.open(file_path_name)
+
+            task = asyncio.ensure_future(async_file.lock("w"))
+
+            while not file_instance.lock_changed.is_set():
+                await asyncio.sleep(0.01)
+
+            task.cancel()
+
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+            assert await async_file.tell() == 0
+            assert file_instance._handle_lock == "r"
+            assert _is_exclusively_lockable(file_path_name)
+
+            await async_file.close()
+
+    asyncio.run(_run())
+
+
+def test_lock_after_cancellation(file_path_name):
+    async def _run():
+        async_file = AsyncFile()
+        assert await async_file.open(file_path_name)
+
+        task = asyncio.ensure_future(async_file.lock("w"))
+        await asyncio.sleep(0)
+        task.cancel()
+
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+        assert await async_file.read() == b"data"
+        assert await async_file.lock("w")
+        assert not _is_exclusively_lockable(file_path_name)
+
+        await async_file.close()
+        assert _is_exclusively_lockable(file_path_name)
+
+    asyncio.run(_run())
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+
+"""
+Personal Python Toolkit
+Modularized all-in-one toolkit for Python
+----------------------------------------------------------------------------
+(C) Tobias "NotTheEvilOne" Wolf - All rights reserved
+https://github.com/NotTheEvilOne/ppt_file
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+import random
+import struct
+
+import pytest
+
+from ppt_file import CompressedFile, File
+
+BLOCK_SIZE = 100
+
+CODECS = ["zlib"]
+
+try:
+    import lzma  # noqa: F401
+
+    CODECS.append("lzma")
+except ImportError:
+    pass
+
+
+def _get_data(size):
+    random_generator = random.Random(size)
+    return bytes(random_generator.choice(b"abc\n") for _ in range(size))
+
+
+def _open(file_path_name, readonly=False, compression="zlib"):
+    _return = CompressedFile(compression=compression, block_size=BLOCK_SIZE)
+    file_mode = "rb" if (readonly) else "r+b"
+
+    assert _return.open(file_path_name, readonly, file_mode)
+    return _return
+
+
+def _write(file_path_name, data, compression="zlib"):
+    file_instance = CompressedFile(compression=compression, block_size=BLOCK_SIZE)
+    assert file_instance.open(file_path_name, False, "w+b")
+
+    file_instance.write(data)
+    file_instance.close()
+
+
+@pytest.fixture
+def file_path_name(tmp_path):
+    return str(tmp_path / "file.pptz")
+
+
+@pytest.mark.parametrize("compression", CODECS)
+def test_header_and_index_round_trip(file_path_name, compression):
+    data = _get_data(1050)
+    _write(file_path_name, data, compression)
+
+    with open(file_path_name, "rb") as file_object:
+        raw_data = file_object.read()
+
+    magic, version, codec, block_size = struct.unpack(">4sBBI", raw_data[:10])
+    assert (magic, version, codec, block_size) == (
+        b"PPTZ",
+        1,
+        CODECS.index(compression),
+        BLOCK_SIZE,
+    )
+
+    size, block_count, index_offset, footer_magic = struct.unpack(
+        ">QQQ4s", raw_data[-28:]
+    )
+
+    assert (size, block_count, footer_magic) == (len(data), 11, b"PPTZ")
+    assert index_offset + (8 * block_count) == len(raw_data) - 28
+
+    file_instance = _open(file_path_name, True)
+    assert file_instance.size == len(data)
+    assert file_instance.compression == compression
+    assert file_instance.read() == data
+    file_instance.close()
+
+
+def test_random_access_reads(file_path_name):
+    data = _get_data(1050)
+    _write(file_path_name, data)
+
+    file_instance = _open(file_path_name, True)
+
+    for offset, length in ((0, 10), (95, 10), (99, 2), (150, 300), (1040, 20)):
+        file_instance.seek(offset)
+
+        assert file_instance.read(length) == data[offset : offset + length]
+        assert file_instance.tell() == min(len(data), offset + length)
+        assert (
+            file_instance.read_range(offset, length) == data[offset : offset + length]
+        )
+
+    assert file_instance.pread_many([(990, 20), (5, 200)]) == [
+        data[990:1010],
+        data[5:205],
+    ]
+
+    file_instance.close()
+
+
+def test_append_after_reopen(file_path_name):
+    data = _get_data(250)
+    _write(file_path_name, data[:130])
+
+    file_instance = _open(file_path_name)
+    file_instance.seek(file_instance.size)
+    file_instance.write(data[130:])
+    file_instance.close()
+
+    file_instance = _open(file_path_name, True)
+    assert file_instance.read() == data
+    file_instance.close()
+
+
+def test_truncate(file_path_name):
+    data = _get_data(1050)
+    _write(file_path_name, data)
+
+    file_instance = _open(file_path_name)
+    assert file_instance.truncate(425) == 425
+    assert file_instance.size == 425
+
+    file_instance.seek(380)
+    assert file_instance.read() == data[380:425]
+
+    assert file_instance.truncate(500) == 500
+    file_instance.close()
+
+    file_instance = _open(file_path_name, True)
+    assert file_instance.read() == data[:425] + bytes(75)
+    file_instance.close()
+
+
+def test_raw_data_operations_are_rejected(file_path_name):
+    data = _get_data(300)
+    _write(file_path_name, data)
+
+    file_instance = _open(file_path_name)
+
+    with pytest.raises(IOError):
+        file_instance.punch_hole(0, 8192)
+
+    with pytest.raises(IOError):
+        file_instance.preallocate(1048576)
+
+    with pytest.raises(IOError):
+        file_instance.refresh_size()
+
+    with pytest.raises(IOError):
+        next(file_instance.follow())
+
+    assert file_instance.size == len(data)
+    file_instance.close()
+
+    file_instance = _open(file_path_name, True)
+    assert file_instance.read() == data
+    file_instance.close()
+
+
+def test_copy_from_raw_file(file_path_name, tmp_path):
+    data = _get_data(1050)
+    source_path_name = tmp_path / "source.bin"
+    source_path_name.write_bytes(data)
+
+    _write(file_path_name, data[:30])
+
+    source_file_instance = File()
+    assert source_file_instance.open(str(source_path_name), True, "rb")
+
+    file_instance = _open(file_path_name)
+    file_instance.seek(file_instance.size)
+
+    assert source_file_instance.copy_to(file_instance, 30) == len(data) - 30
+    assert file_instance.size == len(data)
+
+    source_file_instance.close()
+    file_instance.close()
+
+    file_instance = _open(file_path_name, True)
+    assert file_instance.read() == data
+    file_instance.close()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+"""
+Personal Python Toolkit
+Modularized all-in-one toolkit for Python
+----------------------------------------------------------------------------
+(C) Tobias "NotTheEvilOne" Wolf - All rights reserved
+https://github.com/NotTheEvilOne/ppt_file
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+import pytest
+
+from ppt_file import File, FilePool
+
+
+@pytest.fixture
+def file_path_name(tmp_path):
+    _return = tmp_path / "file.bin"
+    _return.write_bytes(b"AAAA")
+
+    return str(_return)
+
+
+def test_reuse_after_external_modification(file_path_name):
+    with FilePool() as pool:
+        file_instance = pool.acquire(file_path_name)
+        assert file_instance.read(2) == b"AA"
+        pool.release(file_instance)
+
+        with open(file_path_name, "r+b") as file_object:
+            file_object.write(b"BBBB")
+
+        reused_file_instance = pool.acquire(file_path_name)
+        assert reused_file_instance is file_instance
+        assert reused_file_instance.read() == b"BBBB"
+        pool.release(reused_file_instance)
+
+
+def test_idle_instances_do_not_hold_locks(file_path_name):
+    with FilePool() as pool:
+        file_instance = pool.acquire(file_path_name)
+        file_instance.write(b"CC")
+        pool.release(file_instance)
+
+        other_file_instance = File()
+        assert other_file_instance.open(file_path_name)
+        assert other_file_instance.lock("w", 0.1)
+        assert other_file_instance.read() == b"CCAA"
+        other_file_instance.close()
+
+
+def test_truncating_mode_is_not_reused(file_path_name):
+    with FilePool() as pool:
+        file_instance = pool.acquire(file_path_name, False, "w+b")
+        file_instance.write(b"written")
+        pool.release(file_instance)
+
+        assert pool.open_count == 0
+
+        file_instance = pool.acquire(file_path_name, False, "w+b")
+        assert file_instance.size == 0
+        pool.release(file_instance)
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+"""
+Personal Python Toolkit
+Modularized all-in-one toolkit for Python
+----------------------------------------------------------------------------
+(C) Tobias "NotTheEvilOne" Wolf - All rights reserved
+https://github.com/NotTheEvilOne/ppt_file
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+import pytest
+
+from ppt_file import File, FileSet, LockWaitStrategy
+
+
+def _open_file(file_path_name):
+    _return = File()
+    assert _return.open(file_path_name)
+
+    return _return
+
+
+def _is_lockable(file_path_name):
+    file_instance = _open_file(file_path_name)
+    _return = file_instance.lock("w", 0)
+    file_instance.close()
+
+    return _return
+
+
+@pytest.fixture
+def file_path_names(tmp_path):
+    _return = []
+
+    for name in ("first.bin", "second.bin"):
+        file_path = tmp_path / name
+        file_path.write_bytes(b"")
+        _return.append(str(file_path))
+
+    return _return
+
+
+def test_failed_lock_keeps_locks_held_before(file_path_names):
+    first_file_instance = _open_file(file_path_names[0])
+    second_file_instance = _open_file(file_path_names[1])
+    blocking_file_instance = _open_file(file_path_names[1])
+
+    assert first_file_instance.lock("w", 0)
+    assert blocking_file_instance.lock("w", 0)
+
+    file_set = FileSet(
+        [first_file_instance, second_file_instance],
+        LockWaitStrategy(initial_delay=0.01, max_delay=0.01),
+    )
+
+    assert not file_set.lock(0.05)
+    assert not _is_lockable(file_path_names[0])
+
+    for file_instance in (
+        first_file_instance,
+        second_file_instance,
+        blocking_file_instance,
+    ):
+        file_instance.close()
+
+
+def test_unlock_keeps_locks_held_before(file_path_names):
+    first_file_instance = _open_file(file_path_names[0])
+    second_file_instance = _open_file(file_path_names[1])
+
+    assert first_file_instance.lock("w", 0)
+
+    file_set = FileSet([first_file_instance, second_file_instance])
+
+    with file_set.locked(0):
+        assert not _is_lockable(file_path_names[1])
+
+    assert not _is_lockable(file_path_names[0])
+    assert _is_lockable(file_path_names[1])
+
+    first_file_instance.close()
+    second_file_instance.close()
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+
+"""
+Personal Python Toolkit
+Modularized all-in-one toolkit for Python
+----------------------------------------------------------------------------
+(C) Tobias "NotTheEvilOne" Wolf - All rights reserved
+https://github.com/NotTheEvilOne/ppt_file
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+import os
+import socket
+import subprocess
+import sys
+import time
+
+from ppt_file.lock_file_lease import _read_lease, LockFileLease
+
+
+def _write_lease(lock_path_name, pid, expiry):
+    with open(lock_path_name, "wb") as file_object:
+        file_object.write(
+            "{0:d}\n{1}\nforeign\n{2:.6f}\n".format(
+                pid, socket.gethostname(), expiry
+            ).encode("utf-8")
+        )
+
+
+def test_acquire_release(tmp_path):
+    lock_path_name = str(tmp_path / "file.lock")
+    lease = LockFileLease(lock_path_name)
+    other_lease = LockFileLease(lock_path_name)
+
+    assert lease.acquire()
+    assert lease.is_held
+    assert other_lease.is_locked()
+    assert not other_lease.acquire()
+
+    assert lease.release()
+    assert not lease.is_held
+    assert not os.path.exists(lock_path_name)
+
+    assert other_lease.acquire()
+    other_lease.close()
+
+
+def test_reclaim_dead_owner(tmp_path):
+    lock_path_name = str(tmp_path / "file.lock")
+
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+
+    _write_lease(lock_path_name, process.pid, time.time() + 3600)
+
+    lease = LockFileLease(lock_path_name)
+    assert lease.acquire()
+    assert _read_lease(lock_path_name)[0] == os.getpid()
+    lease.close()
+
+
+def test_reclaim_expired_lease(tmp_path):
+    lock_path_name = str(tmp_path / "file.lock")
+    _write_lease(lock_path_name, os.getpid(), time.time() - 1)
+
+    lease = LockFileLease(lock_path_name)
+    assert not lease.is_locked()
+    assert lease.acquire()
+    lease.close()
+
+
+def test_unexpired_lease_is_kept(tmp_path):
+    lock_path_name = str(tmp_path / "file.lock")
+    _write_lease(lock_path_name, os.getpid(), time.time() + 3600)
+
+    lease = LockFileLease(lock_path_name)
+    assert lease.is_locked()
+    assert not lease.acquire()
+    assert _read_lease(lock_path_name)[2] == "foreign"
+
+
+def test_heartbeat_renewal(tmp_path):
+    lock_path_name = str(tmp_path / "file.lock")
+    lease = LockFileLease(lock_path_name, lease_duration=0.3)
+
+    assert lease.acquire()
+    first_expiry = _read_lease(lock_path_name)[3]
+
+    time.sleep(0.6)
+
+    assert lease.is_held
+    assert _read_lease(lock_path_name)[3] > first_expiry
+    assert not LockFileLease(lock_path_name, lease_duration=0.3).acquire()
+
+    lease.close()
+
+
+def test_replaced_lease_is_not_touched(tmp_path):
+    lock_path_name = str(tmp_path / "file.lock")
+    lease = LockFileLease(lock_path_name)
+    other_lease = LockFileLease(lock_path_name)
+
+    assert lease.acquire()
+
+    # Simulates the lock file being reclaimed and created by another owner.
+    os.unlink(lock_path_name)
+    assert other_lease.acquire()
+    other_lease_values = _read_lease(lock_path_name)
+
+    assert not lease.renew()
+    assert not lease.is_held
+    assert not lease.release()
+    assert _read_lease(lock_path_name) == other_lease_values
+
+    other_lease.close()
@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+"""
+Personal Python Toolkit
+Modularized all-in-one toolkit for Python
+----------------------------------------------------------------------------
+(C) Tobias "NotTheEvilOne" Wolf - All rights reserved
+https://github.com/NotTheEvilOne/ppt_file
+
+This Source Code Form is subject to the terms of the Mozilla Public License,
+v. 2.0. If a copy of the MPL was not distributed with this file, You can
+obtain one at http://mozilla.org/MPL/2.0/.
+"""
+
+import os
+import threading
+
+import pytest
+
+from ppt_file import File, LockRegistry
+
+fcntl = pytest.importorskip("fcntl")
+
+
+def _open_files(file_path_name, registry, count):
+    _return = []
+
+    for _ in range(count):
+        file_instance = File(lock_registry=registry)
+        assert file_instance.open(file_path_name)
+        _return.append(file_instance)
+
+    return _return
+
+
+def _try_flock(file_path_name, operation):
+    file_descriptor = os.open(file_path_name, os.O_RDONLY)
+
+    try:
+        fcntl.flock(file_descriptor, operation | fcntl.LOCK_NB)
+        _return = True
+    except OSError:
+        _return = False
+    finally:
+        os.close(file_descriptor)
+
+    return _return
+
+
+@pytest.fixture
+def file_path_name(tmp_path):
+    _return = tmp_path / "file.bin"
+    _return.write_bytes(b"data")
+
+    return str(_return)
+
+
+def test_reader_writer_exclusion(file_path_name):
+    registry = LockRegistry()
+    writer, reader, other_reader = _open_files(file_path_name, registry, 3)
+
+    assert writer.lock("w")
+    assert not reader.lock_shared(0.1)
+    assert not _try_flock(file_path_name, fcntl.LOCK_SH)
+
+    assert writer.unlock()
+    assert reader.lock_shared(0.1)
+    assert other_reader.lock_shared(0.1)
+    assert registry.holders(writer._lock_registry_key) == 2
+    assert not writer.lock("w", 0.1)
+    assert _try_flock(file_path_name, fcntl.LOCK_SH)
+    assert not _try_flock(file_path_name, fcntl.LOCK_EX)
+
+    for file_instance in (writer, reader, other_reader):
+        file_instance.close()
+
+
+def test_waiting_writer_is_granted(file_path_name):
+    registry = LockRegistry()
+    writer, reader = _open_files(file_path_name, registry, 2)
+    results = []
+
+    assert reader.lock_shared()
+
+    thread = threading.Thread(target=lambda: results.append(writer.lock("w", 5)))
+    thread.start()
+
+    thread.join(0.2)
+    assert thread.is_alive()
+
+    reader.unlock()
+    thread.join()
+
+    assert results == [True]
+    assert not _try_flock(file_path_name, fcntl.LOCK_SH)
+
+    writer.close()
+    reader.close()
+
+
+def test_downgrade_with_waiting_readers(file_path_name):
+    registry = LockRegistry()
+    writer, reader, other_writer = _open_files(file_path_name, registry, 3)
+    results = []
+
+    assert writer.lock("w")
+
+    thread = threading.Thread(target=lambda: results.append(reader.lock_shared(5)))
+    thread.start()
+
+    thread.join(0.2)
+    assert thread.is_alive()
+
+    assert writer.lock("r")
+    thread.join()
+
+    assert results == [True]
+    assert registry.holders(writer._lock_registry_key) == 2
+    assert not other_writer.lock("w", 0.1)
+    assert _try_flock(file_path_name, fcntl.LOCK_SH)
+    assert not _try_flock(file_path_name, fcntl.LOCK_EX)
+
+    for file_instance in (writer, reader, other_writer):
+        file_instance.close()
+
+
+def test_close_releases_descriptor(file_path_name):
+    registry = LockRegistry()
+    file_descriptors = (
+        set(os.listdir("/proc/self/fd")) if (os.path.isdir("/proc/self/fd")) else None
+    )
+
+    writer, reader = _open_files(file_path_name, registry, 2)
+    key = writer._lock_registry_key
+
+    assert writer.lock("w")
+    assert writer.lock("r")
+    assert reader.lock_shared()
+
+    writer.close()
+    assert registry.holders(key) == 1
+    assert not _try_flock(file_path_name, fcntl.LOCK_EX)
+
+    reader.close()
+    assert registry.holders(key) == 0
+    assert key not in registry._entries
+    assert _try_flock(file_path_name, fcntl.LOCK_EX)
+
+    if file_descriptors is not None:
+        assert set(os.listdir("/proc/self/fd")) == file_descriptors
+
+
+def test_close_writes_data_before_release(file_path_name):
+    contents = []
+
+    class _RecordingLockRegistry(LockRegistry):
+        __slots__ = ()
+
+        def release(self, key, owner):
+            with open(file_path_name, "rb") as file_object:
+                contents.append(file_object.read())
+
+            LockRegistry.release(self, key, owner)
+
+    file_instance = File(lock_registry=_RecordingLockRegistry())
+    assert file_instance.open(file_path_name, False, "w+b")
+
+    file_instance.write(b"written")
+    file_instance.close()
+
+    assert contents == [b"written"]